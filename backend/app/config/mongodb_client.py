@@ -2,12 +2,15 @@ from pymongo import AsyncMongoClient
 from beanie import init_beanie
 from app.models.paper import Paper
 from app.models.chat import ChatHistory
+from app.models.corpus_state import CorpusState
+from app.models.paper_chunk import PaperChunk
+from app.models.paper_embedding import PaperEmbedding
 from app.config.settings import settings
 
 
 class MongoDbClient:
     def __init__(self, database_name: str = "hackaton_nasa_db"):
-        self.models = [Paper, ChatHistory]
+        self.models = [Paper, ChatHistory, PaperChunk, PaperEmbedding, CorpusState]
         self.client = AsyncMongoClient(settings.MONGODB_URL)
         self.database_name = database_name
 
@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -9,6 +10,77 @@ class Settings(BaseSettings):
     # Google AI Configuration
     API_KEY_VERTEXAI: str = "DEFAULT_API_KEY"
     VERTEXAI_MODEL_NAME: str = "gemini-2.5-flash-lite"
+    VERTEXAI_MAX_CONCURRENCY: int = 32
+    VERTEXAI_TIMEOUT_SECONDS: float = 60.0
+    # Proyecto y región de Vertex AI (necesarios para batch prediction, que no admite API key)
+    VERTEXAI_PROJECT: str = ""
+    VERTEXAI_LOCATION: str = "us-central1"
+
+    # Chat Configuration
+    # "retrieval": solo los fragmentos relevantes del paper; "full_text": el texto completo (cacheado)
+    CHAT_CONTEXT_MODE: Literal["retrieval", "full_text"] = "retrieval"
+    CHAT_RETRIEVAL_TOP_K: int = 8
+    CHAT_CONTEXT_CACHE_ENABLED: bool = True
+    CHAT_CONTEXT_CACHE_TTL_SECONDS: int = 900
+    CHAT_CONTEXT_CACHE_MAX_ENTRIES: int = 100
+
+    # Paper Cache Configuration
+    PAPER_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    PAPER_CACHE_TTL_SECONDS: int = 3600
+
+    # Search Configuration
+    # "atlas": MongoDB Atlas Search ($search); "local": índice invertido en memoria (MongoDB sin Atlas)
+    SEARCH_BACKEND: Literal["atlas", "local"] = "atlas"
+
+    # Embeddings / Vector Search Configuration
+    # "vertex": modelo de embeddings de Vertex AI; "hashing": embedder local determinista (tests, sin red)
+    EMBEDDING_PROVIDER: Literal["vertex", "hashing"] = "vertex"
+    EMBEDDING_MODEL_NAME: str = "gemini-embedding-001"
+    EMBEDDING_DIMENSION: int = 768
+    # Candidatos que aporta cada ranking (texto y vectores) antes de fusionarlos
+    VECTOR_SEARCH_CANDIDATES: int = 100
+    # Listas del índice IVF exploradas por consulta
+    VECTOR_SEARCH_PROBES: int = 8
+    # Nº de papers relacionados precomputados por paper
+    RELATED_PAPERS_TOP_K: int = 5
+
+    # Insight Extraction (extracción por lotes con LLM)
+    INSIGHT_EXTRACTION_CONCURRENCY: int = 16
+    # Límites de la cuota del modelo: peticiones y tokens por minuto
+    INSIGHT_EXTRACTION_RPM: int = 300
+    INSIGHT_EXTRACTION_TPM: int = 1_000_000
+    INSIGHT_EXTRACTION_MAX_ATTEMPTS: int = 4
+    # Preprocesado de la entrada: sin bibliografía ni secciones de cierre y con un presupuesto
+    # de tokens repartido por prioridad de sección (0 = sin límite)
+    EXTRACTION_PREPROCESS_ENABLED: bool = True
+    EXTRACTION_INPUT_MAX_TOKENS: int = 8000
+    # Cache de resultados por hash de (texto, prompt, modelo, temperatura)
+    EXTRACTION_CACHE_ENABLED: bool = True
+    EXTRACTION_CACHE_DIR: str = "extraction_cache"
+
+    # Batch Prediction (reextracción nocturna del corpus)
+    # "vertex": batch prediction de Vertex AI (entrada/salida en GCS); "local": sustituto en archivos
+    BATCH_PREDICTION_BACKEND: Literal["vertex", "local"] = "vertex"
+    VERTEXAI_BATCH_GCS_PREFIX: str = ""
+    BATCH_PREDICTION_LOCAL_DIR: str = "batch_jobs"
+    BATCH_PREDICTION_POLL_SECONDS: float = 30.0
+
+    # Search Cache Configuration
+    SEARCH_CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+    SEARCH_CACHE_TTL_SECONDS: int = 300
+    # Intervalo con el que el servidor consulta la versión del corpus en MongoDB para ver
+    # las ingestas hechas desde otros procesos (0 = desactivado)
+    CORPUS_VERSION_POLL_SECONDS: float = 5.0
+
+    # Search Filters Configuration
+    FILTERS_CACHE_MAX_AGE_SECONDS: int = 300
+    # Intervalo de recálculo de los contadores por valor de filtro (0 = desactivado)
+    FILTER_COUNTS_REFRESH_SECONDS: int = 600
+
+    # HTTP Cache Configuration (descarga de artículos)
+    HTTP_CACHE_DIR: str = "http_cache"
+    # Sin red: solo se sirven respuestas ya cacheadas
+    HTTP_CACHE_OFFLINE: bool = False
 
     # Load environment variables from a .env file
     model_config = SettingsConfigDict(env_file=".env")
@@ -1,4 +1,8 @@
+import asyncio
+from typing import AsyncIterator
+
 from google import genai
+from google.genai import types
 from app.config.settings import settings
 
 
@@ -16,4 +20,55 @@ class VertexAIClient:
             return
         self.api_key = settings.API_KEY_VERTEXAI
         self.client = genai.Client(api_key=self.api_key, vertexai=True)
+        # Limita las llamadas simultáneas a Vertex AI desde este proceso
+        self.semaphore = asyncio.Semaphore(settings.VERTEXAI_MAX_CONCURRENCY)
         self._initialized = True
+
+    async def generate_content(self, **kwargs) -> types.GenerateContentResponse:
+        """
+        Llama a generate_content con el cliente asíncrono de la SDK (client.aio),
+        sin bloquear el event loop.
+
+        - Respeta el límite de concurrencia VERTEXAI_MAX_CONCURRENCY.
+        - Lanza TimeoutError si la llamada supera VERTEXAI_TIMEOUT_SECONDS.
+        - Si la tarea que espera se cancela, la petición en curso se cancela también.
+        """
+        async with self.semaphore:
+            return await asyncio.wait_for(
+                self.client.aio.models.generate_content(**kwargs),
+                timeout=settings.VERTEXAI_TIMEOUT_SECONDS,
+            )
+
+    async def embed_content(self, **kwargs) -> types.EmbedContentResponse:
+        """
+        Calcula embeddings con client.aio.models.embed_content, con los mismos
+        límites de concurrencia y timeout que generate_content.
+        """
+        async with self.semaphore:
+            return await asyncio.wait_for(
+                self.client.aio.models.embed_content(**kwargs),
+                timeout=settings.VERTEXAI_TIMEOUT_SECONDS,
+            )
+
+    async def generate_content_stream(self, **kwargs) -> AsyncIterator[types.GenerateContentResponse]:
+        """
+        Variante en streaming de generate_content (client.aio.models.generate_content_stream).
+
+        El cupo de concurrencia se mantiene mientras dure el stream y
+        VERTEXAI_TIMEOUT_SECONDS se aplica a la espera de cada fragmento.
+        """
+        async with self.semaphore:
+            stream = await asyncio.wait_for(
+                self.client.aio.models.generate_content_stream(**kwargs),
+                timeout=settings.VERTEXAI_TIMEOUT_SECONDS,
+            )
+            chunks = stream.__aiter__()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(
+                        chunks.__anext__(),
+                        timeout=settings.VERTEXAI_TIMEOUT_SECONDS,
+                    )
+                except StopAsyncIteration:
+                    return
+                yield chunk
@@ -1,9 +1,7 @@
-from typing import List, Optional
+from typing import Optional
 
 from pydantic import BaseModel, Field
 
-from app.dto.chat_message import ChatMessage
-
 
 class ChatRequest(BaseModel):
 
@@ -12,10 +10,9 @@ class ChatRequest(BaseModel):
         default=None,
         description="Token de sesión para mantener la conversación. Si no se proporciona, se creará una nueva sesión."
     )
-    messages: List[ChatMessage] = Field(
-        default_factory=list,
+    message: str = Field(
         min_length=1,
-        description="Historial de mensajes en orden cronológico",
+        description="Nuevo mensaje del usuario. El historial previo se recupera de la sesión en el servidor.",
     )
 
     class Config:
@@ -23,16 +20,7 @@ class ChatRequest(BaseModel):
             "example": {
                 "paper_id": "67003efb4c2e3f7a9c2b5a11",
                 "session_token": "550e8400-e29b-41d4-a716-446655440000",
-                "messages": [
-                    {
-                        "role": "model",
-                        "content": "El paper trata sobre..."
-                    },
-                    {
-                        "role": "user",
-                        "content": "Resume el paper y menciona sus conclusiones principales."
-                    }
-                ]
+                "message": "Resume el paper y menciona sus conclusiones principales."
             }
         }
         from_attributes = True
\ No newline at end of file
@@ -1,9 +1,12 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 
 class FilterValue(BaseModel):
     name: str
     values: list[str]
+    counts: Optional[dict[str, int]] = None
 
     class Config:
         from_attributes = True
@@ -18,6 +21,10 @@ class FilterValue(BaseModel):
                     "Fruit fly",
                     "Nematode",
                     "Yeast"
-                ]
+                ],
+                "counts": {
+                    "Human": 42,
+                    "Mouse": 87
+                }
             }
         }
@@ -1,11 +1,21 @@
-from typing import Optional
-from pydantic import BaseModel
+from typing import Literal, Optional
+from pydantic import BaseModel, Field
 from app.dto.filter_value import FilterValue
+from app.search.profiles import DEFAULT_PROFILE, SearchProfile
 
 class SearchPapersRequest(BaseModel):
     query: Optional[str] = None
     filters: Optional[list[FilterValue]] = None
-    limit: Optional[int] = 10
+    # Tamaño de página (para ver más resultados se usa el cursor, no un límite mayor)
+    limit: int = Field(default=10, ge=1, le=100)
+    # Perfil de pesos por campo (ver app/search/profiles.py)
+    profile: SearchProfile = DEFAULT_PROFILE
+    # Cursor opaco devuelto como next_cursor en la página anterior
+    cursor: Optional[str] = None
+    # "text": búsqueda léxica; "vector": similitud de embeddings; "hybrid": fusión de ambas (RRF)
+    mode: Literal["text", "vector", "hybrid"] = "text"
+    # Incluir en la respuesta los contadores por valor de filtro de los resultados
+    facets: bool = False
 
     class Config:
         from_attributes = True
@@ -23,6 +33,10 @@ class SearchPapersRequest(BaseModel):
                             "values": ["Review"]
                         }
                     ],
-                "limit": 15
+                "limit": 15,
+                "profile": "default",
+                "mode": "hybrid",
+                "cursor": None,
+                "facets": True
             }
         }
@@ -0,0 +1,21 @@
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.models.paper import PaperSummary
+
+
+class SearchPapersResponse(BaseModel):
+    """
+    Página de resultados de /paper/search.
+    """
+
+    results: List[PaperSummary] = Field(default_factory=list, description="Papers de la página")
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor opaco para pedir la página siguiente (None si no hay más resultados)"
+    )
+    facets: Optional[Dict[str, Dict[str, int]]] = Field(
+        default=None,
+        description="Nº de resultados por valor de cada filtro (solo si se pidió facets)"
+    )
@@ -1,9 +1,16 @@
+import asyncio
+import contextlib
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from app.routes.paper_route import paper_router
 from app.config.mongodb_client import MongoDbClient
 from app.routes.chat_route import chat_router
+from app.config.settings import settings
+from app.services.filter_values_service import run_filter_counts_job
+from app.services.corpus_version_service import run_corpus_version_job, sync_corpus_version
+from app.search.factory import get_search_backend
 
 
 database = MongoDbClient()
@@ -12,8 +19,22 @@ database = MongoDbClient()
 async def lifespan(app: FastAPI):
     # Startup: Inicializar la conexión a la base de datos
     await database.init()
+    # Versión actual del corpus (las ingestas de otros procesos se detectan por sondeo)
+    await sync_corpus_version()
+    # Construir las estructuras del backend de búsqueda (índice local, si está configurado)
+    await get_search_backend().refresh()
+    # Tarea en segundo plano: contadores por valor de filtro para /paper/search/filters
+    background_tasks = []
+    if settings.FILTER_COUNTS_REFRESH_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(run_filter_counts_job()))
+    if settings.CORPUS_VERSION_POLL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(run_corpus_version_job()))
     yield
-    # Shutdown: Cerrar la conexión a la base de datos
+    # Shutdown: Detener tareas en segundo plano y cerrar la conexión a la base de datos
+    for task in background_tasks:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
     await database.close()
 
 app = FastAPI(lifespan=lifespan)
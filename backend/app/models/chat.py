@@ -1,5 +1,6 @@
 from beanie import Document
-from typing import List, Optional
+from pymongo import ASCENDING, IndexModel
+from typing import List
 from datetime import datetime, timezone
 from pydantic import Field
 import uuid
@@ -35,5 +36,10 @@ class ChatHistory(Document):
         name = "chat_histories"
         indexes = [
             "paper_id",
-            "session_token",  # Índice para buscar por token de sesión
+            # Índice para validar y actualizar una sesión en una sola consulta
+            IndexModel(
+                [("session_token", ASCENDING), ("paper_id", ASCENDING)],
+                name="session_token_paper_id",
+                unique=True,
+            ),
         ]
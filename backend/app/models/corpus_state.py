@@ -0,0 +1,19 @@
+from beanie import Document
+from pydantic import Field
+from typing import List, Optional
+
+
+class CorpusState(Document):
+    """
+    Versión del corpus de papers, compartida por todos los procesos (API y CLIs de ingesta).
+    Un único documento (_id "papers"): cada ingesta incrementa version y añade a changes
+    los IDs de los papers modificados (None = todo el corpus). changes guarda solo los
+    últimos cambios; el último elemento corresponde a version.
+    """
+
+    id: str = Field(default="papers")
+    version: int = 0
+    changes: List[Optional[List[str]]] = []
+
+    class Settings:
+        name = "corpus_state"
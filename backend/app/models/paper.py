@@ -1,4 +1,5 @@
-from beanie import Document
+from beanie import Document, PydanticObjectId
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional
 from datetime import datetime
 
@@ -14,7 +15,12 @@ from .enums.space_agency import SpaceAgency
 from .enums.applicable_mission import ApplicableMission
 
 
-class Paper(Document):
+class PaperBase(BaseModel):
+    """
+    Campos comunes de un paper, sin el texto completo.
+    Compartidos por el documento Paper y sus proyecciones ligeras.
+    """
+
     # Identificación básica del paper
     title: str
     pmcid: str = "" 
@@ -26,7 +32,6 @@ class Paper(Document):
     
     # Contenido del paper
     abstract: str = ""
-    full_text: str = ""
     conclusion: str = ""
     
     # Autoría y procedencia
@@ -65,6 +70,23 @@ class Paper(Document):
     # Misiones y aplicabilidad
     applicable_to_missions: List[ApplicableMission] = []
     space_agency_involvement: List[SpaceAgency] = []
+
+
+class Paper(Document, PaperBase):
+    # Texto completo del paper (solo se carga cuando es necesario, p. ej. en el chat)
+    full_text: str = ""
     
     class Settings:
-        name = "papers"
\ No newline at end of file
+        name = "papers"
+
+
+class PaperSummary(PaperBase):
+    """
+    Proyección de Paper sin full_text para listados y detalle.
+    Al usarla como projection_model, Beanie genera un $project con solo
+    estos campos, de modo que el texto completo nunca sale de MongoDB.
+    """
+
+    id: Optional[PydanticObjectId] = Field(default=None, alias="_id")
+
+    model_config = ConfigDict(populate_by_name=True)
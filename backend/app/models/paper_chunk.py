@@ -0,0 +1,26 @@
+from beanie import Document
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+from typing import Dict
+
+
+class PaperChunk(Document):
+    """
+    Fragmento del texto completo de un paper, indexado para recuperación (BM25).
+    Se generan al ingerir el paper y se usan en el chat en lugar del texto completo.
+    """
+
+    paper_id: str = Field(description="ID del paper al que pertenece el fragmento")
+    position: int = Field(description="Orden del fragmento dentro del paper")
+    section: str = Field(description="Sección del paper (Abstract, Methods, Results...)")
+    text: str
+
+    # Estadísticas léxicas para BM25
+    term_frequencies: Dict[str, int] = {}
+    length: int = 0
+
+    class Settings:
+        name = "paper_chunks"
+        indexes = [
+            IndexModel([("paper_id", ASCENDING), ("position", ASCENDING)], name="paper_id_position"),
+        ]
@@ -0,0 +1,30 @@
+import numpy as np
+from beanie import Document
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+
+
+class PaperEmbedding(Document):
+    """
+    Embedding de un paper (título + abstract + resumen), guardado de forma compacta:
+    el vector normalizado se almacena como bytes float16 (2 bytes por dimensión).
+    """
+
+    paper_id: str = Field(description="ID del paper")
+    model: str = Field(description="Modelo que generó el vector (p. ej. gemini-embedding-001-768)")
+    dimension: int
+    vector: bytes = Field(description="Vector float16 little-endian")
+    text_hash: str = Field(description="SHA-256 del texto vectorizado, para no recalcular si no cambia")
+
+    class Settings:
+        name = "paper_embeddings"
+        indexes = [
+            IndexModel([("paper_id", ASCENDING), ("model", ASCENDING)], name="paper_id_model", unique=True),
+        ]
+
+    @staticmethod
+    def encode_vector(vector: np.ndarray) -> bytes:
+        return np.asarray(vector, dtype="<f2").tobytes()
+
+    def decode_vector(self) -> np.ndarray:
+        return np.frombuffer(self.vector, dtype="<f2").astype(np.float32)
@@ -0,0 +1,201 @@
+import json
+import re
+from typing import Any, Dict, List, Union, get_args, get_origin
+from datetime import datetime
+
+from pydantic import ConfigDict, ValidationError, field_validator
+
+from .enums.base_enum import BaseEnum
+from .paper import Paper, PaperBase
+
+
+# Campos de PaperBase que no se piden al LLM: enlaces/imagen que no están en el texto
+# y related_papers, que se calcula por similitud de embeddings (ids de otros papers)
+NON_EXTRACTED_FIELDS = frozenset({"image_url", "pubmed_url", "related_papers"})
+
+# Instrucciones de cada campo extraído: van en el esquema (description) y en el prompt
+FIELD_DESCRIPTIONS: Dict[str, str] = {
+    "title": "Full title of the paper",
+    "pmcid": "PubMed Central ID if mentioned (e.g., PMC10020673)",
+    "doi": "Digital Object Identifier if mentioned",
+    "publication_date": "Publication date of the paper",
+    "journal_name": "Name of the journal where published",
+    "abstract": "Abstract of the paper as written by the authors",
+    "conclusion": "Main conclusions stated by the authors",
+    "authors": "List of all authors mentioned",
+    "author_affiliations": "List of institutions/universities mentioned for authors",
+    "ai_generated_summary": "Write a concise 2-3 sentence summary of the main research focus",
+    "key_findings": "Summarize the most important results and discoveries",
+    "future_research_fields": "Research directions or open questions the authors propose for future work",
+    "impact_statement": "One or two sentences on why the findings matter for space exploration and human health",
+    "study_type": "Type of study conducted",
+    "experimental_platform": "Where the study was conducted",
+    "space_environment_stressors": "All space-related factors studied",
+    "primary_organisms_studied": "All organisms studied",
+    "affected_organ_systems": "Body systems affected",
+    "biological_analysis_level": "Levels of biological analysis",
+    "experimental_duration_days": "Duration of the experiment in days",
+    "sample_size": "Number of subjects/samples studied",
+    "sampling_methodology": "How samples were collected/selected",
+    "demonstrates_space_adaptation": "Does the study show biological adaptation to space environment?",
+    "identifies_countermeasures": "Does the study propose interventions/countermeasures for space-related health issues?",
+    "relevant_for_long_duration_missions": "Are findings relevant for long-duration space missions (Mars, Moon, etc.)?",
+    "health_implications_severity": "Severity of the health implications for astronauts",
+    "reproducibility_level": "How reproducible the study is (e.g., high: detailed methods and public data; low: missing details)",
+    "applicable_to_missions": "Space missions this research applies to",
+    "space_agency_involvement": "Space agencies involved or mentioned",
+}
+
+
+def _unwrap(annotation) -> tuple[Any, bool, bool]:
+    """
+    (tipo base, es_lista, es_opcional) de la anotación de un campo.
+    """
+    optional = False
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        optional = len(args) < len(get_args(annotation))
+        annotation = args[0]
+    if get_origin(annotation) in (list, List):
+        return get_args(annotation)[0], True, optional
+    return annotation, False, optional
+
+
+def _field_description(name: str, annotation) -> str:
+    """
+    Instrucción de un campo con el formato esperado (valores válidos en los enums).
+    """
+    base, _, _ = _unwrap(annotation)
+    description = FIELD_DESCRIPTIONS[name]
+    if isinstance(base, type) and issubclass(base, BaseEnum):
+        return f"{description}. One of: {', '.join(base.all_values())}"
+    if base is bool:
+        return f"true/false - {description}"
+    if base is int:
+        return f"{description} (number only, null if not specified)"
+    if base is datetime:
+        return f"{description} (ISO 8601 date, e.g. 2023-05-14; null if not specified)"
+    return description
+
+
+def _field_schema(name: str, annotation) -> Dict[str, Any]:
+    """
+    Esquema (subconjunto OpenAPI de response_schema) del tipo de un campo.
+    Los enums usan BaseEnum.to_json_schema() para que el modelo solo pueda devolver valores válidos.
+    """
+    base, is_list, optional = _unwrap(annotation)
+    if isinstance(base, type) and issubclass(base, BaseEnum):
+        schema = base.to_json_schema()
+    elif base is bool:
+        schema = {"type": "boolean"}
+    elif base is int:
+        schema = {"type": "integer"}
+    elif base is datetime:
+        schema = {"type": "string", "format": "date-time"}
+    else:
+        schema = {"type": "string"}
+    if is_list:
+        schema = {"type": "array", "items": schema}
+    if optional:
+        schema["nullable"] = True
+    schema["description"] = _field_description(name, annotation)
+    return schema
+
+
+class PaperExtraction(PaperBase):
+    """
+    Resultado de la extracción estructurada con LLM, validado contra los campos de Paper.
+
+    - response_schema() genera el esquema que se pasa a Gemini (salida restringida a JSON válido
+      para estos campos y a valores de enum permitidos).
+    - model_validate_json valida la respuesta en una sola pasada (parseo + validación en pydantic-core).
+    - Los validadores "before" toleran respuestas sin esquema (enums por nombre o en otro formato,
+      números y booleanos como texto), y los valores de enum desconocidos se descartan.
+    """
+
+    model_config = ConfigDict(extra="ignore")
+
+    @classmethod
+    def extracted_fields(cls) -> List[str]:
+        return [name for name in PaperBase.model_fields if name not in NON_EXTRACTED_FIELDS]
+
+    @classmethod
+    def response_schema(cls) -> Dict[str, Any]:
+        fields = cls.extracted_fields()
+        return {
+            "type": "object",
+            "properties": {name: _field_schema(name, PaperBase.model_fields[name].annotation) for name in fields},
+            "required": fields,
+            "propertyOrdering": fields,
+        }
+
+    @classmethod
+    def prompt_template(cls) -> str:
+        """
+        Plantilla JSON de los campos para el prompt, con las mismas instrucciones que el esquema.
+        """
+        lines = []
+        for name in cls.extracted_fields():
+            annotation = PaperBase.model_fields[name].annotation
+            description = json.dumps(_field_description(name, annotation), ensure_ascii=False)
+            _, is_list, _ = _unwrap(annotation)
+            lines.append(f'  "{name}": [{description}]' if is_list else f'  "{name}": {description}')
+        return "{\n" + ",\n".join(lines) + "\n}"
+
+    @field_validator("*", mode="before")
+    @classmethod
+    def _coerce(cls, value, info):
+        base, is_list, _ = _unwrap(cls.model_fields[info.field_name].annotation)
+        if is_list:
+            if value is None:
+                return []
+            values = value if isinstance(value, list) else [value]
+            if isinstance(base, type) and issubclass(base, BaseEnum):
+                return base.from_string_list([str(v) for v in values if v])
+            return [str(v) for v in values if v]
+        if value is None or value == "":
+            # Los campos con valor por defecto lo conservan
+            field = cls.model_fields[info.field_name]
+            if field.is_required():
+                return "" if base is str else value
+            return field.get_default(call_default_factory=True)
+        if isinstance(base, type) and issubclass(base, BaseEnum):
+            return base.from_string(str(value))
+        if base is str and isinstance(value, list):
+            return "\n".join(str(v) for v in value)
+        if base is bool and isinstance(value, str):
+            return value.strip().lower() == "true"
+        if base is int and isinstance(value, str):
+            match = re.search(r"\d+(\.\d+)?", value)
+            return int(float(match.group(0))) if match else None
+        return value
+
+    @classmethod
+    def validate_partial(cls, data: Dict[str, Any]) -> "PaperExtraction":
+        """
+        Valida un dict descartando los campos que no pasan la validación (quedan con su valor
+        por defecto) en lugar de rechazar toda la extracción.
+        """
+        data = {"title": "", **data}
+        try:
+            return cls.model_validate(data)
+        except ValidationError as e:
+            invalid = {error["loc"][0] for error in e.errors() if error["loc"]}
+            valid = {key: value for key, value in data.items() if key not in invalid}
+            return cls.model_validate({"title": "", **valid})
+
+    def has_extracted_data(self) -> bool:
+        """
+        True si algún campo extraído, además del título, tiene un valor distinto del por defecto.
+        """
+        return any(
+            getattr(self, name) != PaperBase.model_fields[name].get_default(call_default_factory=True)
+            for name in self.extracted_fields() if name != "title"
+        )
+
+    def to_paper(self, full_text: str = "") -> Paper:
+        """
+        Paper con los campos ya validados (sin volver a validarlos).
+        """
+        values = {name: getattr(self, name) for name in PaperBase.model_fields}
+        return Paper.model_construct(**values, full_text=full_text)
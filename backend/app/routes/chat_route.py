@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import StreamingResponse
 from typing import Optional
 
 from app.dto.chat_message import ChatMessage
 from app.dto.chat_request import ChatRequest
 from app.dto.chat_session_response import ChatSessionResponse
-from app.services.chat_service import chat, get_chat_history, initialize_or_get_session
+from app.services.chat_service import chat, chat_stream, get_chat_history, initialize_or_get_session
+from app.utils.disconnect import cancel_on_disconnect
 
 chat_router = APIRouter(
     prefix="/chat",
@@ -33,11 +35,27 @@ async def initialize_session_endpoint(
 
 
 @chat_router.post("", response_model=ChatMessage)
-async def chat_endpoint(chat_request: ChatRequest):
+async def chat_endpoint(chat_request: ChatRequest, request: Request):
     """
     Envía un mensaje al chat. Requiere un session_token válido.
+    Si el cliente se desconecta antes de la respuesta, se cancela la llamada al modelo.
     """
-    return await chat(chat_request)
+    return await cancel_on_disconnect(request, chat(chat_request))
+
+
+@chat_router.post("/stream")
+async def chat_stream_endpoint(chat_request: ChatRequest):
+    """
+    Igual que POST /chat pero devuelve la respuesta como Server-Sent Events
+    a medida que el modelo la genera. El mensaje completo se guarda en el
+    historial al cerrarse el stream y se emite en el evento final "done".
+    """
+    events = await chat_stream(chat_request)
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @chat_router.get("/history/{paper_id}")
@@ -1,30 +1,55 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Header, Response
+from typing import Optional
 
 from app.dto.filter_value import FilterValue
 from app.dto.search_papers_request import SearchPapersRequest
-from app.models.paper import Paper
-from app.services.paper_service import search_papers_similars, obtain_paper_filters_values, obtain_paper_detail
+from app.dto.search_papers_response import SearchPapersResponse
+from app.models.paper import PaperSummary
+from app.config.settings import settings
+from app.services.paper_service import search_papers_similars, obtain_paper_detail
+from app.services.filter_values_service import get_filters_payload
+from app.services.related_papers_service import obtain_related_papers
+from app.services.paper_cache import paper_cache
+from app.services.search_cache import search_cache
 
 paper_router = APIRouter(
     prefix="/paper",
     tags=["Papers"],
 )
 
-@paper_router.post("/search", response_model=list[Paper])
+@paper_router.post("/search", response_model=SearchPapersResponse)
 async def search_papers(search_filters: SearchPapersRequest):
-    papers = await search_papers_similars(search_filters)
-    for paper in papers:
-        if hasattr(paper, "full_text"):
-            delattr(paper, "full_text")
-    return papers
+    return await search_papers_similars(search_filters)
 
 @paper_router.get("/search/filters", response_model=list[FilterValue])
-async def obtain_filters_values():
-    return obtain_paper_filters_values()
+async def obtain_filters_values(if_none_match: Optional[str] = Header(default=None)):
+    """
+    Devuelve los filtros precomputados (JSON ya serializado) con ETag.
+    Si el cliente envía If-None-Match con el ETag vigente, responde 304 sin cuerpo.
+    """
+    payload = get_filters_payload()
+    headers = {
+        "ETag": payload.etag,
+        "Cache-Control": f"public, max-age={settings.FILTERS_CACHE_MAX_AGE_SECONDS}",
+    }
+    if if_none_match and payload.etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload.body, media_type="application/json", headers=headers)
 
-@paper_router.get("/{id}", response_model=Paper)
+@paper_router.get("/cache/stats")
+async def obtain_cache_stats():
+    """
+    Métricas de las caches en memoria de este proceso (aciertos, fallos, expulsiones, bytes).
+    """
+    return {"papers": paper_cache.stats(), "search": search_cache.stats()}
+
+@paper_router.get("/{id}", response_model=PaperSummary)
 async def obtain_detail(id: str):
-    paper = await obtain_paper_detail(id)
-    if hasattr(paper, "full_text"):
-        delattr(paper, "full_text")
-    return paper
\ No newline at end of file
+    return await obtain_paper_detail(id)
+
+@paper_router.get("/{id}/related", response_model=list[PaperSummary])
+async def obtain_related(id: str):
+    """
+    Papers relacionados precomputados (ver app/utils/build_related_papers.py).
+    """
+    return await obtain_related_papers(id)
@@ -0,0 +1 @@
+# Search Package: backends de búsqueda de papers intercambiables (Atlas Search / índice local)
@@ -0,0 +1,198 @@
+from typing import List, Optional, Tuple
+
+from beanie import PydanticObjectId
+from beanie.odm.utils.projection import get_projection
+from fastapi import HTTPException
+
+from app.dto.search_papers_request import SearchPapersRequest
+from app.dto.search_papers_response import SearchPapersResponse
+from app.models.paper import Paper, PaperSummary
+from app.search.base import FACET_FIELDS, FacetCounts, SearchBackend, active_filters, empty_facet_counts
+from app.search.cursor import decode_cursor, encode_cursor
+from app.search.profiles import profile_weights
+from app.services.filter_values_service import compute_filter_counts, get_filter_counts
+
+
+class SearchHit(PaperSummary):
+    """
+    Resultado de $search con el token de paginación de Atlas (searchSequenceToken).
+    """
+
+    pagination_token: Optional[str] = None
+
+
+class AtlasSearchBackend(SearchBackend):
+    """
+    Búsqueda con MongoDB Atlas Search ($search sobre el índice "search_index").
+    La definición del índice está en atlas_search_index.json.
+
+    Paginación por cursor (coste constante por página):
+    - con $search: searchAfter con el searchSequenceToken del último resultado
+    - sin query ni filtros: keyset sobre _id
+    """
+
+    INDEX_NAME = "search_index"
+
+    async def search(self, search_filters: SearchPapersRequest) -> SearchPapersResponse:
+        """
+        Busca papers utilizando MongoDB Atlas Search con compound operator.
+        Combina búsqueda de texto en los campos del perfil (con sus pesos) con filtros específicos.
+        Los resultados se proyectan a PaperSummary en la base de datos (sin full_text).
+        """
+
+        # Construir las cláusulas 'should' para la búsqueda de texto: una por campo del perfil,
+        # con su peso como boost, de modo que solo se consultan los campos relevantes
+        should_clauses = []
+
+        # Agregar búsqueda de texto si hay query
+        if search_filters.query and search_filters.query.strip():
+            should_clauses = [
+                {
+                    "text": {
+                        "query": search_filters.query,
+                        "path": field_name,
+                        "score": {"boost": {"value": weight}}
+                    }
+                }
+                for field_name, weight in profile_weights(search_filters.profile).items()
+            ]
+
+        # Construir la cláusula 'filter' para los filtros específicos:
+        # el nombre del filtro coincide con el nombre del campo en el modelo y
+        # se usa el operador 'in' para manejar uno o más valores
+        filter_clauses = [
+            {"in": {"path": field_name, "value": values}}
+            for field_name, values in active_filters(search_filters).items()
+        ]
+
+        # Si no hay ni query ni filtros, usar find() simple
+        if not should_clauses and not filter_clauses:
+            return await self._browse(search_filters)
+
+        # Construir la pipeline de agregación con $search
+        search_stage = {
+            "$search": {
+                "index": self.INDEX_NAME,
+                "compound": {}
+            }
+        }
+
+        if should_clauses:
+            search_stage["$search"]["compound"]["should"] = should_clauses
+            search_stage["$search"]["compound"]["minimumShouldMatch"] = 1
+
+        if filter_clauses:
+            search_stage["$search"]["compound"]["filter"] = filter_clauses
+
+        # Continuar tras el último resultado de la página anterior
+        position = decode_cursor(search_filters.cursor, "atlas")
+        if position is not None:
+            if not isinstance(position.get("token"), str):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            search_stage["$search"]["searchAfter"] = position["token"]
+
+        # Se pide un resultado de más para saber si existe una página siguiente
+        page_stages = [
+            {"$limit": search_filters.limit + 1},
+            {
+                "$addFields": {
+                    "search_score": {"$meta": "searchScore"},
+                    "pagination_token": {"$meta": "searchSequenceToken"}
+                }
+            }
+        ]
+
+        facets = None
+        try:
+            if search_filters.facets:
+                hits, facets = await self._search_with_facets(search_stage, page_stages)
+            else:
+                # Beanie añade el $project de SearchHit
+                hits = await Paper.aggregate([search_stage, *page_stages], projection_model=SearchHit).to_list()
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error searching papers: {str(e)}")
+
+        page = hits[:search_filters.limit]
+        next_cursor = None
+        if len(hits) > search_filters.limit and page[-1].pagination_token:
+            next_cursor = encode_cursor("atlas", token=page[-1].pagination_token)
+
+        return SearchPapersResponse(
+            results=[PaperSummary.model_validate(hit.model_dump(exclude={"pagination_token"})) for hit in page],
+            next_cursor=next_cursor,
+            facets=facets,
+        )
+
+    async def _search_with_facets(self, search_stage: dict, page_stages: list) -> Tuple[List[SearchHit], FacetCounts]:
+        """
+        Ejecuta la búsqueda y el recuento por facetas en la misma consulta: el operador compound
+        pasa a un collector 'facet' y los contadores se leen de $$SEARCH_META dentro de un $facet.
+        """
+        search = search_stage["$search"]
+        collector = {
+            key: value for key, value in search.items() if key != "compound"
+        }
+        collector["facet"] = {
+            "operator": {"compound": search["compound"]},
+            "facets": {
+                field_name: {"type": "string", "path": field_name, "numBuckets": len(enum_class)}
+                for field_name, enum_class in FACET_FIELDS
+            }
+        }
+
+        pipeline = [
+            {"$search": collector},
+            {
+                "$facet": {
+                    "results": [*page_stages, {"$project": get_projection(SearchHit)}],
+                    "meta": [{"$replaceWith": "$$SEARCH_META"}, {"$limit": 1}]
+                }
+            }
+        ]
+        documents = await Paper.aggregate(pipeline).to_list()
+        if not documents:
+            return [], empty_facet_counts()
+
+        hits = [SearchHit.model_validate(hit) for hit in documents[0]["results"]]
+        meta = documents[0]["meta"][0].get("facet", {}) if documents[0]["meta"] else {}
+        facets = {
+            field_name: {
+                bucket["_id"]: bucket["count"]
+                for bucket in meta.get(field_name, {}).get("buckets", [])
+            }
+            for field_name, _ in FACET_FIELDS
+        }
+        return hits, facets
+
+    async def _browse(self, search_filters: SearchPapersRequest) -> SearchPapersResponse:
+        """
+        Listado sin consulta ni filtros, paginado por _id (keyset).
+        """
+        position = decode_cursor(search_filters.cursor, "id")
+        after_id = None
+        if position is not None:
+            try:
+                after_id = PydanticObjectId(position.get("after"))
+            except Exception:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        try:
+            if after_id is not None:
+                query = Paper.find(Paper.id > after_id, projection_model=PaperSummary)
+            else:
+                query = Paper.find_all(projection_model=PaperSummary)
+            papers: List[PaperSummary] = await query.sort("+_id").limit(search_filters.limit + 1).to_list()
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error searching papers: {str(e)}")
+
+        page = papers[:search_filters.limit]
+        next_cursor = encode_cursor("id", after=str(page[-1].id)) if len(papers) > search_filters.limit else None
+
+        # Sin consulta ni filtros las facetas son los contadores globales precomputados
+        facets = None
+        if search_filters.facets:
+            facets = get_filter_counts()
+            if facets is None:
+                facets = await compute_filter_counts()
+
+        return SearchPapersResponse(results=page, next_cursor=next_cursor, facets=facets)
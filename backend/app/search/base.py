@@ -0,0 +1,87 @@
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import Dict, Iterable, List
+
+from app.dto.search_papers_request import SearchPapersRequest
+from app.dto.search_papers_response import SearchPapersResponse
+from app.models.paper import PaperBase
+from app.services.filter_values_service import FILTER_FIELDS
+
+# Facetas calculadas en la búsqueda: los mismos campos que se ofrecen como filtros
+FACET_FIELDS = [(field_name, enum_class) for _, field_name, enum_class in FILTER_FIELDS]
+
+# Contadores por faceta: campo -> valor -> nº de papers
+FacetCounts = Dict[str, Dict[str, int]]
+
+
+def normalize_filter_name(name: str) -> str:
+    """
+    Convierte el nombre de un filtro al nombre del campo del modelo ("Study Type" -> "study_type").
+    """
+    return name.lower().replace(" ", "_")
+
+
+def empty_facet_counts() -> FacetCounts:
+    return {field_name: {} for field_name, _ in FACET_FIELDS}
+
+
+def active_filters(search_filters: SearchPapersRequest) -> dict[str, list[str]]:
+    """
+    Devuelve los filtros con valores como {campo: [valores]}.
+    """
+    filters: dict[str, list[str]] = {}
+    for filter_item in search_filters.filters or []:
+        if filter_item.values:
+            filters.setdefault(normalize_filter_name(filter_item.name), []).extend(filter_item.values)
+    return filters
+
+
+def _field_values(paper: PaperBase, field_name: str) -> List[str]:
+    value = getattr(paper, field_name, None)
+    values = value if isinstance(value, list) else [value]
+    return [item.value if isinstance(item, Enum) else item for item in values if item is not None]
+
+
+def matches_filters(paper: PaperBase, filters: Dict[str, List[str]]) -> bool:
+    """
+    Comprueba los filtros sobre un paper ya cargado (OR entre valores, AND entre campos).
+    """
+    return all(
+        any(value in values for value in _field_values(paper, field_name))
+        for field_name, values in filters.items()
+    )
+
+
+def count_facets(papers: Iterable[PaperBase]) -> FacetCounts:
+    """
+    Contadores por faceta de una colección de papers ya cargados.
+    """
+    facets = empty_facet_counts()
+    for paper in papers:
+        for field_name, counts in facets.items():
+            for value in set(_field_values(paper, field_name)):
+                counts[value] = counts.get(value, 0) + 1
+    return facets
+
+
+class SearchBackend(ABC):
+    """
+    Interfaz común de los motores de búsqueda de papers.
+    """
+
+    @abstractmethod
+    async def search(self, search_filters: SearchPapersRequest) -> SearchPapersResponse:
+        """
+        Devuelve una página de papers que cumplen los filtros, ordenados por relevancia para la
+        consulta, junto con el cursor de la página siguiente (search_filters.cursor indica la actual).
+        """
+
+    async def refresh(self) -> None:
+        """
+        (Re)construye las estructuras del backend a partir de la base de datos.
+        """
+
+    def invalidate(self) -> None:
+        """
+        Indica que el corpus cambió (p. ej. tras una ingesta).
+        """
@@ -0,0 +1,32 @@
+import base64
+import binascii
+import json
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException
+
+
+def encode_cursor(kind: str, **position: Any) -> str:
+    """
+    Codifica la posición de la última página como un cursor opaco (base64 url-safe de un JSON).
+    kind identifica la estrategia de paginación que lo generó.
+    """
+    payload = json.dumps({"k": kind, **position}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], kind: str) -> Optional[Dict[str, Any]]:
+    """
+    Decodifica un cursor generado por encode_cursor con la misma estrategia.
+    Devuelve None si no hay cursor y lanza un 400 si es inválido o de otra estrategia.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, binascii.Error, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(position, dict) or position.pop("k", None) != kind:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return position
@@ -0,0 +1,160 @@
+"""
+Embeddings de papers y consultas para la búsqueda semántica.
+
+Los vectores se devuelven como matrices float32 normalizadas (norma L2 = 1),
+de modo que el producto escalar es la similitud coseno.
+"""
+
+import asyncio
+import hashlib
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+import numpy as np
+from google.genai import types
+
+from app.config.settings import settings
+from app.config.vertexai_client import VertexAIClient
+from app.models.paper import PaperBase
+from app.utils.text_tokenizer import tokenize
+
+# Textos por lote al vectorizar el corpus (y máximo por petición si el modelo no tiene límite propio)
+EMBEDDING_BATCH_SIZE = 100
+
+# Máximo de textos por petición a embed_content según el modelo:
+# gemini-embedding-001 en Vertex AI solo admite una entrada por petición
+EMBEDDING_MODEL_BATCH_SIZES = {
+    "gemini-embedding-001": 1,
+}
+
+
+def embedding_batch_size(model: str) -> int:
+    """
+    Textos por petición a embed_content para el modelo (admite rutas "publishers/google/models/...").
+    """
+    return EMBEDDING_MODEL_BATCH_SIZES.get(model.rsplit("/", 1)[-1], EMBEDDING_BATCH_SIZE)
+
+
+def paper_embedding_text(paper: PaperBase) -> str:
+    """
+    Texto del paper que se vectoriza: título, abstract y resumen generado.
+    """
+    parts = [paper.title, paper.abstract, paper.ai_generated_summary]
+    return "\n\n".join(part.strip() for part in parts if part and part.strip())
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """
+    Normaliza cada fila a norma L2 = 1 (las filas nulas se dejan a cero).
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+class Embedder(ABC):
+    """
+    Interfaz de los modelos de embeddings.
+    name identifica el modelo (los vectores de modelos distintos no son comparables).
+    """
+
+    name: str
+    dimension: int
+
+    @abstractmethod
+    async def embed_documents(self, texts: List[str]) -> np.ndarray:
+        """
+        Matriz (len(texts), dimension) con el embedding de cada documento.
+        """
+
+    @abstractmethod
+    async def embed_query(self, text: str) -> np.ndarray:
+        """
+        Vector (dimension,) de una consulta.
+        """
+
+
+class HashingEmbedder(Embedder):
+    """
+    Embedder local y determinista (feature hashing de términos y bigramas con signo).
+    No necesita red ni credenciales: sirve para tests y despliegues sin Vertex AI.
+    """
+
+    def __init__(self, dimension: int) -> None:
+        self.dimension = dimension
+        self.name = f"hashing-{dimension}"
+
+    def _embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        tokens = tokenize(text)
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        for feature in features:
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            vector[value % self.dimension] += 1.0 if (value >> 63) & 1 else -1.0
+        return vector
+
+    async def embed_documents(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        return normalize_rows(np.stack([self._embed(text) for text in texts]))
+
+    async def embed_query(self, text: str) -> np.ndarray:
+        return normalize_rows(self._embed(text))
+
+
+class VertexEmbedder(Embedder):
+    """
+    Embeddings del modelo de Vertex AI configurado (EMBEDDING_MODEL_NAME).
+    Los textos se envían en peticiones de embedding_batch_size(model) textos, lanzadas
+    a la vez (VertexAIClient limita la concurrencia).
+    """
+
+    def __init__(self, model: str, dimension: int) -> None:
+        self.model = model
+        self.dimension = dimension
+        self.name = f"{model}-{dimension}"
+        self.batch_size = embedding_batch_size(model)
+
+    async def _embed_batch(self, texts: List[str], task_type: str) -> List[List[float]]:
+        response = await VertexAIClient().embed_content(
+            model=self.model,
+            contents=texts,
+            config=types.EmbedContentConfig(
+                task_type=task_type,
+                output_dimensionality=self.dimension,
+            ),
+        )
+        return [embedding.values for embedding in response.embeddings]
+
+    async def _embed(self, texts: List[str], task_type: str) -> np.ndarray:
+        batches = await asyncio.gather(*(
+            self._embed_batch(texts[start:start + self.batch_size], task_type)
+            for start in range(0, len(texts), self.batch_size)
+        ))
+        rows = [row for batch in batches for row in batch]
+        if not rows:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        return normalize_rows(np.array(rows, dtype=np.float32))
+
+    async def embed_documents(self, texts: List[str]) -> np.ndarray:
+        return await self._embed(texts, "RETRIEVAL_DOCUMENT")
+
+    async def embed_query(self, text: str) -> np.ndarray:
+        return (await self._embed([text], "RETRIEVAL_QUERY"))[0]
+
+
+_embedder: Optional[Embedder] = None
+
+
+def get_embedder() -> Embedder:
+    """
+    Devuelve el embedder configurado en settings.EMBEDDING_PROVIDER (instancia única).
+    """
+    global _embedder
+    if _embedder is None:
+        if settings.EMBEDDING_PROVIDER == "hashing":
+            _embedder = HashingEmbedder(settings.EMBEDDING_DIMENSION)
+        else:
+            _embedder = VertexEmbedder(settings.EMBEDDING_MODEL_NAME, settings.EMBEDDING_DIMENSION)
+    return _embedder
@@ -0,0 +1,21 @@
+from typing import Optional
+
+from app.config.settings import settings
+from app.search.base import SearchBackend
+
+_backend: Optional[SearchBackend] = None
+
+
+def get_search_backend() -> SearchBackend:
+    """
+    Devuelve el backend de búsqueda configurado en settings.SEARCH_BACKEND (instancia única).
+    """
+    global _backend
+    if _backend is None:
+        if settings.SEARCH_BACKEND == "local":
+            from app.search.local_backend import LocalSearchBackend
+            _backend = LocalSearchBackend()
+        else:
+            from app.search.atlas_backend import AtlasSearchBackend
+            _backend = AtlasSearchBackend()
+    return _backend
@@ -0,0 +1,139 @@
+"""
+Búsqueda semántica (vectores) e híbrida (fusión por rango recíproco con la búsqueda de texto).
+"""
+
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from fastapi import HTTPException
+
+from app.config.settings import settings
+from app.dto.search_papers_request import SearchPapersRequest
+from app.dto.search_papers_response import SearchPapersResponse
+from app.models.paper import Paper, PaperSummary
+from app.models.paper_embedding import PaperEmbedding
+from app.search.base import SearchBackend, active_filters, count_facets, matches_filters
+from app.search.cursor import decode_cursor, encode_cursor
+from app.search.embeddings import get_embedder
+from app.search.vector_index import IVFIndex
+
+logger = logging.getLogger(__name__)
+
+# Constante k de Reciprocal Rank Fusion: score = sum(1 / (k + rango))
+RRF_K = 60
+
+
+class VectorSearcher:
+    """
+    Índice de vectores en memoria con los embeddings del modelo configurado.
+    Como el índice local de texto, se reconstruye de forma perezosa tras una invalidación.
+    """
+
+    def __init__(self) -> None:
+        self._papers: List[PaperSummary] = []
+        self._index: Optional[IVFIndex] = None
+        self._dirty = True
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        self._dirty = True
+
+    async def _rebuild(self) -> None:
+        self._dirty = False
+        embedder = get_embedder()
+        vectors = {
+            embedding.paper_id: embedding.decode_vector()
+            for embedding in await PaperEmbedding.find(PaperEmbedding.model == embedder.name).to_list()
+        }
+        papers = await Paper.find_all(projection_model=PaperSummary).sort("+_id").to_list()
+        self._papers = [paper for paper in papers if str(paper.id) in vectors]
+        matrix = (
+            np.stack([vectors[str(paper.id)] for paper in self._papers])
+            if self._papers else np.zeros((0, embedder.dimension), dtype=np.float32)
+        )
+        self._index = IVFIndex(matrix)
+        logger.info("Índice de vectores construido con %d papers", len(self._papers))
+
+    async def nearest(
+        self, query: str, filters: Dict[str, List[str]], limit: int
+    ) -> List[Tuple[PaperSummary, float]]:
+        """
+        Los limit papers más similares a la consulta que cumplen los filtros.
+        """
+        if self._dirty or self._index is None:
+            async with self._lock:
+                if self._dirty or self._index is None:
+                    await self._rebuild()
+
+        query_vector = await get_embedder().embed_query(query)
+        # Con filtros se piden más vecinos, ya que parte de ellos se descartan
+        k = limit * 4 if filters else limit
+        positions, scores = self._index.search(query_vector, k, settings.VECTOR_SEARCH_PROBES)
+        hits = [
+            (self._papers[position], float(score))
+            for position, score in zip(positions, scores)
+            if matches_filters(self._papers[position], filters)
+        ]
+        return hits[:limit]
+
+
+vector_searcher = VectorSearcher()
+
+
+def reciprocal_rank_fusion(rankings: List[List[PaperSummary]], k: int = RRF_K) -> Dict[str, float]:
+    """
+    Puntuación RRF de cada paper (por ID) a partir de varias listas ordenadas.
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, paper in enumerate(ranking, start=1):
+            paper_id = str(paper.id)
+            scores[paper_id] = scores.get(paper_id, 0.0) + 1.0 / (k + rank)
+    return scores
+
+
+async def semantic_search(search_filters: SearchPapersRequest, text_backend: SearchBackend) -> SearchPapersResponse:
+    """
+    Búsqueda en modo "vector" (solo similitud de embeddings) o "hybrid" (RRF entre el ranking
+    de texto y el de vectores). Cada ranking aporta VECTOR_SEARCH_CANDIDATES candidatos; la
+    paginación recorre la lista fusionada con un cursor (puntuación, _id).
+    """
+    candidates = settings.VECTOR_SEARCH_CANDIDATES
+    filters = active_filters(search_filters)
+
+    vector_hits = await vector_searcher.nearest(search_filters.query, filters, candidates)
+    papers = {str(paper.id): paper for paper, _ in vector_hits}
+
+    if search_filters.mode == "vector":
+        scores = {str(paper.id): score for paper, score in vector_hits}
+    else:
+        text_request = search_filters.model_copy(update={"limit": candidates, "cursor": None, "facets": False})
+        text_results = (await text_backend.search(text_request)).results
+        for paper in text_results:
+            papers.setdefault(str(paper.id), paper)
+        scores = reciprocal_rank_fusion([text_results, [paper for paper, _ in vector_hits]])
+
+    # Orden: puntuación descendente y, a igualdad, _id ascendente
+    ranked = sorted((-score, paper_id) for paper_id, score in scores.items())
+
+    position = decode_cursor(search_filters.cursor, search_filters.mode)
+    if position is not None:
+        try:
+            last_key = (-float(position["score"]), str(position["after"]))
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        ranked = [item for item in ranked if item > last_key]
+
+    page = ranked[:search_filters.limit]
+    next_cursor = None
+    if len(ranked) > search_filters.limit:
+        negative_score, last_id = page[-1]
+        next_cursor = encode_cursor(search_filters.mode, score=-negative_score, after=last_id)
+
+    return SearchPapersResponse(
+        results=[papers[paper_id] for _, paper_id in page],
+        next_cursor=next_cursor,
+        facets=count_facets(papers[paper_id] for paper_id in scores) if search_filters.facets else None,
+    )
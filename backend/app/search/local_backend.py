@@ -0,0 +1,237 @@
+import asyncio
+import bisect
+import heapq
+import logging
+from enum import Enum
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from app.dto.search_papers_request import SearchPapersRequest
+from app.dto.search_papers_response import SearchPapersResponse
+from app.models.paper import Paper, PaperSummary
+from app.search.base import FacetCounts, SearchBackend, active_filters, empty_facet_counts
+from app.search.cursor import decode_cursor, encode_cursor
+from app.search.profiles import SEARCH_PROFILES, profile_weights
+from app.utils.bm25 import B, K1, idf
+from app.utils.text_tokenizer import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Campos de texto indexados: los de todos los perfiles salvo full_text, que no se carga en
+# memoria (los resúmenes no lo incluyen). Los pesos se aplican al consultar (BM25F).
+INDEXED_FIELDS: Tuple[str, ...] = tuple(dict.fromkeys(
+    field
+    for weights in SEARCH_PROFILES.values()
+    for field in weights
+    if field != "full_text"
+))
+
+
+class LocalSearchIndex:
+    """
+    Índice invertido en memoria construido a partir de los resúmenes de los papers.
+
+    - postings: término -> {posición del paper: frecuencias por campo (en el orden de fields)}
+    - lengths: longitud de cada campo por paper, para la normalización de BM25
+    - bitsets: campo -> valor -> entero cuyo bit i indica que el paper i tiene ese valor
+      (se construyen para todos los campos enum, simples o listas)
+
+    Los papers deben venir ordenados por _id (la paginación por keyset depende de ello).
+    """
+
+    def __init__(self, papers: List[PaperSummary], fields: Tuple[str, ...] = INDEXED_FIELDS) -> None:
+        self.papers = papers
+        self.ids = [str(paper.id) for paper in papers]
+        self.fields = fields
+        self.postings: Dict[str, Dict[int, List[int]]] = {}
+        self.lengths: List[List[int]] = []
+        self.bitsets: Dict[str, Dict[str, int]] = {}
+        self.all_bits = (1 << len(papers)) - 1
+
+        for doc, paper in enumerate(papers):
+            self._index_text(doc, paper)
+            self._index_enums(doc, paper)
+
+        totals = [0] * len(fields)
+        for field_lengths in self.lengths:
+            for i, length in enumerate(field_lengths):
+                totals[i] += length
+        self.average_lengths = [total / len(papers) if papers else 0.0 for total in totals]
+
+    def _index_text(self, doc: int, paper: PaperSummary) -> None:
+        field_lengths = []
+        for i, field in enumerate(self.fields):
+            value = getattr(paper, field, "") or ""
+            tokens = tokenize(" ".join(value) if isinstance(value, list) else value)
+            field_lengths.append(len(tokens))
+            for token in tokens:
+                frequencies = self.postings.setdefault(token, {}).setdefault(doc, [0] * len(self.fields))
+                frequencies[i] += 1
+        self.lengths.append(field_lengths)
+
+    def _index_enums(self, doc: int, paper: PaperSummary) -> None:
+        bit = 1 << doc
+        for field in type(paper).model_fields:
+            value = getattr(paper, field)
+            values = value if isinstance(value, list) else [value]
+            for item in values:
+                if isinstance(item, Enum):
+                    field_bits = self.bitsets.setdefault(field, {})
+                    field_bits[item.value] = field_bits.get(item.value, 0) | bit
+
+    def filter_mask(self, filters: Dict[str, List[str]]) -> int:
+        """
+        Máscara de papers que cumplen los filtros: OR entre valores de un campo, AND entre campos.
+        """
+        mask = self.all_bits
+        for field, values in filters.items():
+            field_bits = self.bitsets.get(field, {})
+            field_mask = 0
+            for value in values:
+                field_mask |= field_bits.get(value, 0)
+            mask &= field_mask
+            if not mask:
+                break
+        return mask
+
+    def score(self, query: str, mask: int, boosts: Dict[str, float]) -> Dict[int, float]:
+        """
+        Puntuación BM25F de los papers de la máscara que contienen algún término de la consulta.
+        boosts indica el peso de cada campo; los campos sin peso no puntúan.
+        """
+        weights = [boosts.get(field, 0.0) for field in self.fields]
+        average_length = sum(w * avg for w, avg in zip(weights, self.average_lengths)) or 1.0
+        total_documents = len(self.papers)
+
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            term_idf = idf(len(postings), total_documents)
+            for doc, frequencies in postings.items():
+                if not (mask >> doc) & 1:
+                    continue
+                frequency = sum(w * f for w, f in zip(weights, frequencies))
+                if not frequency:
+                    continue
+                length = sum(w * l for w, l in zip(weights, self.lengths[doc]))
+                norm = K1 * (1 - B + B * length / average_length)
+                scores[doc] = scores.get(doc, 0.0) + term_idf * frequency * (K1 + 1) / (frequency + norm)
+        return scores
+
+    def facet_counts(self, mask: int) -> FacetCounts:
+        """
+        Nº de papers de la máscara por valor de cada faceta (popcount de la intersección).
+        """
+        facets = empty_facet_counts()
+        for field_name, counts in facets.items():
+            for value, bits in self.bitsets.get(field_name, {}).items():
+                count = (mask & bits).bit_count()
+                if count:
+                    counts[value] = count
+        return facets
+
+    def iter_mask(self, mask: int):
+        """
+        Posiciones de los papers de la máscara, en orden de _id.
+        """
+        while mask:
+            low_bit = mask & -mask
+            yield low_bit.bit_length() - 1
+            mask ^= low_bit
+
+
+class LocalSearchBackend(SearchBackend):
+    """
+    Búsqueda en proceso sobre un índice invertido en memoria (sin Atlas Search).
+    El índice se construye desde la colección papers y se reconstruye de forma perezosa
+    en la siguiente búsqueda tras una invalidación.
+    """
+
+    def __init__(self) -> None:
+        self._index: Optional[LocalSearchIndex] = None
+        self._dirty = True
+        self._lock = asyncio.Lock()
+
+    async def refresh(self) -> None:
+        async with self._lock:
+            await self._rebuild()
+
+    async def _rebuild(self) -> None:
+        # Se marca limpio antes de leer: una invalidación durante la carga fuerza otra reconstrucción
+        self._dirty = False
+        papers = await Paper.find_all(projection_model=PaperSummary).sort("+_id").to_list()
+        self._index = LocalSearchIndex(papers)
+        logger.info("Índice de búsqueda local construido con %d papers", len(papers))
+
+    def invalidate(self) -> None:
+        self._dirty = True
+
+    async def _get_index(self) -> LocalSearchIndex:
+        if self._dirty or self._index is None:
+            async with self._lock:
+                if self._dirty or self._index is None:
+                    await self._rebuild()
+        return self._index
+
+    async def search(self, search_filters: SearchPapersRequest) -> SearchPapersResponse:
+        """
+        Paginación por cursor: keyset sobre _id sin consulta y sobre (puntuación, _id) con consulta.
+        """
+        index = await self._get_index()
+        mask = index.filter_mask(active_filters(search_filters))
+        limit = search_filters.limit
+
+        if not (search_filters.query and search_filters.query.strip()):
+            facets = index.facet_counts(mask) if search_filters.facets else None
+            position = decode_cursor(search_filters.cursor, "id")
+            if position is not None:
+                # Los papers están ordenados por _id: se descartan los anteriores al cursor
+                start = bisect.bisect_right(index.ids, str(position.get("after", "")))
+                mask &= ~((1 << start) - 1)
+            docs = []
+            for doc in index.iter_mask(mask):
+                docs.append(doc)
+                if len(docs) > limit:
+                    break
+            page = docs[:limit]
+            next_cursor = encode_cursor("id", after=index.ids[page[-1]]) if len(docs) > limit else None
+            return SearchPapersResponse(
+                results=[index.papers[doc] for doc in page],
+                next_cursor=next_cursor,
+                facets=facets,
+            )
+
+        # Orden: puntuación descendente y, a igualdad, _id ascendente
+        scores = index.score(search_filters.query, mask, profile_weights(search_filters.profile))
+
+        facets = None
+        if search_filters.facets:
+            matched = 0
+            for doc in scores:
+                matched |= 1 << doc
+            facets = index.facet_counts(matched)
+
+        ranked = ((-score, index.ids[doc], doc) for doc, score in scores.items())
+
+        position = decode_cursor(search_filters.cursor, "local")
+        if position is not None:
+            try:
+                last_key = (-float(position["score"]), str(position["after"]))
+            except (KeyError, TypeError, ValueError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            ranked = (item for item in ranked if item[:2] > last_key)
+
+        top = heapq.nsmallest(limit + 1, ranked)
+        page = top[:limit]
+        next_cursor = None
+        if len(top) > limit:
+            negative_score, last_id, _ = page[-1]
+            next_cursor = encode_cursor("local", score=-negative_score, after=last_id)
+        return SearchPapersResponse(
+            results=[index.papers[doc] for _, _, doc in page],
+            next_cursor=next_cursor,
+            facets=facets,
+        )
@@ -0,0 +1,39 @@
+from typing import Dict, Literal
+
+# Perfiles de búsqueda: campo -> peso (boost) con el que puntúa una coincidencia en ese campo.
+# Solo se consultan los campos del perfil; full_text tiene peso bajo y solo entra en "deep".
+SearchProfile = Literal["default", "title", "authors", "deep"]
+
+SEARCH_PROFILES: Dict[str, Dict[str, float]] = {
+    "default": {
+        "title": 4.0,
+        "abstract": 2.0,
+        "ai_generated_summary": 1.5,
+        "key_findings": 1.5,
+        "authors": 1.0,
+    },
+    "title": {
+        "title": 1.0,
+    },
+    "authors": {
+        "authors": 3.0,
+        "title": 1.0,
+    },
+    "deep": {
+        "title": 4.0,
+        "abstract": 2.0,
+        "ai_generated_summary": 1.5,
+        "key_findings": 1.5,
+        "authors": 1.0,
+        "full_text": 0.3,
+    },
+}
+
+DEFAULT_PROFILE: SearchProfile = "default"
+
+
+def profile_weights(profile: str) -> Dict[str, float]:
+    """
+    Pesos por campo de un perfil (el perfil por defecto si no existe).
+    """
+    return SEARCH_PROFILES.get(profile, SEARCH_PROFILES[DEFAULT_PROFILE])
@@ -0,0 +1,71 @@
+"""
+Índice ANN en memoria (IVF) sobre vectores normalizados, implementado con NumPy.
+
+Los vectores se agrupan con k-means esférico en ~sqrt(n) listas; una consulta solo
+compara contra los vectores de las n_probe listas con centroide más cercano.
+Con pocos vectores se usa búsqueda exacta (una única lista).
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+# Por debajo de este número de vectores la búsqueda exacta es más rápida que el IVF
+MIN_VECTORS_FOR_IVF = 256
+KMEANS_ITERATIONS = 10
+
+
+class IVFIndex:
+    def __init__(self, vectors: np.ndarray, seed: int = 0) -> None:
+        """
+        Args:
+            vectors: Matriz (n, d) float32 con filas de norma 1
+            seed: Semilla de la inicialización de k-means (índice reproducible)
+        """
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        total = len(self.vectors)
+
+        if total < MIN_VECTORS_FOR_IVF:
+            self.centroids = np.zeros((1, self.vectors.shape[1]), dtype=np.float32)
+            self.lists = [np.arange(total)]
+            return
+
+        n_lists = int(np.sqrt(total))
+        rng = np.random.default_rng(seed)
+        centroids = self.vectors[rng.choice(total, size=n_lists, replace=False)].copy()
+        for _ in range(KMEANS_ITERATIONS):
+            assignment = np.argmax(self.vectors @ centroids.T, axis=1)
+            for i in range(n_lists):
+                members = self.vectors[assignment == i]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    centroids[i] = centroid / (np.linalg.norm(centroid) or 1.0)
+
+        assignment = np.argmax(self.vectors @ centroids.T, axis=1)
+        self.centroids = centroids
+        self.lists = [np.flatnonzero(assignment == i) for i in range(n_lists)]
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def search(self, query: np.ndarray, k: int, n_probe: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Devuelve (posiciones, similitudes) de los k vectores más similares a la consulta,
+        ordenados de mayor a menor similitud.
+        """
+        if not len(self.vectors) or k <= 0:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.float32)
+
+        if len(self.lists) == 1:
+            candidates = self.lists[0]
+        else:
+            probes = np.argsort(-(self.centroids @ query))[:n_probe]
+            candidates = np.concatenate([self.lists[i] for i in probes])
+
+        scores = self.vectors[candidates] @ query
+        if len(candidates) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(candidates))
+        order = top[np.argsort(-scores[top], kind="stable")]
+        return candidates[order], scores[order]
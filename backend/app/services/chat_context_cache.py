@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+from google.genai import types
+
+from app.config.settings import settings
+from app.config.vertexai_client import VertexAIClient
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ChatContext:
+    """
+    Contexto de sistema a usar en una llamada al modelo.
+    Solo uno de los dos campos viene informado.
+    """
+
+    cached_content: Optional[str] = None
+    system_instruction: Optional[str] = None
+
+
+@dataclass
+class _CacheEntry:
+    # Nombre del CachedContent en Vertex AI (None si no se pudo crear, p. ej. texto demasiado corto)
+    name: Optional[str]
+    expires_at: float
+
+
+class ChatContextCache:
+    """
+    Cache por paper del prompt de sistema del chat usando Gemini cached contents.
+
+    - La clave es (paper_id, nombre del prompt, versión del prompt), de modo que al
+      cambiar la plantilla se crea un contexto nuevo.
+    - Cada entrada caduca con el TTL configurado (el mismo que se fija en Vertex AI).
+    - Al superar el máximo de entradas se expulsa la menos usada recientemente y se
+      borra su CachedContent remoto.
+    - Si no se puede crear la cache (texto por debajo del mínimo de tokens, error de la
+      API...) se recuerda el fallo hasta que caduque y se usa system_instruction.
+    """
+
+    # Margen para no usar un contexto remoto a punto de expirar
+    EXPIRY_MARGIN_SECONDS = 30
+
+    def __init__(self, ttl_seconds: int, max_entries: int, enabled: bool = True) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = enabled
+
+        self._entries: "OrderedDict[tuple, _CacheEntry]" = OrderedDict()
+        self._locks: dict[tuple, asyncio.Lock] = {}
+        self._background_tasks: set[asyncio.Task] = set()
+
+    async def resolve(
+        self,
+        paper_id: str,
+        prompt_name: str,
+        prompt_version: str,
+        render_system_prompt: Callable[[], Awaitable[str]],
+    ) -> ChatContext:
+        """
+        Devuelve el contexto a usar para el paper.
+
+        render_system_prompt solo se invoca si no hay un contexto cacheado válido,
+        así que en los turnos siguientes ni siquiera se carga el texto del paper.
+        """
+        if not self.enabled:
+            return ChatContext(system_instruction=await render_system_prompt())
+
+        key = (paper_id, prompt_name, prompt_version)
+        entry = self._get_valid(key)
+        if entry is not None and entry.name:
+            return ChatContext(cached_content=entry.name)
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Otra petición pudo haber creado el contexto mientras esperábamos
+            entry = self._get_valid(key)
+            if entry is not None and entry.name:
+                return ChatContext(cached_content=entry.name)
+
+            system_prompt = await render_system_prompt()
+            if entry is None:
+                name = await self._create_remote(paper_id, prompt_name, system_prompt)
+                self._store(key, name)
+                if name:
+                    return ChatContext(cached_content=name)
+
+        return ChatContext(system_instruction=system_prompt)
+
+    def invalidate(self, paper_id: str) -> None:
+        """
+        Elimina todos los contextos cacheados de un paper (p. ej. al reingestarlo).
+        """
+        for key in [k for k in self._entries if k[0] == paper_id]:
+            self._evict(key)
+
+    def clear(self) -> None:
+        """
+        Elimina todos los contextos cacheados (p. ej. si cambió todo el corpus).
+        """
+        for key in list(self._entries):
+            self._evict(key)
+
+    def _get_valid(self, key: tuple) -> Optional[_CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._evict(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: tuple, name: Optional[str]) -> None:
+        expires_at = time.monotonic() + max(self.ttl_seconds - self.EXPIRY_MARGIN_SECONDS, 0)
+        self._entries[key] = _CacheEntry(name=name, expires_at=expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            oldest_key = next(iter(self._entries))
+            self._evict(oldest_key)
+
+    def _evict(self, key: tuple) -> None:
+        entry = self._entries.pop(key, None)
+        lock = self._locks.get(key)
+        if lock is not None and not lock.locked():
+            del self._locks[key]
+        if entry is not None and entry.name:
+            task = asyncio.create_task(self._delete_remote(entry.name))
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+
+    async def _create_remote(self, paper_id: str, prompt_name: str, system_prompt: str) -> Optional[str]:
+        try:
+            cached = await asyncio.wait_for(
+                VertexAIClient().client.aio.caches.create(
+                    model=settings.VERTEXAI_MODEL_NAME,
+                    config=types.CreateCachedContentConfig(
+                        display_name=f"{prompt_name}:{paper_id}",
+                        system_instruction=system_prompt,
+                        ttl=f"{self.ttl_seconds}s",
+                    ),
+                ),
+                timeout=settings.VERTEXAI_TIMEOUT_SECONDS,
+            )
+            return cached.name
+        except Exception as e:
+            logger.warning("No se pudo crear el contexto cacheado para el paper %s: %s", paper_id, e)
+            return None
+
+    async def _delete_remote(self, name: str) -> None:
+        try:
+            await VertexAIClient().client.aio.caches.delete(name=name)
+        except Exception as e:
+            # El contexto caduca solo por TTL, así que un fallo aquí no es crítico
+            logger.debug("No se pudo borrar el contexto cacheado %s: %s", name, e)
+
+
+chat_context_cache = ChatContextCache(
+    ttl_seconds=settings.CHAT_CONTEXT_CACHE_TTL_SECONDS,
+    max_entries=settings.CHAT_CONTEXT_CACHE_MAX_ENTRIES,
+    enabled=settings.CHAT_CONTEXT_CACHE_ENABLED,
+)
@@ -4,24 +4,38 @@ from app.dto.chat_session_response import ChatSessionResponse
 from app.config.vertexai_client import VertexAIClient
 from app.config.settings import settings
 from app.utils.prompt_loader import PromptLoader
-from app.models.paper import Paper
+from app.services.chat_context_cache import chat_context_cache
+from app.services.paper_index_service import retrieve_relevant_chunks
+from app.services.paper_cache import get_paper
 from app.models.chat import ChatHistory
-from beanie import PydanticObjectId
+from app.services.chat_session_store import append_turn, create_session, session_exists, touch_session
+from app.models.paper_chunk import PaperChunk
 from google.genai import types
 from google.genai.types import GenerateContentConfig
 from fastapi import HTTPException
-from datetime import datetime, timezone, timedelta
-import uuid
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
+import json
 
 
-async def chat(request: ChatRequest) -> ChatMessage:
-    # Intentar obtener el paper de la base de datos si es un ObjectId válido
-    paper = None
+CHAT_PROMPT_NAME = "chat_system_biology_paper_expert"
+CHAT_EXCERPTS_PROMPT_NAME = "chat_system_biology_paper_excerpts"
+
+# Mensajes de usuario recientes usados como consulta de recuperación (para preguntas de seguimiento)
+RETRIEVAL_QUERY_USER_TURNS = 2
+
+prompt_loader = PromptLoader()
+
+
+async def load_paper_text(paper_id: str) -> str:
+    """
+    Obtiene el texto completo del paper, o un texto por defecto si no existe.
+    """
     paper_text = ""
 
+    # Intentar obtener el paper (cache en memoria o base de datos) si es un ObjectId válido
     try:
-        paper_id = PydanticObjectId(request.paper_id)
-        paper = await Paper.get(paper_id)
+        paper = await get_paper(paper_id)
         if paper:
             paper_text = (paper.full_text or "").strip()
     except Exception:
@@ -30,48 +44,179 @@ async def chat(request: ChatRequest) -> ChatMessage:
 
     # Si no hay paper o no tiene texto, usar un texto por defecto
     if not paper_text:
-        paper_text = f"Este es un artículo de investigación científica sobre exploración espacial (ID: {request.paper_id}). No se encontró el texto completo en la base de datos."
+        paper_text = f"Este es un artículo de investigación científica sobre exploración espacial (ID: {paper_id}). No se encontró el texto completo en la base de datos."
+
+    return paper_text
+
+
+def format_excerpts(chunks: list[PaperChunk]) -> str:
+    """
+    Formatea los fragmentos recuperados para el prompt, etiquetados con su sección.
+    """
+    return "\n\n".join(f"[{chunk.section}]\n{chunk.text}" for chunk in chunks)
+
+
+async def build_excerpts_system_prompt(request: ChatRequest, history: list[dict]) -> Optional[str]:
+    """
+    Construye el prompt de sistema solo con los fragmentos del paper relevantes
+    para los últimos mensajes del usuario. Devuelve None si el paper no tiene fragmentos.
+    """
+    user_messages = [m["content"] for m in history if m.get("role") == "user"] + [request.message]
+    query = " ".join(user_messages[-RETRIEVAL_QUERY_USER_TURNS:])
+
+    chunks = await retrieve_relevant_chunks([request.paper_id], query, settings.CHAT_RETRIEVAL_TOP_K)
+    if not chunks:
+        return None
+    return prompt_loader.render(CHAT_EXCERPTS_PROMPT_NAME, {"paper_excerpts": format_excerpts(chunks)})
 
-    # Cargar prompt de sistema y renderizar con el texto del paper
-    loader = PromptLoader()
-    system_prompt = loader.render("chat_system_biology_paper_expert", {"paper_text": paper_text})
+
+async def build_chat_inputs(request: ChatRequest, history: list[dict]) -> tuple[GenerateContentConfig, list[types.Content]]:
+    """
+    Construye la configuración (contexto del paper) y los contenidos de la
+    conversación para enviar a Vertex AI.
+
+    La conversación se reconstruye a partir del historial guardado en la sesión
+    más el nuevo mensaje del usuario.
+
+    - En modo "retrieval" el prompt de sistema lleva solo los fragmentos relevantes.
+    - En modo "full_text" (o si el paper no tiene fragmentos) lleva el texto completo,
+      cacheado en Vertex AI por paper para que los turnos siguientes solo envíen la conversación.
+    """
+    config = None
+    if settings.CHAT_CONTEXT_MODE == "retrieval":
+        system_prompt = await build_excerpts_system_prompt(request, history)
+        if system_prompt:
+            config = GenerateContentConfig(system_instruction=system_prompt)
+
+    if config is None:
+        async def render_system_prompt() -> str:
+            paper_text = await load_paper_text(request.paper_id)
+            return prompt_loader.render(CHAT_PROMPT_NAME, {"paper_text": paper_text})
+
+        context = await chat_context_cache.resolve(
+            request.paper_id,
+            CHAT_PROMPT_NAME,
+            prompt_loader.version(CHAT_PROMPT_NAME),
+            render_system_prompt,
+        )
+        config = GenerateContentConfig(
+            cached_content=context.cached_content,
+            system_instruction=context.system_instruction,
+        )
 
     # Construye los contenidos usando los objetos oficiales de la SDK (types.Content/Part)
     contents = [
         types.Content(
-            role=m.role,
-            parts=[types.Part.from_text(text=m.content)],
+            role=m["role"],
+            parts=[types.Part.from_text(text=m["content"])],
         )
-        for m in request.messages
+        for m in history
     ]
+    contents.append(types.Content(
+        role="user",
+        parts=[types.Part.from_text(text=request.message)],
+    ))
 
-    client = VertexAIClient().client
-    response = client.models.generate_content(
-        model=settings.VERTEXAI_MODEL_NAME,
-        contents=contents,
-        config=GenerateContentConfig(
-            system_instruction=system_prompt,
-        ),
-    )
+    return config, contents
 
-    # Extraer el texto de la respuesta y validar que no esté vacío
-    content = getattr(response, "text", None)
-    if not content or not str(content).strip():
-        raise HTTPException(status_code=502, detail="Vertex AI no devolvió contenido.")
 
-    # Validar que se proporcione session_token
+def require_session_token(request: ChatRequest):
+    """
+    Valida que la petición incluya session_token.
+    """
     if not request.session_token:
         raise HTTPException(
             status_code=400,
             detail="Se requiere session_token. Primero inicializa una sesión con GET /chat/session/{paper_id}"
         )
 
-    # Guardar todo el historial de chat en la base de datos
-    await save_chat_history(request.paper_id, request.session_token, request.messages, content)
+
+async def chat(request: ChatRequest) -> ChatMessage:
+    require_session_token(request)
+    history = await load_session_messages(request.paper_id, request.session_token)
+    config, contents = await build_chat_inputs(request, history)
+
+    # Llamada asíncrona: no bloquea el event loop mientras el modelo responde
+    try:
+        response = await VertexAIClient().generate_content(
+            model=settings.VERTEXAI_MODEL_NAME,
+            contents=contents,
+            config=config,
+        )
+    except TimeoutError:
+        raise HTTPException(status_code=504, detail="Vertex AI no respondió a tiempo.")
+
+    # Extraer el texto de la respuesta y validar que no esté vacío
+    content = getattr(response, "text", None)
+    if not content or not str(content).strip():
+        raise HTTPException(status_code=502, detail="Vertex AI no devolvió contenido.")
+
+    # Guardar el nuevo turno (pregunta y respuesta) en la base de datos
+    await save_chat_history(request.paper_id, request.session_token, request.message, content)
 
     return ChatMessage(role="model", content=content)
 
 
+def _sse_event(data: dict, event: Optional[str] = None) -> str:
+    """
+    Formatea un evento Server-Sent Events con payload JSON.
+    """
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {payload}\n\n"
+
+
+async def chat_stream(request: ChatRequest) -> AsyncIterator[str]:
+    """
+    Variante en streaming de chat().
+
+    Valida la petición y prepara el prompt antes de devolver el generador, de modo que
+    los errores de validación se responden con su código HTTP antes de abrir el stream.
+    El generador emite eventos SSE:
+      - data: {"delta": "..."} por cada fragmento de texto
+      - event: done, con el mensaje completo, tras guardarlo con save_chat_history
+      - event: error, si el modelo falla o no se puede guardar el historial
+    """
+    require_session_token(request)
+    history = await load_session_messages(request.paper_id, request.session_token)
+    config, contents = await build_chat_inputs(request, history)
+
+    async def event_stream() -> AsyncIterator[str]:
+        parts: list[str] = []
+        try:
+            async for chunk in VertexAIClient().generate_content_stream(
+                model=settings.VERTEXAI_MODEL_NAME,
+                contents=contents,
+                config=config,
+            ):
+                text = getattr(chunk, "text", None)
+                if text:
+                    parts.append(text)
+                    yield _sse_event({"delta": text})
+        except TimeoutError:
+            yield _sse_event({"status_code": 504, "detail": "Vertex AI no respondió a tiempo."}, event="error")
+            return
+        except Exception as e:
+            yield _sse_event({"status_code": 502, "detail": f"Error en Vertex AI: {e}"}, event="error")
+            return
+
+        content = "".join(parts)
+        if not content.strip():
+            yield _sse_event({"status_code": 502, "detail": "Vertex AI no devolvió contenido."}, event="error")
+            return
+
+        # El stream terminó completo: persistir la respuesta antes de cerrar
+        try:
+            await save_chat_history(request.paper_id, request.session_token, request.message, content)
+        except HTTPException as e:
+            yield _sse_event({"status_code": e.status_code, "detail": e.detail}, event="error")
+            return
+
+        yield _sse_event(ChatMessage(role="model", content=content).model_dump(), event="done")
+
+    return event_stream()
+
+
 async def initialize_or_get_session(paper_id: str, session_token: str = None) -> ChatSessionResponse:
     """
     Inicializa una nueva sesión de chat o recupera una existente.
@@ -80,51 +225,23 @@ async def initialize_or_get_session(paper_id: str, session_token: str = None) ->
     - Si el token expiró o no existe, crea una nueva sesión
     - Si no se proporciona token, crea una nueva sesión
     """
-    SESSION_TIMEOUT_MINUTES = 2
-
-    # Si se proporciona un token, intentar recuperar la sesión
+    # Si se proporciona un token, validar y actualizar la sesión en una sola operación
     if session_token:
-        chat_history = await ChatHistory.find_one(
-            ChatHistory.session_token == session_token,
-            ChatHistory.paper_id == paper_id
-        )
-
+        chat_history = await touch_session(paper_id, session_token)
         if chat_history:
-            # Verificar si la sesión aún está activa (< 2 min sin actividad)
-            # Asegurar que last_activity tenga timezone
-            last_activity = chat_history.last_activity
-            if last_activity.tzinfo is None:
-                last_activity = last_activity.replace(tzinfo=timezone.utc)
-
-            time_since_activity = datetime.now(timezone.utc) - last_activity
-
-            if time_since_activity < timedelta(minutes=SESSION_TIMEOUT_MINUTES):
-                # Sesión válida, actualizar última actividad
-                chat_history.last_activity = datetime.now(timezone.utc)
-                await chat_history.save()
-
-                return ChatSessionResponse(
-                    session_token=chat_history.session_token,
-                    paper_id=chat_history.paper_id,
-                    messages=chat_history.messages,
-                    is_new_session=False,
-                    last_activity=chat_history.last_activity
-                )
+            return ChatSessionResponse(
+                session_token=chat_history.session_token,
+                paper_id=chat_history.paper_id,
+                messages=chat_history.messages,
+                is_new_session=False,
+                last_activity=chat_history.last_activity
+            )
 
     # Crear nueva sesión
-    new_session_token = str(uuid.uuid4())
-    chat_history = ChatHistory(
-        paper_id=paper_id,
-        session_token=new_session_token,
-        messages=[],
-        last_activity=datetime.now(timezone.utc),
-        created_at=datetime.now(timezone.utc),
-        updated_at=datetime.now(timezone.utc)
-    )
-    await chat_history.insert()
+    chat_history = await create_session(paper_id)
 
     return ChatSessionResponse(
-        session_token=new_session_token,
+        session_token=chat_history.session_token,
         paper_id=paper_id,
         messages=[],
         is_new_session=True,
@@ -132,55 +249,40 @@ async def initialize_or_get_session(paper_id: str, session_token: str = None) ->
     )
 
 
-async def save_chat_history(paper_id: str, session_token: str, user_messages: list, model_response: str):
+async def _raise_session_error(paper_id: str, session_token: str):
     """
-    Guarda el historial de chat en la base de datos para una sesión específica.
-    Actualiza la última actividad de la sesión.
+    Lanza 404 si la sesión no existe o 410 si existe pero expiró.
     """
-    SESSION_TIMEOUT_MINUTES = 2
+    if await session_exists(paper_id, session_token):
+        raise HTTPException(status_code=410, detail="Sesión expirada. Por favor, inicia una nueva sesión.")
+    raise HTTPException(status_code=404, detail="Sesión no encontrada o expirada")
 
-    # Buscar la sesión por token y paper_id
-    chat_history = await ChatHistory.find_one(
-        ChatHistory.session_token == session_token,
-        ChatHistory.paper_id == paper_id
-    )
 
-    if not chat_history:
-        raise HTTPException(status_code=404, detail="Sesión no encontrada o expirada")
+async def load_session_messages(paper_id: str, session_token: str) -> list[dict]:
+    """
+    Recupera el historial de una sesión activa y renueva su actividad. El servidor es la
+    fuente de verdad de la conversación: el cliente solo envía el nuevo mensaje.
+    """
+    chat_history = await touch_session(paper_id, session_token)
+    if chat_history is None:
+        await _raise_session_error(paper_id, session_token)
+    return chat_history.messages
 
-    # Verificar si la sesión expiró
-    # Asegurar que last_activity tenga timezone
-    last_activity = chat_history.last_activity
-    if last_activity.tzinfo is None:
-        last_activity = last_activity.replace(tzinfo=timezone.utc)
 
-    time_since_activity = datetime.now(timezone.utc) - last_activity
-    if time_since_activity >= timedelta(minutes=SESSION_TIMEOUT_MINUTES):
-        raise HTTPException(status_code=410, detail="Sesión expirada. Por favor, inicia una nueva sesión.")
+async def save_chat_history(paper_id: str, session_token: str, user_message: str, model_response: str):
+    """
+    Añade el nuevo turno (mensaje del usuario y respuesta del modelo) al historial de la sesión
+    con un único $push atómico, sin reescribir los mensajes anteriores.
+    Actualiza la última actividad de la sesión.
+    """
+    now = datetime.now(timezone.utc)
+    new_messages = [
+        {"role": "user", "content": user_message, "timestamp": now},
+        {"role": "model", "content": model_response, "timestamp": now},
+    ]
 
-    # Convertir todos los mensajes a un formato consistente con timestamp
-    all_messages = []
-
-    # Agregar todos los mensajes del usuario
-    for msg in user_messages:
-        all_messages.append({
-            "role": msg.role,
-            "content": msg.content,
-            "timestamp": datetime.now(timezone.utc)
-        })
-
-    # Agregar la respuesta del modelo
-    all_messages.append({
-        "role": "model",
-        "content": model_response,
-        "timestamp": datetime.now(timezone.utc)
-    })
-
-    # Actualizar el historial agregando los nuevos mensajes
-    chat_history.messages.extend(all_messages)
-    chat_history.last_activity = datetime.now(timezone.utc)
-    chat_history.updated_at = datetime.now(timezone.utc)
-    await chat_history.save()
+    if not await append_turn(paper_id, session_token, new_messages):
+        await _raise_session_error(paper_id, session_token)
 
 
 async def get_chat_history(paper_id: str):
@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from beanie import UpdateResponse
+
+from app.models.chat import ChatHistory
+
+# Minutos sin actividad tras los que una sesión de chat expira
+SESSION_TIMEOUT_MINUTES = 2
+
+
+def _active_session_filter(paper_id: str, session_token: str, now: datetime) -> tuple:
+    """
+    Filtro de sesión activa: token y paper coinciden y hubo actividad dentro del timeout.
+    Usa el índice compuesto (session_token, paper_id).
+    """
+    return (
+        ChatHistory.session_token == session_token,
+        ChatHistory.paper_id == paper_id,
+        ChatHistory.last_activity > now - timedelta(minutes=SESSION_TIMEOUT_MINUTES),
+    )
+
+
+async def touch_session(paper_id: str, session_token: str) -> Optional[ChatHistory]:
+    """
+    Valida que la sesión exista y no haya expirado y actualiza last_activity,
+    todo en un único find_one_and_update.
+
+    Returns:
+        La sesión ya actualizada, o None si no existe o expiró
+    """
+    now = datetime.now(timezone.utc)
+    return await ChatHistory.find_one(
+        *_active_session_filter(paper_id, session_token, now)
+    ).update(
+        {"$set": {"last_activity": now}},
+        response_type=UpdateResponse.NEW_DOCUMENT,
+    )
+
+
+async def append_turn(paper_id: str, session_token: str, messages: list[dict]) -> bool:
+    """
+    Añade mensajes al historial de una sesión activa con un $push atómico
+    y actualiza last_activity y updated_at.
+
+    Returns:
+        False si la sesión no existe o expiró
+    """
+    now = datetime.now(timezone.utc)
+    result = await ChatHistory.find_one(
+        *_active_session_filter(paper_id, session_token, now)
+    ).update({
+        "$push": {"messages": {"$each": messages}},
+        "$set": {"last_activity": now, "updated_at": now},
+    })
+    return result is not None and result.matched_count > 0
+
+
+async def session_exists(paper_id: str, session_token: str) -> bool:
+    """
+    Indica si existe la sesión, sin tener en cuenta la expiración.
+    Solo se usa para distinguir "no encontrada" de "expirada" en los errores.
+    """
+    return await ChatHistory.find_one(
+        ChatHistory.session_token == session_token,
+        ChatHistory.paper_id == paper_id,
+    ).count() > 0
+
+
+async def create_session(paper_id: str) -> ChatHistory:
+    """
+    Crea una nueva sesión vacía para el paper.
+    """
+    now = datetime.now(timezone.utc)
+    chat_history = ChatHistory(
+        paper_id=paper_id,
+        messages=[],
+        last_activity=now,
+        created_at=now,
+        updated_at=now
+    )
+    await chat_history.insert()
+    return chat_history
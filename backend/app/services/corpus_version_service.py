@@ -0,0 +1,104 @@
+import asyncio
+import logging
+from typing import Iterable, Optional
+
+from pymongo import ReturnDocument
+
+from app.config.settings import settings
+from app.models.corpus_state import CorpusState
+from app.search.factory import get_search_backend
+from app.search.hybrid import vector_searcher
+from app.services.chat_context_cache import chat_context_cache
+from app.services.paper_cache import clear_paper_cache, invalidate_paper
+from app.services.paper_index_service import forget_checked_papers
+from app.services.search_cache import search_cache
+
+logger = logging.getLogger(__name__)
+
+CORPUS_STATE_ID = "papers"
+# Cambios recientes que se conservan; un proceso más atrasado descarta todas sus caches
+MAX_TRACKED_CHANGES = 256
+
+# Última versión aplicada en este proceso (None hasta la primera sincronización)
+_applied_version: Optional[int] = None
+
+
+def _apply_corpus_state(state: Optional[dict]) -> int:
+    """
+    Aplica en este proceso los cambios del corpus que aún no había visto:
+    descarta los papers modificados de las caches en memoria e invalida la cache de
+    búsquedas y los índices locales (texto y vectores), que se reconstruyen al usarse.
+    """
+    global _applied_version
+    version = state.get("version", 0) if state else 0
+    if version == _applied_version:
+        return version
+
+    changes = state.get("changes", []) if state else []
+    first_tracked = version - len(changes) + 1
+    if _applied_version is None or _applied_version + 1 < first_tracked or version < _applied_version:
+        pending = [None]
+    else:
+        pending = changes[_applied_version + 1 - first_tracked:]
+
+    if any(paper_ids is None for paper_ids in pending):
+        clear_paper_cache()
+        chat_context_cache.clear()
+        forget_checked_papers()
+    else:
+        changed = {paper_id for paper_ids in pending for paper_id in paper_ids}
+        for paper_id in changed:
+            invalidate_paper(paper_id)
+            chat_context_cache.invalidate(paper_id)
+        forget_checked_papers(changed)
+    search_cache.set_corpus_version(version)
+    get_search_backend().invalidate()
+    vector_searcher.invalidate()
+
+    _applied_version = version
+    return version
+
+
+async def bump_corpus_version(paper_ids: Optional[Iterable[str]] = None) -> int:
+    """
+    Registra una ingesta: incrementa la versión del corpus en MongoDB (de forma atómica)
+    y aplica el cambio en este proceso. Sin paper_ids se considera modificado todo el corpus.
+
+    Returns:
+        Nueva versión del corpus
+    """
+    change = None if paper_ids is None else sorted(set(paper_ids))
+    state = await CorpusState.get_pymongo_collection().find_one_and_update(
+        {"_id": CORPUS_STATE_ID},
+        {
+            "$inc": {"version": 1},
+            "$push": {"changes": {"$each": [change], "$slice": -MAX_TRACKED_CHANGES}},
+        },
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return _apply_corpus_state(state)
+
+
+async def sync_corpus_version() -> int:
+    """
+    Lee la versión del corpus y aplica los cambios hechos por otros procesos.
+    """
+    state = await CorpusState.get_pymongo_collection().find_one({"_id": CORPUS_STATE_ID})
+    return _apply_corpus_state(state)
+
+
+async def run_corpus_version_job() -> None:
+    """
+    Tarea en segundo plano del servidor: sincroniza la versión del corpus cada
+    CORPUS_VERSION_POLL_SECONDS, de modo que una ingesta desde un CLI invalida las caches
+    y los índices del servidor sin reiniciarlo.
+    """
+    while True:
+        await asyncio.sleep(settings.CORPUS_VERSION_POLL_SECONDS)
+        try:
+            await sync_corpus_version()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("No se pudo sincronizar la versión del corpus: %s", e)
@@ -0,0 +1,56 @@
+import hashlib
+from typing import List
+
+from beanie.operators import In
+
+from app.models.paper import Paper
+from app.models.paper_embedding import PaperEmbedding
+from app.search.embeddings import EMBEDDING_BATCH_SIZE, get_embedder, paper_embedding_text
+
+
+async def embed_papers(papers: List[Paper]) -> int:
+    """
+    Calcula y guarda el embedding de los papers cuyo texto (título + abstract + resumen)
+    cambió desde la última vez, en lotes de EMBEDDING_BATCH_SIZE.
+
+    Returns:
+        Número de embeddings recalculados
+    """
+    embedder = get_embedder()
+    texts = {str(paper.id): paper_embedding_text(paper) for paper in papers}
+    hashes = {paper_id: hashlib.sha256(text.encode("utf-8")).hexdigest() for paper_id, text in texts.items()}
+
+    existing = {
+        embedding.paper_id: embedding
+        for embedding in await PaperEmbedding.find(
+            In(PaperEmbedding.paper_id, list(texts)),
+            PaperEmbedding.model == embedder.name,
+        ).to_list()
+    }
+    pending = [
+        paper_id for paper_id, text in texts.items()
+        if text and (paper_id not in existing or existing[paper_id].text_hash != hashes[paper_id])
+    ]
+
+    for start in range(0, len(pending), EMBEDDING_BATCH_SIZE):
+        batch = pending[start:start + EMBEDDING_BATCH_SIZE]
+        vectors = await embedder.embed_documents([texts[paper_id] for paper_id in batch])
+        for paper_id, vector in zip(batch, vectors):
+            embedding = existing.get(paper_id) or PaperEmbedding(
+                paper_id=paper_id,
+                model=embedder.name,
+                dimension=embedder.dimension,
+                vector=b"",
+                text_hash="",
+            )
+            embedding.vector = PaperEmbedding.encode_vector(vector)
+            embedding.text_hash = hashes[paper_id]
+            await embedding.save()
+    return len(pending)
+
+
+async def embed_paper(paper: Paper) -> bool:
+    """
+    Calcula (si hace falta) el embedding de un paper. Devuelve True si se recalculó.
+    """
+    return await embed_papers([paper]) > 0
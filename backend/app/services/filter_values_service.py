@@ -0,0 +1,121 @@
+import asyncio
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from app.config.settings import settings
+from app.dto.filter_value import FilterValue
+from app.models.paper import Paper
+from app.models.enums.study_type import StudyType
+from app.models.enums.experimental_platform import ExperimentalPlatform
+from app.models.enums.stressor import Stressor
+from app.models.enums.organism import Organism
+from app.models.enums.space_agency import SpaceAgency
+
+logger = logging.getLogger(__name__)
+
+# Filtros expuestos al frontend: (nombre visible, campo del modelo, enum de valores)
+FILTER_FIELDS = [
+    ("Study Type", "study_type", StudyType),
+    ("Experimental Platform", "experimental_platform", ExperimentalPlatform),
+    ("Space Environment Stressors", "space_environment_stressors", Stressor),
+    ("Primary Organisms Studied", "primary_organisms_studied", Organism),
+    ("Space Agency Involvement", "space_agency_involvement", SpaceAgency),
+]
+
+
+@dataclass(frozen=True)
+class FiltersPayload:
+    """
+    Respuesta de /paper/search/filters ya serializada, con su ETag fuerte.
+    """
+
+    body: bytes
+    etag: str
+
+
+def obtain_paper_filters_values(counts: Optional[Dict[str, Dict[str, int]]] = None) -> List[FilterValue]:
+    """
+    Construye la lista de filtros a partir de los enums.
+    Si se indican counts (campo -> valor -> nº de papers), se incluyen en cada filtro.
+    """
+    return [
+        FilterValue(
+            name=name,
+            values=[enum_value.value for enum_value in enum_class],
+            counts=counts.get(field_name, {}) if counts is not None else None,
+        )
+        for name, field_name, enum_class in FILTER_FIELDS
+    ]
+
+
+def build_filters_payload(counts: Optional[Dict[str, Dict[str, int]]] = None) -> FiltersPayload:
+    filters = obtain_paper_filters_values(counts)
+    body = json.dumps(
+        [filter_value.model_dump(exclude_none=True) for filter_value in filters],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    return FiltersPayload(body=body, etag=etag)
+
+
+_payload: FiltersPayload = build_filters_payload()
+_counts: Optional[Dict[str, Dict[str, int]]] = None
+
+
+def get_filters_payload() -> FiltersPayload:
+    return _payload
+
+
+def get_filter_counts() -> Optional[Dict[str, Dict[str, int]]]:
+    """
+    Últimos contadores por valor de filtro calculados (None si aún no se calcularon).
+    """
+    return _counts
+
+
+async def compute_filter_counts() -> Dict[str, Dict[str, int]]:
+    """
+    Cuenta cuántos papers tienen cada valor de filtro con una única agregación $facet.
+    """
+    facets = {
+        field_name: [
+            {"$unwind": f"${field_name}"},
+            {"$group": {"_id": f"${field_name}", "count": {"$sum": 1}}},
+        ]
+        for _, field_name, _ in FILTER_FIELDS
+    }
+    results = await Paper.aggregate([{"$facet": facets}]).to_list()
+    if not results:
+        return {}
+    return {
+        field_name: {bucket["_id"]: bucket["count"] for bucket in buckets if bucket["_id"] is not None}
+        for field_name, buckets in results[0].items()
+    }
+
+
+async def refresh_filter_counts() -> None:
+    """
+    Recalcula los contadores y regenera el payload precomputado (y su ETag).
+    """
+    global _payload, _counts
+    counts = await compute_filter_counts()
+    _counts = counts
+    _payload = build_filters_payload(counts)
+
+
+async def run_filter_counts_job() -> None:
+    """
+    Tarea en segundo plano: recalcula los contadores cada FILTER_COUNTS_REFRESH_SECONDS.
+    """
+    while True:
+        try:
+            await refresh_filter_counts()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("No se pudieron calcular los contadores de filtros: %s", e)
+        await asyncio.sleep(settings.FILTER_COUNTS_REFRESH_SECONDS)
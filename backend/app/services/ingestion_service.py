@@ -0,0 +1,69 @@
+import logging
+
+from app.models.paper import Paper
+from app.models.paper_extraction import NON_EXTRACTED_FIELDS
+from app.search.embeddings import EMBEDDING_BATCH_SIZE
+from app.services.corpus_version_service import bump_corpus_version
+from app.services.embedding_service import embed_paper, embed_papers
+from app.services.paper_index_service import index_paper_chunks
+
+logger = logging.getLogger(__name__)
+
+# Campos de un paper ya guardado que una reextracción no debe vaciar
+PRESERVED_FIELDS = sorted(NON_EXTRACTED_FIELDS | {"full_text"})
+
+
+async def ingest_paper(paper: Paper) -> Paper:
+    """
+    Guarda (inserta o actualiza) un paper y regenera sus índices derivados.
+    Es el punto de entrada para cualquier carga o recarga de papers en la base de datos.
+    """
+    await paper.save()
+    await index_paper_chunks(paper)
+    try:
+        await embed_paper(paper)
+    except Exception as e:
+        # Sin embedding el paper sigue siendo buscable por texto; se recalcula en el próximo reindexado
+        logger.warning("No se pudo calcular el embedding del paper %s: %s", paper.id, e)
+    # Con el paper y sus índices ya guardados, se descarta lo cacheado en este proceso
+    # y en el servidor (versión del corpus en MongoDB)
+    await bump_corpus_version([str(paper.id)])
+    return paper
+
+
+async def upsert_paper(paper: Paper) -> Paper:
+    """
+    Ingiere un paper reemplazando al existente con el mismo PMCID (p. ej. al reextraer el corpus),
+    en lugar de insertar un duplicado. Los campos que la extracción no rellena (related_papers,
+    image_url, pubmed_url y el texto completo si no se indica) se conservan del existente.
+    """
+    if paper.pmcid:
+        existing = await Paper.find_one(Paper.pmcid == paper.pmcid)
+        if existing is not None:
+            paper.id = existing.id
+            for field_name in PRESERVED_FIELDS:
+                if not getattr(paper, field_name):
+                    setattr(paper, field_name, getattr(existing, field_name))
+    return await ingest_paper(paper)
+
+
+async def reindex_all_papers() -> int:
+    """
+    Regenera los índices derivados de todos los papers ya guardados.
+
+    Returns:
+        Número de papers procesados
+    """
+    total = 0
+    pending_embeddings = []
+    async for paper in Paper.find_all():
+        await index_paper_chunks(paper)
+        pending_embeddings.append(paper)
+        if len(pending_embeddings) >= EMBEDDING_BATCH_SIZE:
+            await embed_papers(pending_embeddings)
+            pending_embeddings = []
+        total += 1
+    if pending_embeddings:
+        await embed_papers(pending_embeddings)
+    await bump_corpus_version()
+    return total
@@ -0,0 +1,63 @@
+from typing import Optional
+
+from beanie import PydanticObjectId
+
+from app.config.settings import settings
+from app.models.paper import Paper, PaperSummary
+from app.utils.byte_lru_cache import ByteLRUCache
+
+# Coste fijo aproximado de un documento además de sus textos (campos, listas, objeto Python)
+PAPER_OVERHEAD_BYTES = 2048
+
+
+def estimate_paper_size(paper: Paper) -> int:
+    """
+    Estima el tamaño en memoria de un paper a partir de sus campos de texto.
+    """
+    size = PAPER_OVERHEAD_BYTES
+    for value in paper.__dict__.values():
+        if isinstance(value, str):
+            size += len(value)
+        elif isinstance(value, list):
+            size += sum(len(item) for item in value if isinstance(item, str))
+    return size
+
+
+paper_cache: ByteLRUCache[Paper] = ByteLRUCache(
+    max_bytes=settings.PAPER_CACHE_MAX_BYTES,
+    ttl_seconds=settings.PAPER_CACHE_TTL_SECONDS,
+    size_of=estimate_paper_size,
+)
+
+
+async def get_paper(paper_id: str) -> Optional[Paper]:
+    """
+    Obtiene un paper completo (con full_text) pasando por la cache en memoria.
+    Lanza una excepción si paper_id no es un ObjectId válido.
+    """
+    object_id = PydanticObjectId(paper_id)
+    return await paper_cache.get_or_load(str(object_id), lambda: Paper.get(object_id))
+
+
+def get_cached_summary(paper_id: str) -> Optional[PaperSummary]:
+    """
+    Devuelve el resumen de un paper si el documento completo ya está en cache (sin ir a MongoDB).
+    """
+    paper = paper_cache.peek(paper_id)
+    if paper is None:
+        return None
+    return PaperSummary.model_validate(paper.model_dump(exclude={"full_text", "revision_id"}))
+
+
+def invalidate_paper(paper_id: str) -> None:
+    """
+    Elimina un paper de la cache (p. ej. tras reingestarlo).
+    """
+    paper_cache.invalidate(paper_id)
+
+
+def clear_paper_cache() -> None:
+    """
+    Vacía la cache (p. ej. cuando no se sabe qué papers cambiaron).
+    """
+    paper_cache.clear()
@@ -0,0 +1,105 @@
+from collections import Counter
+from typing import Iterable, List, Optional, Set
+
+from beanie.operators import In
+from bson import ObjectId
+
+from app.models.paper import Paper
+from app.models.paper_chunk import PaperChunk
+from app.services.paper_cache import get_paper
+from app.utils.bm25 import bm25_scores
+from app.utils.paper_chunker import chunk_paper_text
+from app.utils.text_tokenizer import tokenize
+
+# Papers ya comprobados en este proceso (con fragmentos o sin texto que indexar):
+# el chat no repite la consulta a MongoDB en cada turno
+_checked_papers: Set[str] = set()
+
+
+async def index_paper_chunks(paper: Paper) -> int:
+    """
+    (Re)genera los fragmentos indexados de un paper a partir de su full_text.
+
+    Returns:
+        Número de fragmentos guardados
+    """
+    paper_id = str(paper.id)
+    await PaperChunk.find(PaperChunk.paper_id == paper_id).delete()
+
+    chunks = []
+    for chunk in chunk_paper_text(paper.full_text or ""):
+        term_frequencies = Counter(tokenize(chunk.text))
+        chunks.append(PaperChunk(
+            paper_id=paper_id,
+            position=chunk.position,
+            section=chunk.section,
+            text=chunk.text,
+            term_frequencies=dict(term_frequencies),
+            length=sum(term_frequencies.values()),
+        ))
+
+    if chunks:
+        await PaperChunk.insert_many(chunks)
+    _checked_papers.add(paper_id)
+    return len(chunks)
+
+
+def forget_checked_papers(paper_ids: Optional[Iterable[str]] = None) -> None:
+    """
+    Vuelve a comprobar en la siguiente consulta si los papers indicados (o todos) tienen
+    fragmentos, p. ej. cuando otro proceso los ha modificado.
+    """
+    if paper_ids is None:
+        _checked_papers.clear()
+    else:
+        _checked_papers.difference_update(paper_ids)
+
+
+async def _ensure_indexed(paper_ids: List[str]) -> None:
+    """
+    Indexa al vuelo los papers que aún no tienen fragmentos (p. ej. cargados antes de existir el índice).
+    Cada paper se comprueba una sola vez por proceso.
+    """
+    pending = [paper_id for paper_id in paper_ids if paper_id not in _checked_papers]
+    if not pending:
+        return
+
+    indexed = set(await PaperChunk.distinct("paper_id", In(PaperChunk.paper_id, pending)))
+    for paper_id in pending:
+        if paper_id not in indexed and ObjectId.is_valid(paper_id):
+            try:
+                paper = await get_paper(paper_id)
+            except Exception:
+                continue
+            if paper and paper.full_text:
+                await index_paper_chunks(paper)
+        # Los IDs que no son ObjectId (p. ej. papers mock del frontend) tampoco se repiten
+        _checked_papers.add(paper_id)
+
+
+async def retrieve_relevant_chunks(paper_ids: List[str], query: str, top_k: int) -> List[PaperChunk]:
+    """
+    Devuelve los top_k fragmentos más relevantes para la consulta entre los papers indicados.
+
+    Las estadísticas de BM25 (IDF, longitud media) se calculan sobre los fragmentos de esos
+    papers. Los fragmentos se devuelven en orden de lectura (paper, posición).
+    """
+    await _ensure_indexed(paper_ids)
+    chunks = await PaperChunk.find(In(PaperChunk.paper_id, paper_ids)).to_list()
+    if not chunks:
+        return []
+
+    query_terms = tokenize(query)
+    if query_terms:
+        scores = bm25_scores(
+            query_terms,
+            [chunk.term_frequencies for chunk in chunks],
+            [chunk.length for chunk in chunks],
+        )
+    else:
+        scores = [0.0] * len(chunks)
+
+    # Sin coincidencias léxicas se usa el principio del paper (abstract, introducción)
+    ranked = sorted(range(len(chunks)), key=lambda i: (-scores[i], chunks[i].position))
+    selected = [chunks[i] for i in ranked[:top_k]]
+    return sorted(selected, key=lambda chunk: (paper_ids.index(chunk.paper_id), chunk.position))
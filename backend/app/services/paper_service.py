@@ -1,119 +1,52 @@
-from typing import List
 from fastapi import HTTPException
 from app.dto.search_papers_request import SearchPapersRequest
-from app.dto.filter_value import FilterValue
-from app.models.paper import Paper
-from app.models.enums.study_type import StudyType
-from app.models.enums.experimental_platform import ExperimentalPlatform
-from app.models.enums.stressor import Stressor
-from app.models.enums.organism import Organism
-from app.models.enums.space_agency import SpaceAgency
+from app.dto.search_papers_response import SearchPapersResponse
+from app.models.paper import Paper, PaperSummary
+from app.services.paper_cache import get_cached_summary
+from app.search.factory import get_search_backend
+from app.search.hybrid import semantic_search
+from app.services.search_cache import search_cache
 from beanie import PydanticObjectId
 
-async def search_papers_similars(search_filters: SearchPapersRequest) -> List[Paper]:
+async def search_papers_similars(search_filters: SearchPapersRequest) -> SearchPapersResponse:
     """
-    Busca papers utilizando MongoDB Atlas Search con compound operator.
-    Combina búsqueda de texto en todos los campos con filtros específicos.
+    Busca una página de papers, sirviendo desde la cache de búsquedas si la misma búsqueda
+    (normalizada, incluido el cursor) ya se resolvió con la versión actual del corpus.
     """
+    cached = search_cache.get(search_filters)
+    if cached is not None:
+        return cached
 
-    # Construir la cláusula 'must' para la búsqueda de texto
-    must_clauses = []
+    corpus_version = search_cache.corpus_version
+    response = await _search_papers(search_filters)
+    search_cache.put(search_filters, response, corpus_version)
+    return response
 
-    # Agregar búsqueda de texto si hay query
-    if search_filters.query and search_filters.query.strip():
-        must_clauses.append({
-            "text": {
-                "query": search_filters.query,
-                "path": {
-                    "wildcard": "*"  # Busca en todos los campos
-                }
-            }
-        })
 
-    # Construir la cláusula 'filter' para los filtros específicos
-    filter_clauses = []
-
-    # Procesar cada filtro
-    for filter_item in search_filters.filters:
-        if filter_item.values and len(filter_item.values) > 0:
-            # El nombre del filtro coincide con el nombre del campo en el modelo
-            field_name = filter_item.name.lower().replace(" ", "_")
-
-            # Usar el operador 'in' para manejar uno o más valores
-            filter_clauses.append({
-                "in": {
-                    "path": field_name,
-                    "value": filter_item.values
-                }
-            })
-
-    # Si no hay ni query ni filtros, usar find() simple
-    if not must_clauses and not filter_clauses:
-        try:
-            return await Paper.find_all().limit(search_filters.limit).to_list()
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Error searching papers: {str(e)}")
-
-    # Construir la pipeline de agregación con $search
-    search_stage = {
-        "$search": {
-            "index": "search_index",
-            "compound": {}
-        }
-    }
-
-    if must_clauses:
-        search_stage["$search"]["compound"]["must"] = must_clauses
-
-    if filter_clauses:
-        search_stage["$search"]["compound"]["filter"] = filter_clauses
-
-    pipeline = [
-        search_stage,
-        {"$limit": search_filters.limit},
-        {
-            "$addFields": {
-                "search_score": {"$meta": "searchScore"}
-            }
-        }
-    ]
+async def _search_papers(search_filters: SearchPapersRequest) -> SearchPapersResponse:
+    """
+    Ejecuta la búsqueda en el backend configurado (Atlas Search o índice local).
+    Los modos "vector" e "hybrid" necesitan una consulta; sin ella se usa la búsqueda de texto.
+    """
+    backend = get_search_backend()
+    if search_filters.mode != "text" and search_filters.query and search_filters.query.strip():
+        return await semantic_search(search_filters, backend)
+    return await backend.search(search_filters)
 
-    # Ejecutar la búsqueda y retornar resultados
-    try:
-        results = await Paper.aggregate(pipeline).to_list()
-        return [Paper.model_validate(doc) for doc in results]
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error searching papers: {str(e)}")
+async def obtain_paper_detail(id: str) -> PaperSummary:
+    # Si el paper completo ya está en cache (p. ej. por el chat), se evita la consulta
+    cached = get_cached_summary(id)
+    if cached is not None:
+        return cached
 
-async def obtain_paper_detail(id: str) -> Paper:
     try:
-        paper = await Paper.get(PydanticObjectId(id))
-        return Paper.model_validate(paper)
+        paper = await Paper.find_one(
+            Paper.id == PydanticObjectId(id),
+            projection_model=PaperSummary
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving paper: {str(e)}")
 
-def obtain_paper_filters_values():
-    filters: list[FilterValue] = [
-        FilterValue(
-            name="Study Type",
-            values=[enum_value.value for enum_value in StudyType]
-        ),
-        FilterValue(
-            name="Experimental Platform",
-            values=[enum_value.value for enum_value in ExperimentalPlatform]
-        ),
-        FilterValue(
-            name="Space Environment Stressors",
-            values=[enum_value.value for enum_value in Stressor]
-        ),
-        FilterValue(
-            name="Primary Organisms Studied",
-            values=[enum_value.value for enum_value in Organism]
-        ),
-        FilterValue(
-            name="Space Agency Involvement",
-            values=[enum_value.value for enum_value in SpaceAgency]
-        ),
-    ]
-
-    return filters
\ No newline at end of file
+    if paper is None:
+        raise HTTPException(status_code=404, detail="Paper not found")
+    return paper
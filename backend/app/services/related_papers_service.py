@@ -0,0 +1,117 @@
+import logging
+from typing import Dict, List
+
+import numpy as np
+from beanie import PydanticObjectId
+from beanie.operators import In
+from fastapi import HTTPException
+from pymongo import UpdateOne
+
+from app.config.settings import settings
+from app.models.paper import Paper, PaperSummary
+from app.models.paper_embedding import PaperEmbedding
+from app.search.embeddings import get_embedder
+from app.services.corpus_version_service import bump_corpus_version
+from app.services.paper_cache import get_cached_summary
+from app.services.paper_service import obtain_paper_detail
+
+logger = logging.getLogger(__name__)
+
+# Filas de la matriz de similitud que se calculan a la vez (memoria: block_size x n floats)
+RELATED_PAPERS_BLOCK_SIZE = 512
+# Escrituras por llamada a bulk_write
+BULK_WRITE_BATCH_SIZE = 1000
+
+
+def nearest_neighbours(matrix: np.ndarray, top_k: int, block_size: int = RELATED_PAPERS_BLOCK_SIZE) -> np.ndarray:
+    """
+    Para cada fila de una matriz de vectores normalizados, las posiciones de las top_k filas
+    más similares (coseno), excluida ella misma, ordenadas de mayor a menor similitud.
+
+    La matriz de similitud se calcula por bloques de filas (una multiplicación por bloque).
+    """
+    total = len(matrix)
+    top_k = min(top_k, total - 1)
+    if top_k <= 0:
+        return np.zeros((total, 0), dtype=np.int64)
+
+    neighbours = np.empty((total, top_k), dtype=np.int64)
+    for start in range(0, total, block_size):
+        end = min(start + block_size, total)
+        similarities = matrix[start:end] @ matrix.T
+        # Excluir el propio paper
+        similarities[np.arange(end - start), np.arange(start, end)] = -np.inf
+
+        top = np.argpartition(-similarities, top_k - 1, axis=1)[:, :top_k]
+        top_scores = np.take_along_axis(similarities, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        neighbours[start:end] = np.take_along_axis(top, order, axis=1)
+    return neighbours
+
+
+async def build_related_papers(top_k: int = settings.RELATED_PAPERS_TOP_K) -> int:
+    """
+    Recalcula related_papers de todos los papers con embedding, en una sola pasada
+    vectorizada, y lo guarda con escrituras en bloque.
+
+    Returns:
+        Número de papers actualizados
+    """
+    embedder = get_embedder()
+    embeddings = await PaperEmbedding.find(PaperEmbedding.model == embedder.name).to_list()
+    if not embeddings:
+        return 0
+
+    paper_ids = [embedding.paper_id for embedding in embeddings]
+    matrix = np.stack([embedding.decode_vector() for embedding in embeddings])
+    # Los vectores se guardan en float16: se renormalizan para que el producto sea el coseno
+    matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+    neighbours = nearest_neighbours(matrix, top_k)
+
+    collection = Paper.get_pymongo_collection()
+    operations = [
+        UpdateOne(
+            {"_id": PydanticObjectId(paper_id)},
+            {"$set": {"related_papers": [paper_ids[i] for i in row]}},
+        )
+        for paper_id, row in zip(paper_ids, neighbours)
+    ]
+    for start in range(0, len(operations), BULK_WRITE_BATCH_SIZE):
+        await collection.bulk_write(operations[start:start + BULK_WRITE_BATCH_SIZE], ordered=False)
+
+    # Los resúmenes cacheados e indexados en memoria (de todos los procesos) incluyen related_papers
+    await bump_corpus_version(paper_ids)
+
+    logger.info("related_papers recalculado para %d papers", len(paper_ids))
+    return len(paper_ids)
+
+
+async def obtain_related_papers(id: str) -> List[PaperSummary]:
+    """
+    Devuelve los papers relacionados precomputados de un paper, en su orden de similitud.
+    """
+    paper = await obtain_paper_detail(id)
+    related_ids = paper.related_papers
+    if not related_ids:
+        return []
+
+    summaries: Dict[str, PaperSummary] = {}
+    missing = []
+    for related_id in related_ids:
+        cached = get_cached_summary(related_id)
+        if cached is not None:
+            summaries[related_id] = cached
+        else:
+            missing.append(related_id)
+
+    if missing:
+        try:
+            found = await Paper.find(
+                In(Paper.id, [PydanticObjectId(related_id) for related_id in missing]),
+                projection_model=PaperSummary,
+            ).to_list()
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error retrieving related papers: {str(e)}")
+        summaries.update((str(summary.id), summary) for summary in found)
+
+    return [summaries[related_id] for related_id in related_ids if related_id in summaries]
@@ -0,0 +1,124 @@
+import json
+from typing import Optional
+
+from app.config.settings import settings
+from app.dto.search_papers_request import SearchPapersRequest
+from app.dto.search_papers_response import SearchPapersResponse
+from app.models.paper import PaperSummary
+from app.search.base import normalize_filter_name
+from app.services.paper_cache import estimate_paper_size
+from app.utils.byte_lru_cache import ByteLRUCache
+
+# Tamaño aproximado de un ObjectId en una lista de resultados
+RESULT_ID_BYTES = 32
+
+
+def canonical_search_key(search_filters: SearchPapersRequest) -> str:
+    """
+    Clave canónica de una búsqueda: la misma consulta con los filtros en otro orden,
+    valores repetidos o espacios/mayúsculas distintos produce la misma clave.
+    """
+    query = " ".join((search_filters.query or "").lower().split())
+
+    filters = {}
+    for filter_item in search_filters.filters or []:
+        values = sorted(set(filter_item.values or []))
+        if values:
+            name = normalize_filter_name(filter_item.name)
+            filters[name] = sorted(set(filters.get(name, [])) | set(values))
+
+    return json.dumps(
+        {
+            "query": query,
+            "filters": sorted(filters.items()),
+            "limit": search_filters.limit,
+            "profile": search_filters.profile,
+            "mode": search_filters.mode,
+            "cursor": search_filters.cursor,
+            "facets": search_filters.facets,
+        },
+        separators=(",", ":"),
+    )
+
+
+def _result_entry_size(entry: tuple) -> int:
+    _, ids, next_cursor, facets = entry
+    size = RESULT_ID_BYTES * (len(ids) + 1) + len(next_cursor or "")
+    for counts in (facets or {}).values():
+        size += sum(len(value) + 8 for value in counts)
+    return size
+
+
+class SearchResultCache:
+    """
+    Cache de resultados de /paper/search.
+
+    - Guarda la lista de IDs resultante para cada búsqueda canónica, con TTL.
+    - Los resúmenes de los papers se guardan aparte (una vez por paper), de modo que un
+      acierto se sirve sin consultar MongoDB.
+    - Cada entrada lleva la versión del corpus (compartida en MongoDB, ver
+      corpus_version_service); cualquier ingesta la incrementa y deja obsoletas todas
+      las búsquedas cacheadas.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: float) -> None:
+        self.corpus_version = 0
+        self._results: ByteLRUCache[tuple] = ByteLRUCache(
+            max_bytes=max_bytes // 4,
+            ttl_seconds=ttl_seconds,
+            size_of=_result_entry_size,
+        )
+        self._summaries: ByteLRUCache[PaperSummary] = ByteLRUCache(
+            max_bytes=max_bytes - max_bytes // 4,
+            ttl_seconds=ttl_seconds,
+            size_of=estimate_paper_size,
+        )
+
+    def get(self, search_filters: SearchPapersRequest) -> Optional[SearchPapersResponse]:
+        entry = self._results.get(canonical_search_key(search_filters))
+        if entry is None:
+            return None
+
+        version, ids, next_cursor, facets = entry
+        if version != self.corpus_version:
+            return None
+
+        summaries = [self._summaries.get(paper_id) for paper_id in ids]
+        if any(summary is None for summary in summaries):
+            # Algún resumen fue expulsado: se repite la búsqueda
+            return None
+        return SearchPapersResponse(results=summaries, next_cursor=next_cursor, facets=facets)
+
+    def put(self, search_filters: SearchPapersRequest, response: SearchPapersResponse, corpus_version: int) -> None:
+        """
+        Guarda la página de resultados si el corpus no cambió mientras se ejecutaba la búsqueda.
+        """
+        if corpus_version != self.corpus_version:
+            return
+        ids = tuple(str(summary.id) for summary in response.results)
+        for paper_id, summary in zip(ids, response.results):
+            self._summaries.put(paper_id, summary)
+        self._results.put(canonical_search_key(search_filters), (corpus_version, ids, response.next_cursor, response.facets))
+
+    def set_corpus_version(self, corpus_version: int) -> None:
+        """
+        Adopta la versión actual del corpus: si cambió, invalida todas las búsquedas cacheadas.
+        """
+        if corpus_version == self.corpus_version:
+            return
+        self.corpus_version = corpus_version
+        self._results.clear()
+        self._summaries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "corpus_version": self.corpus_version,
+            "results": self._results.stats(),
+            "summaries": self._summaries.stats(),
+        }
+
+
+search_cache = SearchResultCache(
+    max_bytes=settings.SEARCH_CACHE_MAX_BYTES,
+    ttl_seconds=settings.SEARCH_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,29 @@
+"""
+Escritura atómica de archivos: o se escribe el archivo completo o no se toca.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+# mkstemp crea el temporal con permisos 0600; al renombrarlo se le dan los de un open() normal
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """
+    Escribe en un temporal del mismo directorio y lo renombra sobre el destino (os.replace),
+    de modo que una interrupción nunca deja archivos a medio escribir.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporal = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(descriptor, "wb") as f:
+            f.write(data)
+        os.chmod(temporal, 0o666 & ~_UMASK)
+        os.replace(temporal, path)
+    except BaseException:
+        os.unlink(temporal)
+        raise
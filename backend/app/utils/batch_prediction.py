@@ -0,0 +1,313 @@
+"""
+Predicción por lotes (batch prediction) para la extracción estructurada de todo el corpus.
+
+En lugar de una petición online por paper, se empaquetan todas las peticiones en un JSONL
+(una línea por paper, con su clave) y se envían como un único trabajo:
+
+- VertexBatchBackend: sube el JSONL a GCS y crea un trabajo de batch prediction de Vertex AI
+  (client.aio.batches); la salida (predictions.jsonl) se lee de GCS al terminar.
+- LocalBatchBackend: sustituto basado en archivos con el mismo ciclo de vida
+  (submit / state / output) que procesa el JSONL con un cliente online (o FakeLLMClient).
+
+Ambos leen y escriben el formato de Vertex: {"key", "request"} en la entrada y
+{"key", "request", "response", "status"} en la salida.
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from json import loads
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Iterable, List, Optional, Tuple
+
+from google import genai
+from google.genai import types
+
+from app.config.settings import settings
+from app.utils.atomic_file import write_atomic
+from app.utils.json_repair import repair_json
+
+logger = logging.getLogger(__name__)
+
+SUCCEEDED = "JOB_STATE_SUCCEEDED"
+TERMINAL_STATES = {
+    SUCCEEDED,
+    "JOB_STATE_PARTIALLY_SUCCEEDED",
+    "JOB_STATE_FAILED",
+    "JOB_STATE_CANCELLED",
+    "JOB_STATE_EXPIRED",
+}
+
+
+@dataclass
+class BatchResult:
+    key: str
+    # Respuesta ya interpretada por el parser de stream_results (por defecto, el JSON como dict)
+    data: Any
+    error: Optional[str] = None
+    tokens: int = 0
+
+
+def parse_json_response(text: str) -> dict:
+    """
+    JSON de una respuesta, reparándolo si está malformado o truncado (JsonRepairError si no se puede).
+    """
+    try:
+        return loads(text.strip())
+    except ValueError:
+        return repair_json(text)
+
+
+def build_batch_line(
+    key: str, text: str, system_instruction: str, temperature: float = 0, response_schema: Optional[dict] = None
+) -> dict:
+    """
+    Línea del JSONL de entrada (formato GenerateContentRequest de Vertex, con la clave del paper).
+    """
+    generation_config = {"temperature": temperature, "responseMimeType": "application/json"}
+    if response_schema:
+        generation_config["responseSchema"] = response_schema
+    return {
+        "key": key,
+        "request": {
+            "contents": [{"role": "user", "parts": [{"text": text}]}],
+            "systemInstruction": {"parts": [{"text": system_instruction}]},
+            "generationConfig": generation_config,
+        },
+    }
+
+
+def parse_prediction_line(line: str, parse: Callable[[str], Any] = parse_json_response) -> BatchResult:
+    """
+    Interpreta una línea de predictions.jsonl: respuesta procesada con parse (una sola vez),
+    o el error del trabajo o del parseo (parse señala las respuestas inválidas con ValueError).
+    """
+    record = loads(line)
+    key = record.get("key", "")
+    if record.get("status") or "response" not in record:
+        return BatchResult(key, None, record.get("status") or "Respuesta vacía")
+
+    response = types.GenerateContentResponse.model_validate(record["response"])
+    usage = response.usage_metadata
+    tokens = (usage.total_token_count or 0) if usage else 0
+    if not response.text:
+        return BatchResult(key, None, "Vertex AI Error: No response text received", tokens)
+    try:
+        return BatchResult(key, parse(response.text), tokens=tokens)
+    except ValueError as e:
+        return BatchResult(key, None, str(e), tokens)
+
+
+class BatchPredictionBackend(ABC):
+    @abstractmethod
+    async def submit(self, input_path: Path, display_name: str) -> str:
+        """
+        Envía el JSONL de entrada y devuelve el identificador del trabajo.
+        """
+
+    @abstractmethod
+    async def state(self, job_name: str) -> str:
+        """
+        Estado del trabajo (nombres de google.genai.types.JobState).
+        """
+
+    @abstractmethod
+    def output_lines(self, job_name: str) -> AsyncIterator[str]:
+        """
+        Líneas de predictions.jsonl de un trabajo terminado.
+        """
+
+
+class LocalBatchBackend(BatchPredictionBackend):
+    """
+    Trabajos en <directory>/<job>/: input.jsonl, status.json y predictions.jsonl.
+    El trabajo se ejecuta en segundo plano con llamadas online acotadas por `concurrency`;
+    si el proceso se reinicia, el siguiente sondeo lo relanza desde el principio.
+    """
+
+    def __init__(self, directory, llm_client=None, concurrency: int = 16) -> None:
+        self.directory = Path(directory)
+        self.llm_client = llm_client
+        self.concurrency = concurrency
+        self._tasks: dict = {}
+
+    def _job_dir(self, job_name: str) -> Path:
+        return self.directory / job_name
+
+    def _write_status(self, job_name: str, state: str) -> None:
+        write_atomic(self._job_dir(job_name) / "status.json", json.dumps({"state": state}).encode("utf-8"))
+
+    async def submit(self, input_path: Path, display_name: str) -> str:
+        job_name = f"{display_name}-{uuid.uuid4().hex[:8]}"
+        write_atomic(self._job_dir(job_name) / "input.jsonl", Path(input_path).read_bytes())
+        self._write_status(job_name, "JOB_STATE_QUEUED")
+        return job_name
+
+    async def _predict(self, client, line: dict) -> dict:
+        request = line["request"]
+        try:
+            response = await client.generate_content(
+                model=settings.VERTEXAI_MODEL_NAME,
+                contents=[types.Content.model_validate(content) for content in request["contents"]],
+                config=types.GenerateContentConfig.model_validate(
+                    {**request["generationConfig"], "systemInstruction": request["systemInstruction"]}
+                ),
+            )
+        except Exception as e:
+            return {**line, "status": f"{type(e).__name__}: {e}"}
+        return {**line, "response": response.model_dump(mode="json", by_alias=True, exclude_none=True), "status": ""}
+
+    async def _run(self, job_name: str) -> None:
+        if self.llm_client is None:
+            from app.config.vertexai_client import VertexAIClient
+            self.llm_client = VertexAIClient()
+
+        job_dir = self._job_dir(job_name)
+        self._write_status(job_name, "JOB_STATE_RUNNING")
+        with open(job_dir / "input.jsonl", "r", encoding="utf-8") as f:
+            lines = [loads(line) for line in f if line.strip()]
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def predict(line: dict) -> dict:
+            async with semaphore:
+                return await self._predict(self.llm_client, line)
+
+        predictions = await asyncio.gather(*(predict(line) for line in lines))
+        body = "".join(json.dumps(prediction, ensure_ascii=False) + "\n" for prediction in predictions)
+        write_atomic(job_dir / "predictions.jsonl", body.encode("utf-8"))
+        failed = sum(1 for prediction in predictions if prediction["status"])
+        if failed == len(predictions) and predictions:
+            self._write_status(job_name, "JOB_STATE_FAILED")
+        else:
+            self._write_status(job_name, "JOB_STATE_PARTIALLY_SUCCEEDED" if failed else SUCCEEDED)
+
+    async def state(self, job_name: str) -> str:
+        with open(self._job_dir(job_name) / "status.json", "r", encoding="utf-8") as f:
+            state = json.load(f)["state"]
+        if state not in TERMINAL_STATES and job_name not in self._tasks:
+            self._tasks[job_name] = asyncio.create_task(self._run(job_name))
+            return "JOB_STATE_RUNNING"
+        task = self._tasks.get(job_name)
+        if task is not None and task.done() and task.exception() is not None:
+            logger.warning("Trabajo local %s fallido: %s", job_name, task.exception())
+            self._write_status(job_name, "JOB_STATE_FAILED")
+            return "JOB_STATE_FAILED"
+        return state
+
+    async def output_lines(self, job_name: str) -> AsyncIterator[str]:
+        with open(self._job_dir(job_name) / "predictions.jsonl", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield line
+
+
+class VertexBatchBackend(BatchPredictionBackend):
+    """
+    Batch prediction de Vertex AI. Necesita proyecto y región (no funciona con API key)
+    y google-cloud-storage para subir la entrada y leer la salida de VERTEXAI_BATCH_GCS_PREFIX.
+    """
+
+    def __init__(self, gcs_prefix: str, project: str, location: str) -> None:
+        if not gcs_prefix.startswith("gs://"):
+            raise ValueError("VERTEXAI_BATCH_GCS_PREFIX debe ser una ruta gs://bucket/prefijo")
+        try:
+            from google.cloud import storage
+        except ImportError as e:
+            raise ImportError("google-cloud-storage es necesario para el batch de Vertex AI") from e
+        self.gcs_prefix = gcs_prefix.rstrip("/")
+        self.storage = storage.Client(project=project)
+        self.client = genai.Client(vertexai=True, project=project, location=location)
+
+    @staticmethod
+    def _split_uri(uri: str) -> Tuple[str, str]:
+        bucket, _, path = uri[len("gs://"):].partition("/")
+        return bucket, path
+
+    async def submit(self, input_path: Path, display_name: str) -> str:
+        folder = f"{self.gcs_prefix}/{display_name}-{uuid.uuid4().hex[:8]}"
+        bucket, path = self._split_uri(f"{folder}/input.jsonl")
+        blob = self.storage.bucket(bucket).blob(path)
+        await asyncio.to_thread(blob.upload_from_filename, str(input_path), content_type="application/jsonl")
+
+        job = await self.client.aio.batches.create(
+            model=settings.VERTEXAI_MODEL_NAME,
+            src=f"{folder}/input.jsonl",
+            config=types.CreateBatchJobConfig(dest=f"{folder}/output", display_name=display_name),
+        )
+        return job.name
+
+    async def state(self, job_name: str) -> str:
+        job = await self.client.aio.batches.get(name=job_name)
+        return job.state.name if job.state else "JOB_STATE_UNSPECIFIED"
+
+    async def output_lines(self, job_name: str) -> AsyncIterator[str]:
+        job = await self.client.aio.batches.get(name=job_name)
+        bucket, prefix = self._split_uri(job.dest.gcs_uri)
+        blobs = await asyncio.to_thread(lambda: list(self.storage.list_blobs(bucket, prefix=prefix)))
+        for blob in blobs:
+            if not blob.name.endswith("predictions.jsonl"):
+                continue
+            content = await asyncio.to_thread(blob.download_as_text, encoding="utf-8")
+            for line in content.splitlines():
+                if line.strip():
+                    yield line
+
+
+def get_batch_backend(llm_client=None) -> BatchPredictionBackend:
+    """
+    Backend configurado en settings.BATCH_PREDICTION_BACKEND.
+    """
+    if settings.BATCH_PREDICTION_BACKEND == "local":
+        return LocalBatchBackend(settings.BATCH_PREDICTION_LOCAL_DIR, llm_client)
+    return VertexBatchBackend(
+        settings.VERTEXAI_BATCH_GCS_PREFIX, settings.VERTEXAI_PROJECT, settings.VERTEXAI_LOCATION
+    )
+
+
+def write_batch_input(
+    path: Path, articles: Iterable[Tuple[str, str]], system_instruction: str, response_schema: Optional[dict] = None
+) -> int:
+    """
+    Escribe el JSONL de entrada a partir de pares (clave, texto). Devuelve el nº de líneas.
+    """
+    lines: List[str] = [
+        json.dumps(
+            build_batch_line(key, text, system_instruction, response_schema=response_schema), ensure_ascii=False
+        ) + "\n"
+        for key, text in articles
+    ]
+    write_atomic(path, "".join(lines).encode("utf-8"))
+    return len(lines)
+
+
+async def wait_for_job(
+    backend: BatchPredictionBackend, job_name: str, poll_seconds: float, max_poll_seconds: float = 600
+) -> str:
+    """
+    Sondea el trabajo hasta un estado terminal, con intervalos crecientes (x1.5) hasta max_poll_seconds.
+    """
+    interval = poll_seconds
+    while True:
+        state = await backend.state(job_name)
+        if state in TERMINAL_STATES:
+            return state
+        logger.info("Trabajo %s: %s (siguiente sondeo en %.0fs)", job_name, state, interval)
+        await asyncio.sleep(interval)
+        interval = min(interval * 1.5, max_poll_seconds)
+
+
+async def stream_results(
+    backend: BatchPredictionBackend, job_name: str, parse: Callable[[str], Any] = parse_json_response
+) -> AsyncIterator[BatchResult]:
+    """
+    Resultados del trabajo terminado, uno por paper, según se leen de la salida.
+    """
+    async for line in backend.output_lines(job_name):
+        try:
+            yield parse_prediction_line(line, parse)
+        except ValueError as e:
+            yield BatchResult("", None, f"Línea de salida inválida: {e}")
@@ -0,0 +1,56 @@
+"""
+Puntuación BM25 (Okapi) sobre colecciones pequeñas de documentos ya tokenizados.
+"""
+
+import math
+from typing import Dict, Iterable, List, Sequence
+
+# Parámetros estándar de BM25
+K1 = 1.5
+B = 0.75
+
+
+def idf(document_frequency: int, total_documents: int) -> float:
+    """
+    IDF de BM25 con suavizado (siempre positivo).
+    """
+    return math.log(1 + (total_documents - document_frequency + 0.5) / (document_frequency + 0.5))
+
+
+def bm25_scores(
+    query_terms: Iterable[str],
+    documents: Sequence[Dict[str, int]],
+    lengths: Sequence[int],
+    k1: float = K1,
+    b: float = B,
+) -> List[float]:
+    """
+    Calcula la puntuación BM25 de cada documento para una consulta.
+
+    Args:
+        query_terms: Términos de la consulta (ya tokenizados)
+        documents: Frecuencia de cada término por documento
+        lengths: Longitud (número de términos) de cada documento
+
+    Returns:
+        Lista de puntuaciones en el mismo orden que documents
+    """
+    total_documents = len(documents)
+    if total_documents == 0:
+        return []
+
+    terms = set(query_terms)
+    average_length = (sum(lengths) / total_documents) or 1.0
+
+    scores = [0.0] * total_documents
+    for term in terms:
+        document_frequency = sum(1 for tf in documents if term in tf)
+        if document_frequency == 0:
+            continue
+        term_idf = idf(document_frequency, total_documents)
+        for i, tf in enumerate(documents):
+            frequency = tf.get(term, 0)
+            if frequency:
+                norm = k1 * (1 - b + b * lengths[i] / average_length)
+                scores[i] += term_idf * frequency * (k1 + 1) / (frequency + norm)
+    return scores
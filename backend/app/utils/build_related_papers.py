@@ -0,0 +1,33 @@
+"""
+BUILD RELATED PAPERS - Precalcula los papers relacionados
+=========================================================
+
+Calcula para todos los papers sus vecinos más cercanos por similitud de embeddings
+(multiplicación de matrices por bloques) y los guarda en Paper.related_papers.
+Requiere que los embeddings existan (ver reindex_papers.py).
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Agregar el directorio backend al path para poder importar el paquete 'app'
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.config.mongodb_client import MongoDbClient
+from app.services.related_papers_service import build_related_papers
+
+
+async def main():
+    database = MongoDbClient()
+    await database.init()
+    try:
+        total = await build_related_papers()
+        print(f"Papers con related_papers actualizado: {total}")
+    finally:
+        await database.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,127 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+@dataclass
+class _Entry(Generic[V]):
+    value: V
+    size: int
+    expires_at: float
+
+
+class ByteLRUCache(Generic[V]):
+    """
+    Cache LRU en memoria limitada por tamaño en bytes (no por número de entradas) y con TTL.
+
+    - size_of estima el tamaño de cada valor; al superar max_bytes se expulsan los menos usados.
+    - get_or_load agrupa las cargas concurrentes de una misma clave (una sola consulta a la BD).
+    - Lleva métricas de aciertos, fallos y expulsiones (stats()).
+
+    Pensada para el event loop de asyncio: las operaciones síncronas no ceden el control,
+    por lo que no necesitan lock; solo las cargas se coordinan con tareas.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: float, size_of: Callable[[V], int]) -> None:
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.size_of = size_of
+
+        self._entries: "OrderedDict[Hashable, _Entry[V]]" = OrderedDict()
+        self._loading: Dict[Hashable, asyncio.Task] = {}
+        self._current_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """
+        Devuelve el valor cacheado (o None) y actualiza las métricas.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def peek(self, key: Hashable) -> Optional[V]:
+        """
+        Devuelve el valor cacheado sin contar métricas ni cargarlo si falta.
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= time.monotonic():
+            return None
+        return entry.value
+
+    def put(self, key: Hashable, value: V) -> None:
+        size = self.size_of(value)
+        self._remove(key)
+        if size > self.max_bytes:
+            # Un valor mayor que toda la cache no se guarda
+            return
+        self._entries[key] = _Entry(value=value, size=size, expires_at=time.monotonic() + self.ttl_seconds)
+        self._current_bytes += size
+        while self._current_bytes > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Optional[V]]]) -> Optional[V]:
+        """
+        Devuelve el valor cacheado o lo carga con loader. Los valores None no se cachean.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        # La carga corre en una tarea propia y todos (también quien la inició) la esperan con
+        # shield: si se cancela una petición, la carga sigue para el resto de quienes esperan
+        task = self._loading.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, loader))
+            self._loading[key] = task
+        return await asyncio.shield(task)
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Optional[V]]]) -> Optional[V]:
+        try:
+            value = await loader()
+            if value is not None:
+                self.put(key, value)
+            return value
+        finally:
+            self._loading.pop(key, None)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._remove(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._current_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._current_bytes -= entry.size
@@ -0,0 +1,127 @@
+"""
+COMPARE EXTRACTION INPUTS - Texto completo vs entrada preprocesada
+==================================================================
+
+Extrae una muestra de artículos dos veces (con el texto completo y con la entrada
+preparada por extraction_input) y compara tokens, latencia y concordancia de los campos
+extraídos, para elegir el presupuesto EXTRACTION_INPUT_MAX_TOKENS.
+
+La concordancia por campo es el índice de Jaccard entre ambas extracciones
+(sobre elementos en las listas, sobre términos en los textos; igualdad en el resto).
+
+    python app/utils/compare_extraction_inputs.py --limit 20 --max-tokens 8000
+    python app/utils/compare_extraction_inputs.py --fake-llm --limit 50
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio backend al path para poder importar el paquete 'app'
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.config.settings import settings
+from app.utils.extraction_input import count_tokens, prepare_extraction_input
+from app.utils.fake_llm_client import FakeLLMClient
+from app.utils.insight_extraction import extract_structured_data_with_usage
+from app.utils.llm_extraction import vertex_ai_client
+from app.utils.text_tokenizer import tokenize
+
+
+def _jaccard(a: set, b: set) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def field_agreement(a, b) -> float:
+    if isinstance(a, list) or isinstance(b, list):
+        return _jaccard({str(v).strip().lower() for v in a or []}, {str(v).strip().lower() for v in b or []})
+    if isinstance(a, str) and isinstance(b, str):
+        return _jaccard(set(tokenize(a)), set(tokenize(b)))
+    return 1.0 if a == b else 0.0
+
+
+async def extract_timed(text: str, llm_client):
+    start = time.perf_counter()
+    data, tokens = await extract_structured_data_with_usage(text, llm_client, cache=None, preprocess=False)
+    return data, tokens, time.perf_counter() - start
+
+
+async def compare_article(path: Path, args, llm_client, genai_client) -> dict:
+    text = path.read_text(encoding="utf-8")
+    prepared = prepare_extraction_input(text, args.max_tokens)
+    (full, full_tokens, full_seconds), (budget, budget_tokens, budget_seconds) = await asyncio.gather(
+        extract_timed(text, llm_client), extract_timed(prepared.text, llm_client)
+    )
+    fields = {key: field_agreement(full.get(key), budget.get(key)) for key in set(full) | set(budget)}
+    return {
+        "article": path.stem,
+        "input_tokens_full": await count_tokens(text, genai_client),
+        "input_tokens_budget": await count_tokens(prepared.text, genai_client),
+        "total_tokens_full": full_tokens,
+        "total_tokens_budget": budget_tokens,
+        "seconds_full": full_seconds,
+        "seconds_budget": budget_seconds,
+        "dropped_sections": prepared.dropped_sections,
+        "truncated_sections": prepared.truncated_sections,
+        "omitted_sections": prepared.omitted_sections,
+        "agreement": statistics.mean(fields.values()) if fields else 1.0,
+        "fields": fields,
+    }
+
+
+async def main(args):
+    files = sorted(Path(args.articles).glob("*.txt"))[:args.limit]
+    llm_client = FakeLLMClient() if args.fake_llm else None
+    genai_client = vertex_ai_client.client if args.count_tokens else None
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def run(path):
+        async with semaphore:
+            try:
+                return await compare_article(path, args, llm_client, genai_client)
+            except Exception as e:
+                print(f"ERROR {path.name}: {e}")
+                return None
+
+    results = [r for r in await asyncio.gather(*(run(path) for path in files)) if r]
+    if not results:
+        return
+
+    def mean(key):
+        return statistics.mean(r[key] for r in results)
+
+    print(f"Artículos comparados: {len(results)} (presupuesto {args.max_tokens} tokens)")
+    print(f"Tokens de entrada: {mean('input_tokens_full'):.0f} -> {mean('input_tokens_budget'):.0f} "
+          f"({1 - mean('input_tokens_budget') / mean('input_tokens_full'):.0%} menos)")
+    print(f"Tokens facturados: {mean('total_tokens_full'):.0f} -> {mean('total_tokens_budget'):.0f}")
+    print(f"Latencia: {mean('seconds_full'):.2f}s -> {mean('seconds_budget'):.2f}s")
+    print(f"Concordancia media de campos: {mean('agreement'):.2f}")
+    fields = sorted({field for r in results for field in r["fields"]})
+    for field in fields:
+        values = [r["fields"][field] for r in results if field in r["fields"]]
+        print(f"   {field}: {statistics.mean(values):.2f}")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"Informe: {args.report}")
+
+
+if __name__ == "__main__":
+    project_root = backend_dir.parent
+    parser = argparse.ArgumentParser(description="Compara la extracción con texto completo y con entrada preprocesada")
+    parser.add_argument("--articles", default=str(project_root / "docs" / "extracted_articles"))
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--max-tokens", type=int, default=settings.EXTRACTION_INPUT_MAX_TOKENS)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--count-tokens", action="store_true", help="Contar tokens con models.count_tokens")
+    parser.add_argument("--fake-llm", action="store_true", help="Usar FakeLLMClient (sin red)")
+    parser.add_argument("--report", default=None, help="Guardar el detalle por artículo en JSON")
+    asyncio.run(main(parser.parse_args()))
@@ -29,8 +29,8 @@ async def main():
     if current_dir.name == "backend":
         project_root = current_dir.parent
     
-    articles_dir = Path("C:/Users/David/buscar_curro/hackathon/hackatonNasa2025/docs/extracted_articles")
-    output_dir = Path("C:/Users/David/buscar_curro/hackathon/hackatonNasa2025/docs/insight_json_results")
+    articles_dir = project_root / "docs" / "extracted_articles"
+    output_dir = project_root / "docs" / "insight_json_results"
 
     print(f"Buscando archivos en: {articles_dir}")
     
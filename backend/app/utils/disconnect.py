@@ -0,0 +1,30 @@
+import asyncio
+from typing import Awaitable, TypeVar
+
+from fastapi import HTTPException, Request
+
+T = TypeVar("T")
+
+# Código no estándar (nginx) para peticiones que el cliente abandonó
+CLIENT_CLOSED_REQUEST = 499
+
+
+async def cancel_on_disconnect(request: Request, awaitable: Awaitable[T], poll_interval: float = 0.5) -> T:
+    """
+    Ejecuta una corrutina y la cancela si el cliente HTTP se desconecta antes de que termine.
+
+    Evita seguir consumiendo cupo de concurrencia (y tokens) del LLM para respuestas
+    que nadie va a leer.
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                task.cancel()
+                raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="El cliente cerró la conexión")
+    finally:
+        if not task.done():
+            task.cancel()
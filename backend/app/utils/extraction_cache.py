@@ -0,0 +1,72 @@
+"""
+Cache persistente de resultados de extracción con LLM, direccionada por contenido.
+
+La clave es el SHA-256 de (texto normalizado, versión del prompt, modelo, temperatura):
+- un mismo artículo guardado con otro nombre (PMCID duplicado) o en otra ejecución
+  reutiliza el resultado sin llamar al modelo
+- al editar el prompt cambia la clave; al volver a la versión anterior (rollback)
+  vuelven a servirse los resultados que ya se tenían
+
+Cada entrada es un JSON en <directorio>/<clave[:2]>/<clave>.json con el resultado
+y los tokens que costó obtenerlo (para contabilizar los tokens ahorrados).
+"""
+
+import hashlib
+import json
+import re
+import unicodedata
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from app.utils.atomic_file import write_atomic
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalización previa al hash: Unicode NFC y espacios en blanco colapsados.
+    """
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+
+class ExtractionCache:
+    def __init__(self, directory) -> None:
+        self.directory = Path(directory)
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "tokens_saved": 0}
+
+    @staticmethod
+    def key_for(text: str, prompt_version: str, model: str, temperature: float) -> str:
+        digest = hashlib.sha256()
+        for part in (normalize_text(text), prompt_version, model, repr(float(temperature))):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def contains(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Resultado cacheado o None. Actualiza las estadísticas de aciertos y tokens ahorrados.
+        """
+        path = self._path(key)
+        if not path.exists():
+            self.stats["misses"] += 1
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+        self.stats["hits"] += 1
+        self.stats["tokens_saved"] += entry.get("tokens", 0)
+        return entry["data"]
+
+    def put(self, key: str, data: dict, tokens: int = 0, **metadata) -> None:
+        entry = {"data": data, "tokens": tokens, "created_at": datetime.now().isoformat(), **metadata}
+        write_atomic(self._path(key), json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
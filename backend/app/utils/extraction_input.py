@@ -0,0 +1,162 @@
+"""
+Preparación del texto de un artículo antes de enviarlo al extractor LLM.
+
+Los textos de PMC incluyen bibliografía, agradecimientos, material suplementario, etc.,
+que encarecen y ralentizan la extracción sin aportar datos. Aquí:
+- se separa el texto en secciones (split_sections) y se descartan las secciones de cierre
+- se eliminan secciones duplicadas (el abstract aparece como encabezado y en el contenido)
+- se construye una entrada con un presupuesto de tokens, rellenando por prioridad
+  (título, metadatos y abstract; conclusiones; resultados; métodos; discusión; introducción)
+  y recortando por frases la última sección que no cabe entera
+- la entrada conserva el orden original de las secciones
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+from app.config.settings import settings
+from app.utils.paper_chunker import DEFAULT_SECTION, split_sections
+
+# Secciones que no se envían nunca al extractor
+DROPPED_SECTIONS = frozenset({
+    "References", "Footnotes", "Funding", "Author Contributions",
+    "Acknowledgments", "Acknowledgements", "Acknowledgment", "Acknowledgement",
+    "Data Availability", "Data Availability Statement",
+    "Competing Interests", "Conflicts Of Interest", "Conflict Of Interest",
+    "Supplementary Materials", "Supplementary Material",
+})
+
+# Prioridad al repartir el presupuesto (menor = antes); el resto de secciones va al final
+SECTION_PRIORITY = {
+    DEFAULT_SECTION: 0, "Metadatos": 0, "Metadata": 0, "Abstract": 0,
+    "Conclusion": 1, "Conclusions": 1,
+    "Results": 2, "Results And Discussion": 2, "Results And Discussions": 2,
+    "Methods": 3, "Materials And Methods": 3, "Methodology": 3, "Experimental Procedures": 3,
+    "Discussion": 4,
+    "Introduction": 5, "Background": 5,
+}
+DEFAULT_PRIORITY = 6
+
+# Por debajo de este resto de presupuesto no merece la pena recortar una sección
+MIN_SECTION_TOKENS = 64
+
+_TITLE = re.compile(r"^#\s+(.+?)\s*$", re.MULTILINE)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimación local de tokens (~4 caracteres por token en inglés).
+    """
+    return len(text) // 4 + 1
+
+
+async def count_tokens(text: str, genai_client=None) -> int:
+    """
+    Tokens del texto según el modelo (models.count_tokens) si se pasa un cliente de google-genai;
+    si no, la estimación local.
+    """
+    if genai_client is None:
+        return estimate_tokens(text)
+    response = await genai_client.aio.models.count_tokens(model=settings.VERTEXAI_MODEL_NAME, contents=text)
+    return response.total_tokens or 0
+
+
+@dataclass
+class PreparedInput:
+    text: str
+    original_tokens: int
+    input_tokens: int
+    dropped_sections: List[str] = field(default_factory=list)
+    truncated_sections: List[str] = field(default_factory=list)
+    omitted_sections: List[str] = field(default_factory=list)
+
+    @property
+    def reduction(self) -> float:
+        return 1 - self.input_tokens / self.original_tokens if self.original_tokens else 0.0
+
+
+def _truncate_sentences(body: str, max_tokens: int) -> str:
+    """
+    Primeras frases de body que caben en max_tokens.
+    """
+    kept, used = [], 0
+    for sentence in _SENTENCE_END.split(body):
+        tokens = estimate_tokens(sentence)
+        if used + tokens > max_tokens:
+            break
+        kept.append(sentence)
+        used += tokens
+    return " ".join(kept)
+
+
+def _content_sections(text: str) -> Tuple[str, List[Tuple[str, str]], List[str]]:
+    """
+    (título, secciones sin las descartadas ni las duplicadas, nombres de las descartadas).
+    """
+    match = _TITLE.search(text)
+    title = match.group(1) if match else ""
+    if match:
+        text = text[:match.start()] + text[match.end():]
+
+    sections, seen, dropped = [], [], []
+    for name, body in split_sections(text):
+        if name in DROPPED_SECTIONS:
+            dropped.append(name)
+            continue
+        head = body[:300]
+        if any(head in previous for previous in seen):
+            continue
+        seen.append(body)
+        sections.append((name, body))
+    return title, sections, dropped
+
+
+def prepare_extraction_input(text: str, max_tokens: int = 0) -> PreparedInput:
+    """
+    Entrada para el extractor: sin secciones de cierre ni duplicadas y, si max_tokens > 0,
+    ajustada a ese presupuesto de tokens (estimados) por orden de prioridad de las secciones.
+    """
+    original_tokens = estimate_tokens(text)
+    title, sections, dropped = _content_sections(text)
+
+    header = f"# {title}\n\n" if title else ""
+    remaining = max_tokens - estimate_tokens(header) if max_tokens else None
+    selected = {}
+    truncated, omitted = [], []
+    order = sorted(range(len(sections)), key=lambda i: (SECTION_PRIORITY.get(sections[i][0], DEFAULT_PRIORITY), i))
+    for index in order:
+        name, body = sections[index]
+        block_tokens = estimate_tokens(body) + estimate_tokens(name) + 2
+        if remaining is None or block_tokens <= remaining:
+            selected[index] = body
+        elif remaining >= MIN_SECTION_TOKENS:
+            selected[index] = _truncate_sentences(body, remaining - estimate_tokens(name) - 2)
+            truncated.append(name)
+        else:
+            omitted.append(name)
+            continue
+        if remaining is not None:
+            remaining -= estimate_tokens(selected[index]) + estimate_tokens(name) + 2
+
+    parts = [header] + [f"## {sections[i][0]}\n\n{selected[i]}\n\n" for i in sorted(selected) if selected[i]]
+    prepared = "".join(parts).strip() + "\n"
+    return PreparedInput(
+        text=prepared,
+        original_tokens=original_tokens,
+        input_tokens=estimate_tokens(prepared),
+        dropped_sections=dropped,
+        truncated_sections=truncated,
+        omitted_sections=omitted,
+    )
+
+
+def build_extraction_contents(text: str) -> str:
+    """
+    Texto que se envía al extractor según la configuración (EXTRACTION_PREPROCESS_ENABLED,
+    EXTRACTION_INPUT_MAX_TOKENS).
+    """
+    if not settings.EXTRACTION_PREPROCESS_ENABLED:
+        return text
+    return prepare_extraction_input(text, settings.EXTRACTION_INPUT_MAX_TOKENS).text
@@ -5,16 +5,28 @@ Extrae el contenido principal de artículos de PMC (PubMed Central) y otros siti
 
 import re
 from bs4 import BeautifulSoup
-import requests
 from pathlib import Path
 
+from app.config.settings import settings
+from app.utils.extractor_rapido import LXML_DISPONIBLE, ExtractorRapido, SelectorNoSoportado
+from app.utils.http_cache import HttpCache
+
 
 class ExtractorArticulo:
     """
     Clase para extraer texto de artículos científicos desde archivos HTML
     """
     
-    def __init__(self):
+    def __init__(self, cache=None, motor="auto"):
+        """
+        Args:
+            cache: HttpCache para las descargas (por defecto la configurada en settings)
+            motor: "lxml" (un solo recorrido del árbol), "bs4" (BeautifulSoup) o "auto"
+                   (lxml si está instalado)
+        """
+        # Cache de HTML descargado (peticiones condicionales; modo offline si está configurado)
+        self.cache = cache if cache is not None else HttpCache(settings.HTTP_CACHE_DIR, settings.HTTP_CACHE_OFFLINE)
+
         self.selectores_contenido = [
             # Selectores específicos para PMC
             'section.body.main-article-body',
@@ -54,6 +66,14 @@ class ExtractorArticulo:
             '.advertisement', '.ads', '.banner'
         ]
 
+        self.motor = "lxml" if motor == "auto" and LXML_DISPONIBLE else motor
+        self._rapido = None
+        if self.motor == "lxml":
+            try:
+                self._rapido = ExtractorRapido(self)
+            except (ImportError, SelectorNoSoportado):
+                self.motor = "bs4"
+
     def cargar_html_desde_archivo(self, ruta_archivo):
         """
         Carga contenido HTML desde un archivo local
@@ -67,15 +87,13 @@ class ExtractorArticulo:
 
     def cargar_html_desde_url(self, url):
         """
-        Carga contenido HTML desde una URL
+        Carga contenido HTML desde una URL (a través de la cache HTTP)
         """
         try:
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
-            response = requests.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
-            return response.text
+            return self.cache.get(url, headers=headers, timeout=30).text
         except Exception as e:
             print(f"Error al cargar URL {url}: {e}")
             return None
@@ -238,7 +256,17 @@ class ExtractorArticulo:
         
         if not html_content:
             return None
-        
+
+        return self.parsear_html(html_content, fuente)
+
+    def parsear_html(self, html_content, fuente):
+        """
+        Extrae título, abstract, contenido y metadatos de un HTML ya cargado
+        con el motor configurado
+        """
+        if self._rapido is not None:
+            return self._rapido.extraer(html_content, fuente)
+
         # Parsear HTML
         soup = BeautifulSoup(html_content, 'html.parser')
         
@@ -253,6 +281,36 @@ class ExtractorArticulo:
         
         return resultado
 
+    def formatear_texto_extraido(self, resultado):
+        """
+        Texto en formato markdown (título, abstract, metadatos y contenido) de un resultado
+        """
+        partes = []
+
+        # Título
+        partes.append("## Title\n\n")
+        partes.append(f"{resultado.get('title', 'No title')}\n\n")
+
+        # Abstract si existe
+        abstract = resultado.get('abstract', '')
+        if abstract and abstract.strip():
+            partes.append("## Abstract\n\n")
+            partes.append(f"{abstract}\n\n")
+
+        # Metadatos si existen
+        metadata = resultado.get('metadata', {})
+        if metadata:
+            partes.append("## Metadata\n\n")
+            for key, value in metadata.items():
+                if isinstance(value, list):
+                    value = ', '.join(str(v) for v in value)
+                partes.append(f"**{key.title()}:** {value}\n\n")
+
+        # Contenido principal
+        partes.append("## Content\n\n")
+        partes.append(resultado.get('content', 'No content extracted'))
+        return "".join(partes)
+
     def guardar_texto_extraido(self, resultado):
         """
         Guarda el texto extraído en un archivo, creando el directorio si no existe.
@@ -278,28 +336,7 @@ class ExtractorArticulo:
             Path(archivo_salida).parent.mkdir(parents=True, exist_ok=True)
             
             with open(archivo_salida, 'w', encoding='utf-8') as f:
-                # Escribir título
-                f.write("## Title\n\n")
-                f.write(f"{resultado.get('title', 'No title')}\n\n")
-                
-                # Escribir abstract si existe
-                abstract = resultado.get('abstract', '')
-                if abstract and abstract.strip():
-                    f.write("## Abstract\n\n")
-                    f.write(f"{abstract}\n\n")
-                
-                # Escribir metadatos si existen
-                if metadata:
-                    f.write("## Metadata\n\n")
-                    for key, value in metadata.items():
-                        if isinstance(value, list):
-                            value = ', '.join(str(v) for v in value)
-                        f.write(f"**{key.title()}:** {value}\n\n")
-                
-                # Escribir contenido principal
-                f.write("## Content\n\n")
-                content = resultado.get('content', 'No content extracted')
-                f.write(content)
+                f.write(self.formatear_texto_extraido(resultado))
                 
             print(f"✅ Texto extraído guardado en: {archivo_salida}")
             return archivo_salida
@@ -0,0 +1,246 @@
+"""
+Motor de extracción rápido (lxml) para ExtractorArticulo
+
+En lugar de una pasada de soup.select por cada selector (más otra por cada selector
+de exclusión), recorre el árbol una sola vez y en ese recorrido:
+- anota la primera coincidencia de cada selector de título, abstract y contenido
+- marca los nodos excluidos (y todo su subárbol) para podarlos del contenido
+- recoge los meta tags
+
+Soporta las formas de selector que usa ExtractorArticulo: tag, .clase, #id, tag.clase1.clase2,
+[attr="valor"], [attr*="valor"] y combinaciones (sin descendientes). Si un selector no es
+compatible se lanza SelectorNoSoportado y ExtractorArticulo usa BeautifulSoup.
+"""
+
+import re
+
+try:
+    import lxml.html
+    LXML_DISPONIBLE = True
+except ImportError:  # lxml es opcional: sin él se usa BeautifulSoup
+    LXML_DISPONIBLE = False
+
+_SELECTOR = re.compile(
+    r'^(?P<tag>[a-zA-Z][a-zA-Z0-9]*)?'
+    r'(?P<resto>(?:[.#][\w-]+|\[[\w-]+(?:\*?=["\'][^"\']*["\'])?\])*)$'
+)
+_PARTE = re.compile(r'\.(?P<clase>[\w-]+)|#(?P<id>[\w-]+)|\[(?P<attr>[\w-]+)(?:(?P<op>\*?=)["\'](?P<valor>[^"\']*)["\'])?\]')
+
+ENCABEZADOS = ('h1', 'h2', 'h3', 'h4')
+
+
+class SelectorNoSoportado(ValueError):
+    pass
+
+
+class Selector:
+    """
+    Selector CSS simple compilado: tag, clases requeridas y condiciones sobre atributos.
+    """
+
+    def __init__(self, selector):
+        match = _SELECTOR.match(selector.strip())
+        if not match:
+            raise SelectorNoSoportado(selector)
+
+        self.tag = match.group('tag')
+        self.clases = []
+        self.condiciones = []
+        for parte in _PARTE.finditer(match.group('resto')):
+            if parte.group('clase'):
+                self.clases.append(parte.group('clase'))
+            elif parte.group('id'):
+                self.condiciones.append(('id', '=', parte.group('id')))
+            else:
+                self.condiciones.append((parte.group('attr'), parte.group('op'), parte.group('valor')))
+
+    def coincide(self, elemento, clases):
+        if self.tag and elemento.tag != self.tag:
+            return False
+        if any(clase not in clases for clase in self.clases):
+            return False
+        for attr, op, valor in self.condiciones:
+            actual = elemento.get(attr)
+            if actual is None:
+                return False
+            if op == '=' and actual != valor:
+                return False
+            if op == '*=' and valor not in actual:
+                return False
+        return True
+
+
+# Grupos de selectores que se evalúan en el recorrido
+TITULO, ABSTRACT, CONTENIDO, EXCLUIR = range(4)
+
+
+class ExtractorRapido:
+    """
+    Extrae título, abstract, contenido y metadatos en un solo recorrido del árbol lxml.
+    Reproduce la lógica de ExtractorArticulo (mismos selectores, mismas reglas de limpieza).
+
+    Para no evaluar todos los selectores en cada nodo, se indexan por tag o por clase:
+    en cada nodo solo se comprueban los selectores de su tag y de sus clases
+    (más los que solo tienen condiciones sobre atributos).
+    """
+
+    def __init__(self, extractor):
+        if not LXML_DISPONIBLE:
+            raise ImportError("lxml no está instalado")
+        self.extractor = extractor
+        grupos = {
+            TITULO: extractor.selectores_titulo,
+            ABSTRACT: extractor.selectores_abstract,
+            CONTENIDO: extractor.selectores_contenido,
+            EXCLUIR: extractor.elementos_excluir,
+        }
+        self.tamanos = {grupo: len(selectores) for grupo, selectores in grupos.items()}
+        self.por_tag, self.por_clase, self.genericos = {}, {}, []
+        for grupo, selectores in grupos.items():
+            for posicion, texto in enumerate(selectores):
+                selector = Selector(texto)
+                entrada = (grupo, posicion, selector)
+                if selector.tag:
+                    self.por_tag.setdefault(selector.tag, []).append(entrada)
+                elif selector.clases:
+                    self.por_clase.setdefault(selector.clases[0], []).append(entrada)
+                else:
+                    self.genericos.append(entrada)
+
+    def _candidatos(self, elemento, clases):
+        yield from self.por_tag.get(elemento.tag, ())
+        for clase in clases:
+            yield from self.por_clase.get(clase, ())
+        yield from self.genericos
+
+    def _recorrer(self, raiz):
+        """
+        Único recorrido en orden de documento. Las coincidencias de título y abstract se
+        buscan en todo el árbol; las de contenido, fuera de los subárboles excluidos.
+        """
+        primeros = {grupo: [None] * tamano for grupo, tamano in self.tamanos.items()}
+        excluidos, metas = [], []
+        podados = set()  # nodos excluidos y todos sus descendientes
+
+        for elemento in raiz.iter():
+            if not isinstance(elemento.tag, str):  # comentarios e instrucciones
+                continue
+            if elemento.tag == 'meta':
+                metas.append(elemento)
+
+            podado = elemento.getparent() in podados
+            excluir = False
+            clases = (elemento.get('class') or '').split()
+            for grupo, posicion, selector in self._candidatos(elemento, clases):
+                if podado and grupo in (CONTENIDO, EXCLUIR):
+                    continue
+                if not selector.coincide(elemento, clases):
+                    continue
+                if grupo == EXCLUIR:
+                    excluir = True
+                elif primeros[grupo][posicion] is None:
+                    primeros[grupo][posicion] = elemento
+
+            if podado or excluir:
+                podados.add(elemento)
+                if excluir and not podado:
+                    excluidos.append(elemento)
+                    # Un nodo excluido no puede ser contenedor de contenido
+                    primeros[CONTENIDO] = [
+                        None if candidato is elemento else candidato for candidato in primeros[CONTENIDO]
+                    ]
+
+        return primeros[TITULO], primeros[ABSTRACT], primeros[CONTENIDO], excluidos, metas
+
+    def _texto(self, elemento):
+        return elemento.text_content()
+
+    def extraer(self, html_content, fuente):
+        limpiar = self.extractor.limpiar_texto
+        if isinstance(html_content, str):
+            html_content = html_content.encode('utf-8')
+        raiz = lxml.html.document_fromstring(html_content, parser=lxml.html.HTMLParser(encoding='utf-8'))
+
+        titulos, abstracts, contenedores, excluidos, metas = self._recorrer(raiz)
+
+        # Título (mismas reglas que ExtractorArticulo.extraer_titulo)
+        titulo = None
+        for elemento in titulos:
+            if elemento is not None:
+                texto = limpiar(self._texto(elemento))
+                if texto and len(texto) > 10:
+                    titulo = texto
+                    break
+        if titulo is None:
+            title_tag = next(raiz.iter('title'), None)
+            if title_tag is not None:
+                titulo = re.sub(r'\s*-\s*(PMC|PubMed|NCBI).*$', '', limpiar(self._texto(title_tag)))
+            else:
+                titulo = "Título no encontrado"
+
+        # Abstract
+        abstract = ""
+        elemento = next((e for e in abstracts if e is not None), None)
+        if elemento is not None:
+            abstract = limpiar(re.sub(r'^abstract\s*', '', self._texto(elemento), flags=re.IGNORECASE))
+
+        # Podar los nodos excluidos (su texto "tail" se conserva, como con decompose)
+        for elemento in excluidos:
+            elemento.drop_tree()
+
+        # Contenido principal
+        contenido = ""
+        contenedor = next((e for e in contenedores if e is not None), None)
+        if contenedor is not None:
+            secciones = [
+                e for e in contenedor.iterdescendants('section', 'div')
+                if 'section' in (e.get('class') or '') or 'content' in (e.get('class') or '')
+            ]
+            if secciones:
+                for seccion in secciones:
+                    texto_seccion = self._texto_seccion(seccion)
+                    if texto_seccion:
+                        contenido += texto_seccion + "\n\n"
+            else:
+                contenido = limpiar(self._texto(contenedor))
+        if not contenido.strip():
+            body = next(raiz.iter('body'), None)
+            if body is not None:
+                contenido = limpiar(self._texto(body))
+
+        return {
+            'title': titulo,
+            'abstract': abstract,
+            'content': contenido,
+            'metadata': self._metadatos(metas),
+            'source': fuente
+        }
+
+    def _texto_seccion(self, seccion):
+        limpiar = self.extractor.limpiar_texto
+        texto = ""
+        encabezado = next(seccion.iterdescendants(*ENCABEZADOS), None)
+        if encabezado is not None:
+            texto += f"## {limpiar(self._texto(encabezado))}\n\n"
+        for p in seccion.iterdescendants('p'):
+            texto_p = limpiar(self._texto(p))
+            if texto_p and len(texto_p) > 20:
+                texto += texto_p + "\n\n"
+        return texto
+
+    def _metadatos(self, metas):
+        metadatos = {}
+        for meta in metas:
+            name = meta.get('name', '')
+            content = meta.get('content', '')
+            if 'citation_author' in name:
+                metadatos.setdefault('autores', []).append(content)
+            elif 'citation_journal_title' in name:
+                metadatos['revista'] = content
+            elif 'citation_publication_date' in name:
+                metadatos['fecha_publicacion'] = content
+            elif 'citation_doi' in name:
+                metadatos['doi'] = content
+            elif 'citation_pmid' in name:
+                metadatos['pmid'] = content
+        return metadatos
@@ -0,0 +1,85 @@
+"""
+Cliente LLM falso con la misma interfaz que VertexAIClient.generate_content.
+
+Sirve para probar el pipeline de extracción por lotes sin red ni cuota: responde con un
+JSON determinista construido a partir del texto (título y abstract del .txt extraído),
+con latencia simulada y, opcionalmente, una proporción de fallos transitorios.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import re
+
+from google.genai import types
+
+
+class FakeLLMError(RuntimeError):
+    """
+    Fallo transitorio simulado (equivalente a un 429/503 de Vertex AI).
+    """
+
+
+class FakeLLMClient:
+    def __init__(self, latency_seconds: float = 0.05, failure_rate: float = 0.0, seed: int = 0) -> None:
+        self.latency_seconds = latency_seconds
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self.calls = 0
+
+    @staticmethod
+    def _as_text(value) -> str:
+        """
+        Texto de un str, un types.Content o una lista de ellos (como los acepta generate_content).
+        """
+        if value is None:
+            return ""
+        if isinstance(value, str):
+            return value
+        if isinstance(value, types.Content):
+            return "".join(part.text or "" for part in value.parts or [])
+        return "\n".join(FakeLLMClient._as_text(item) for item in value)
+
+    @staticmethod
+    def _section(text: str, name: str) -> str:
+        match = re.search(rf"^##\s*{name}\s*\n+(.+?)(?=\n##\s|\Z)", text, flags=re.MULTILINE | re.DOTALL)
+        return match.group(1).strip() if match else ""
+
+    def _fake_extraction(self, text: str) -> dict:
+        title = re.search(r"^#\s+(.+)$", text, flags=re.MULTILINE)
+        abstract = self._section(text, "Abstract")
+        sentences = [s.strip() for s in re.split(r"(?<=\.)\s+", abstract) if s.strip()]
+        digest = int(hashlib.sha256(text.encode("utf-8")).hexdigest(), 16)
+        pmcid = re.search(r"PMC\d+", text)
+        doi = re.search(r"\*\*Doi:\*\*\s*(\S+)", text)
+        return {
+            "title": title.group(1).strip() if title else "",
+            "pmcid": pmcid.group(0) if pmcid else "",
+            "doi": doi.group(1) if doi else "",
+            "ai_generated_summary": " ".join(sentences[:3]),
+            "key_findings": sentences[3:6],
+            "study_type": "Experimental study",
+            "sample_size": str(digest % 100),
+            "demonstrates_space_adaptation": "true" if digest % 2 else "false",
+        }
+
+    async def generate_content(self, *, contents, config=None, **kwargs) -> types.GenerateContentResponse:
+        self.calls += 1
+        await asyncio.sleep(self.latency_seconds)
+        if self._random.random() < self.failure_rate:
+            raise FakeLLMError("Fallo transitorio simulado")
+
+        text = self._as_text(contents)
+        system = self._as_text(config.system_instruction) if config is not None else ""
+        body = json.dumps(self._fake_extraction(text), ensure_ascii=False)
+        prompt_tokens = (len(text) + len(system)) // 4
+        output_tokens = len(body) // 4
+        return types.GenerateContentResponse(
+            candidates=[types.Candidate(content=types.Content(role="model", parts=[types.Part(text=body)]))],
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=prompt_tokens,
+                candidates_token_count=output_tokens,
+                total_token_count=prompt_tokens + output_tokens,
+            ),
+        )
@@ -0,0 +1,183 @@
+"""
+Cache en disco de respuestas HTTP (HTML de artículos) con peticiones condicionales.
+
+- Los cuerpos se guardan comprimidos con gzip y direccionados por contenido
+  (objects/<sha256>.gz): dos URLs con el mismo HTML comparten el objeto.
+- Por cada URL se guarda un registro JSON con ETag, Last-Modified y el hash del cuerpo.
+- En cada descarga se envían If-None-Match / If-Modified-Since: si el servidor responde
+  304 se reutiliza el cuerpo cacheado sin transferirlo de nuevo.
+- En modo offline no se hace ninguna petición: solo se sirve lo que está en la cache
+  (útil para repetir experimentos de parseo sin red).
+"""
+
+import gzip
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+import requests
+
+from app.utils.atomic_file import write_atomic
+
+
+class CacheMiss(LookupError):
+    """
+    La URL no está en la cache y el modo offline impide descargarla.
+    """
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    content: bytes
+    encoding: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    # "miss": descargada; "revalidated": 304 del servidor; "offline": servida sin red
+    source: str = "miss"
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+
+class HttpCache:
+    def __init__(self, directory, offline: bool = False) -> None:
+        self.directory = Path(directory)
+        self.offline = offline
+        self.stats = {"miss": 0, "revalidated": 0, "offline": 0}
+
+    # --- Almacenamiento ---------------------------------------------------------------
+
+    def _record_path(self, url: str) -> Path:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directory / "records" / key[:2] / f"{key}.json"
+
+    def _object_path(self, content_hash: str) -> Path:
+        return self.directory / "objects" / content_hash[:2] / f"{content_hash}.gz"
+
+    def _read_record(self, url: str) -> Optional[Dict]:
+        path = self._record_path(url)
+        if not path.exists():
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def lookup(self, url: str) -> Optional[CachedResponse]:
+        """
+        Respuesta cacheada de una URL (sin red), o None si no está.
+        """
+        record = self._read_record(url)
+        if record is None:
+            return None
+        object_path = self._object_path(record["sha256"])
+        if not object_path.exists():
+            return None
+        with gzip.open(object_path, "rb") as f:
+            content = f.read()
+        return CachedResponse(
+            url=url,
+            content=content,
+            encoding=record.get("encoding") or "utf-8",
+            etag=record.get("etag"),
+            last_modified=record.get("last_modified"),
+        )
+
+    def urls(self) -> Iterator[str]:
+        """
+        URLs con respuesta cacheada (para reprocesar el corpus sin red).
+        """
+        for path in sorted((self.directory / "records").glob("*/*.json")):
+            with open(path, "r", encoding="utf-8") as f:
+                yield json.load(f)["url"]
+
+    def store(self, url: str, content: bytes, headers, encoding: Optional[str]) -> CachedResponse:
+        """
+        Guarda el cuerpo (si no existía ya ese contenido) y el registro de la URL.
+        """
+        content_hash = hashlib.sha256(content).hexdigest()
+        object_path = self._object_path(content_hash)
+        if not object_path.exists():
+            write_atomic(object_path, gzip.compress(content))
+
+        record = {
+            "url": url,
+            "sha256": content_hash,
+            "encoding": encoding or "utf-8",
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "fetched_at": datetime.now().isoformat(),
+        }
+        write_atomic(self._record_path(url), json.dumps(record, indent=2).encode("utf-8"))
+        return CachedResponse(
+            url=url,
+            content=content,
+            encoding=record["encoding"],
+            etag=record["etag"],
+            last_modified=record["last_modified"],
+        )
+
+    # --- Peticiones condicionales -----------------------------------------------------
+
+    def conditional_headers(self, cached: Optional[CachedResponse]) -> Dict[str, str]:
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+        return headers
+
+    def _offline_response(self, url: str, cached: Optional[CachedResponse]) -> CachedResponse:
+        if cached is None:
+            raise CacheMiss(f"{url} no está en la cache (modo offline)")
+        cached.source = "offline"
+        self.stats["offline"] += 1
+        return cached
+
+    def _handle_response(
+        self, url: str, cached: Optional[CachedResponse], status_code: int, content: bytes, headers, encoding
+    ) -> CachedResponse:
+        if status_code == 304 and cached is not None:
+            cached.source = "revalidated"
+            self.stats["revalidated"] += 1
+            return cached
+        self.stats["miss"] += 1
+        return self.store(url, content, headers, encoding)
+
+    def get(self, url: str, session=None, **kwargs) -> CachedResponse:
+        """
+        GET síncrono (requests) con la cache. kwargs se pasan a session.get (headers, timeout...).
+        Lanza requests.HTTPError si la respuesta es un error.
+        """
+        cached = self.lookup(url)
+        if self.offline:
+            return self._offline_response(url, cached)
+
+        headers = {**kwargs.pop("headers", {}), **self.conditional_headers(cached)}
+        response = (session or requests).get(url, headers=headers, **kwargs)
+        if response.status_code != 304:
+            response.raise_for_status()
+        return self._handle_response(
+            url, cached, response.status_code, response.content, response.headers, response.encoding
+        )
+
+    async def aget(self, url: str, client, **kwargs) -> CachedResponse:
+        """
+        GET asíncrono con un httpx.AsyncClient (kwargs se pasan a client.get).
+        Lanza httpx.HTTPStatusError si la respuesta es un error.
+        """
+        cached = self.lookup(url)
+        if self.offline:
+            return self._offline_response(url, cached)
+
+        headers = {**kwargs.pop("headers", {}), **self.conditional_headers(cached)}
+        response = await client.get(url, headers=headers, **kwargs)
+        if response.status_code != 304:
+            response.raise_for_status()
+        return self._handle_response(
+            url, cached, response.status_code, response.content, response.headers, response.encoding
+        )
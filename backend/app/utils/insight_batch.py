@@ -0,0 +1,238 @@
+"""
+Extracción de insights por lotes con LLM sobre los artículos de docs/extracted_articles.
+
+- Pool de workers asíncronos (concurrencia configurable) sobre el cliente asíncrono de Vertex AI
+- Límites de cuota con token buckets: peticiones por minuto (RPM) y tokens por minuto (TPM)
+- Reintentos con backoff exponencial y jitter completo
+- Ledger JSON persistente por artículo (pending/running/failed/done, intentos, tokens):
+  al relanzar solo se procesan los artículos pendientes o fallidos
+- Cache de extracciones por hash del contenido: los textos ya extraídos con el mismo
+  prompt y modelo se sirven sin llamar al modelo ni consumir cuota
+"""
+
+import asyncio
+import json
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.utils.atomic_file import write_atomic
+from app.utils.extraction_cache import ExtractionCache
+from app.utils.extraction_input import build_extraction_contents, estimate_tokens
+from app.utils.insight_extraction import (
+    extract_structured_data_with_usage,
+    extraction_cache,
+    extraction_cache_key,
+)
+from app.utils.llm_extraction import EXTRACTION_PROMPT
+from app.utils.rate_limiter import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+PENDING, RUNNING, FAILED, DONE = "pending", "running", "failed", "done"
+
+# Tokens de salida que se reservan por petición al estimar el consumo (JSON de ~8 campos)
+EXPECTED_OUTPUT_TOKENS = 1024
+
+
+class JobLedger:
+    """
+    Estado persistente de cada artículo (job_id = nombre del .txt sin extensión).
+    Se escribe de forma atómica para sobrevivir a interrupciones.
+    """
+
+    def __init__(self, path) -> None:
+        self.path = Path(path)
+        self.jobs: Dict[str, dict] = {}
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.jobs = json.load(f)
+        # Los que quedaron "running" se interrumpieron a medias: vuelven a pending
+        for job in self.jobs.values():
+            if job["status"] == RUNNING:
+                job["status"] = PENDING
+
+    def status(self, job_id: str) -> Optional[str]:
+        job = self.jobs.get(job_id)
+        return job["status"] if job else None
+
+    def update(self, job_id: str, status: str, **values) -> dict:
+        job = self.jobs.setdefault(job_id, {"status": PENDING, "attempts": 0, "tokens": 0, "error": None})
+        job.update(values, status=status, updated_at=datetime.now().isoformat())
+        return job
+
+    def counts(self) -> Dict[str, int]:
+        counts = {PENDING: 0, RUNNING: 0, FAILED: 0, DONE: 0}
+        for job in self.jobs.values():
+            counts[job["status"]] += 1
+        return counts
+
+    def save(self) -> None:
+        write_atomic(self.path, json.dumps(self.jobs, indent=2, ensure_ascii=False).encode("utf-8"))
+
+
+@dataclass
+class BatchStats:
+    done: int = 0
+    failed: int = 0
+    skipped: int = 0
+    cached: int = 0
+    retries: int = 0
+    tokens: int = 0
+    # Tokens estimados del texto original y de la entrada enviada tras el preprocesado
+    original_tokens: int = 0
+    input_tokens: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+
+def backoff_delay(attempt: int, base: float, cap: float = 60.0) -> float:
+    """
+    Backoff exponencial con jitter completo: uniforme en [0, min(cap, base * 2^intento)].
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class InsightBatchRunner:
+    def __init__(
+        self,
+        articles_dir,
+        output_dir,
+        ledger: JobLedger,
+        llm_client=None,
+        cache: Optional[ExtractionCache] = extraction_cache,
+        concurrency: int = 16,
+        rpm: int = 300,
+        tpm: int = 1_000_000,
+        max_attempts: int = 4,
+        backoff_base: float = 2.0,
+        checkpoint_every: int = 10,
+    ) -> None:
+        self.articles_dir = Path(articles_dir)
+        self.output_dir = Path(output_dir)
+        self.ledger = ledger
+        self.llm_client = llm_client
+        self.cache = cache
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.checkpoint_every = checkpoint_every
+        # Cuotas por minuto como token buckets (ráfaga máxima = la cuota de un minuto)
+        self.requests_bucket = TokenBucket(rate=rpm / 60, capacity=rpm)
+        self.tokens_bucket = TokenBucket(rate=tpm / 60, capacity=tpm)
+        self.prompt_tokens = estimate_tokens(EXTRACTION_PROMPT)
+        self.stats = BatchStats()
+
+    def output_path(self, job_id: str) -> Path:
+        return self.output_dir / f"{job_id}.json"
+
+    def select_jobs(self, force: bool = False, limit: int = 0) -> List[Path]:
+        """
+        Artículos a procesar: los que no están "done" (o todos con force).
+        Los que ya tienen JSON de una ejecución anterior sin ledger se registran como done.
+        """
+        pending = []
+        for path in sorted(self.articles_dir.glob("*.txt")):
+            job_id = path.stem
+            if not force:
+                if self.ledger.status(job_id) is None and self.output_path(job_id).exists():
+                    self.ledger.update(job_id, DONE)
+                if self.ledger.status(job_id) == DONE and self.output_path(job_id).exists():
+                    self.stats.skipped += 1
+                    continue
+            self.ledger.update(job_id, PENDING)
+            pending.append(path)
+        return pending[:limit] if limit else pending
+
+    async def _acquire_quota(self, text: str) -> None:
+        await self.requests_bucket.acquire()
+        estimated = self.prompt_tokens + estimate_tokens(text) + EXPECTED_OUTPUT_TOKENS
+        await self.tokens_bucket.acquire(min(estimated, self.tokens_bucket.capacity))
+
+    async def run_job(self, path: Path) -> str:
+        """
+        Procesa un artículo. Cualquier error (lectura, cache, escritura...) marca el artículo
+        como fallido en el ledger sin detener al resto de workers.
+        """
+        try:
+            return await self._run_job(path)
+        except Exception as e:
+            logger.warning("Error procesando %s: %s", path.stem, e)
+            self.ledger.update(path.stem, FAILED, error=f"{type(e).__name__}: {e}"[:500])
+            return FAILED
+
+    async def _run_job(self, path: Path) -> str:
+        job_id = path.stem
+        text = await asyncio.to_thread(path.read_text, encoding="utf-8")
+        contents = await asyncio.to_thread(build_extraction_contents, text)
+        # Los aciertos de cache no consumen cuota
+        cached = self.cache is not None and self.cache.contains(extraction_cache_key(contents))
+
+        attempt = 0
+        while True:
+            attempts = self.ledger.jobs[job_id]["attempts"] + 1
+            self.ledger.update(job_id, RUNNING, attempts=attempts)
+            if not cached:
+                await self._acquire_quota(contents)
+            try:
+                data, tokens = await extract_structured_data_with_usage(
+                    contents, self.llm_client, self.cache, preprocess=False
+                )
+                break
+            except Exception as e:
+                attempt += 1
+                if attempt >= self.max_attempts:
+                    logger.warning("Extracción fallida para %s tras %d intentos: %s", job_id, attempt, e)
+                    self.ledger.update(job_id, FAILED, error=str(e)[:500])
+                    return FAILED
+                self.stats.retries += 1
+                await asyncio.sleep(backoff_delay(attempt - 1, self.backoff_base))
+
+        payload = json.dumps(data, indent=4, ensure_ascii=False).encode("utf-8")
+        await asyncio.to_thread(write_atomic, self.output_path(job_id), payload)
+        self.stats.tokens += tokens
+        self.stats.original_tokens += estimate_tokens(text)
+        self.stats.input_tokens += estimate_tokens(contents)
+        self.stats.cached += cached
+        self.ledger.update(job_id, DONE, tokens=tokens, cached=cached, error=None)
+        return DONE
+
+    async def run(self, jobs: List[Path]) -> BatchStats:
+        queue: asyncio.Queue = asyncio.Queue()
+        for path in jobs:
+            queue.put_nowait(path)
+
+        async def worker() -> None:
+            while True:
+                try:
+                    path = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                status = await self.run_job(path)
+                if status == DONE:
+                    self.stats.done += 1
+                else:
+                    self.stats.failed += 1
+                processed = self.stats.done + self.stats.failed
+                if processed % self.checkpoint_every == 0:
+                    try:
+                        self.ledger.save()
+                    except OSError as e:
+                        logger.warning("No se pudo guardar el ledger: %s", e)
+                    logger.info(
+                        "%d/%d artículos (%.1f/min, %d tokens)",
+                        processed, len(jobs), processed / self.stats.elapsed * 60, self.stats.tokens,
+                    )
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(jobs)) or 1)))
+        finally:
+            self.ledger.save()
+        return self.stats
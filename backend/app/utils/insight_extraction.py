@@ -1,60 +1,92 @@
-from json import loads
-from app.config.vertexai_client import VertexAIClient
-from google.genai.types import GenerateContentConfig
 from app.config.settings import settings
+from app.models.paper_extraction import NON_EXTRACTED_FIELDS
+from app.utils.extraction_cache import ExtractionCache
+from app.utils.extraction_input import build_extraction_contents
+from app.utils.llm_extraction import (
+    EXTRACTION_PROMPT_VERSION,
+    EXTRACTION_TEMPERATURE,
+    generate_extraction,
+)
 
 
-vertex_ai_client = VertexAIClient()
+extraction_cache = ExtractionCache(settings.EXTRACTION_CACHE_DIR) if settings.EXTRACTION_CACHE_ENABLED else None
 
-# Prompt para estructurar datos del artículo científico
-with open("C:/Users/David/buscar_curro/hackathon/hackatonNasa2025/backend/app/prompts/scientific_paper_extractor_prompt.md", "r") as f:
-    EXTRACTION_PROMPT = f.read()
 
-async def extract_structured_data(text: str) -> dict:
+def extraction_cache_key(contents: str) -> str:
     """
-    Usa LLM para extraer datos estructurados del texto del artículo
-    
+    Clave de la extracción de un texto ya preparado (el que recibe el modelo)
+    con el prompt, esquema, modelo y temperatura actuales.
+    """
+    return ExtractionCache.key_for(
+        contents,
+        EXTRACTION_PROMPT_VERSION,
+        settings.VERTEXAI_MODEL_NAME,
+        EXTRACTION_TEMPERATURE,
+    )
+
+
+async def extract_structured_data_with_usage(
+    text: str, llm_client=None, cache: ExtractionCache | None = extraction_cache, preprocess: bool = True
+) -> tuple[dict, int]:
+    """
+    Usa LLM para extraer datos estructurados del texto del artículo con el mismo prompt,
+    esquema de salida y validación en PaperExtraction que llm_extraction
+
     Args:
         text: Texto completo del artículo
-        
+        llm_client: Cliente con generate_content asíncrono (por defecto VertexAIClient;
+            FakeLLMClient para pruebas sin red)
+        cache: Cache de extracciones (None para llamar siempre al modelo)
+        preprocess: Preparar el texto (build_extraction_contents); False si ya viene preparado
+
     Returns:
-        dict: Datos estructurados del artículo
+        (campos extraídos del artículo, tokens consumidos según usage_metadata; 0 si viene de la cache)
+
+    Raises:
+        ExtractionError: si la respuesta no es una extracción válida
     """
+    contents = build_extraction_contents(text) if preprocess else text
+    key = None
+    if cache is not None:
+        key = extraction_cache_key(contents)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached, 0
 
-    response = vertex_ai_client.client.models.generate_content(
-        model=settings.VERTEXAI_MODEL_NAME,
-        contents=text,
-        config=GenerateContentConfig(
-            system_instruction=EXTRACTION_PROMPT,
-            temperature=0,
-            response_mime_type="application/json",
-        )
-        ,
-    )
+    extraction, tokens, repaired = await generate_extraction(contents, llm_client)
+    structured_data = extraction.model_dump(mode="json", exclude=NON_EXTRACTED_FIELDS)
 
-    if not response.text:
-        raise Exception("Vertex AI Error: No response text received")
+    # Una respuesta reparada puede haber perdido campos: no se cachea, para que se reintente
+    if cache is not None and not repaired:
+        cache.put(key, structured_data, tokens, model=settings.VERTEXAI_MODEL_NAME)
+    return structured_data, tokens
 
-    try:
-        # Parsear la respuesta JSON
-        structured_data = loads(response.text.strip())
-        return structured_data
-    except ValueError:
-        raise Exception(f"Error parsing JSON response: {response.text}")
+
+async def extract_structured_data(text: str, llm_client=None) -> dict:
+    """
+    Usa LLM para extraer datos estructurados del texto del artículo
+
+    Args:
+        text: Texto completo del artículo
+
+    Returns:
+        dict: Datos estructurados del artículo
+    """
+    structured_data, _ = await extract_structured_data_with_usage(text, llm_client)
+    return structured_data
 
 
 async def process_article(text: str) -> dict:
     """
     Función principal: extrae texto de HTML y lo estructura con LLM
-    
+
     Args:
         html_content: Contenido HTML del artículo
-        
+
     Returns:
         dict: Datos estructurados del artículo científico
     """
-    
+
     structured_data = await extract_structured_data(text)
-    
-    return structured_data
 
+    return structured_data
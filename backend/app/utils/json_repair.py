@@ -0,0 +1,108 @@
+"""
+Reparación de respuestas JSON malformadas de un LLM.
+
+Cubre los fallos habituales para no tener que repetir la llamada completa:
+- JSON envuelto en un bloque ```json ... ``` o con texto antes o después
+- comas finales antes de } o ]
+- saltos de línea sin escapar dentro de las cadenas
+- respuesta truncada (límite de tokens de salida): se descarta el último valor incompleto
+  y se cierran las cadenas, listas y objetos abiertos
+"""
+
+import json
+import re
+from typing import Any, Dict
+
+_FENCE = re.compile(r"^```(?:json)?\s*|\s*```\s*$", re.IGNORECASE)
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_NUMBER = re.compile(r"-?(0|[1-9]\d*)(\.\d+)?([eE][+-]?\d+)?")
+
+
+class JsonRepairError(ValueError):
+    """
+    La respuesta no contiene un objeto JSON recuperable.
+    """
+
+
+def _is_complete_literal(token: str) -> bool:
+    return token in ("true", "false", "null") or bool(_NUMBER.fullmatch(token))
+
+
+def _close_truncated(text: str) -> str:
+    """
+    Cierra un JSON cortado a mitad: recorta hasta el último valor completo y añade los cierres.
+    """
+    stack = []
+    in_string = escaped = False
+    # Posición tras el último valor completo dentro del contenedor actual (y su pila)
+    last_complete, last_stack = 0, []
+    # Inicio del literal (número, true/false/null) que se está leyendo
+    literal_start = None
+    for index, char in enumerate(text + " "):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+                last_complete, last_stack = index + 1, list(stack)
+            continue
+        if char.isalnum() or char in "+-.":
+            if literal_start is None:
+                literal_start = index
+            continue
+        if literal_start is not None:
+            # Un literal cortado ("tru", "fal", "1e") no es un valor completo
+            if _is_complete_literal(text[literal_start:index]):
+                last_complete, last_stack = index, list(stack)
+            literal_start = None
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]":
+            if stack:
+                stack.pop()
+            last_complete, last_stack = index + 1, list(stack)
+
+    candidate = text[:last_complete].rstrip()
+    # Una clave sin valor ("campo") o un separador final no forman un valor completo
+    candidate = re.sub(r'(,|\{)\s*"[^"]*"$', r"\1", candidate)
+    candidate = re.sub(r'(,|\{)\s*"[^"]*"\s*:\s*$', r"\1", candidate)
+    candidate = candidate.rstrip().rstrip(",:")
+    return candidate + "".join(reversed(last_stack))
+
+
+def repair_json(text: str) -> Dict[str, Any]:
+    """
+    Devuelve el objeto JSON de una respuesta, reparándola si es necesario.
+    Lanza JsonRepairError si no hay ningún objeto recuperable o si, al cerrar una
+    respuesta truncada, no queda ningún campo completo ('{"title": tru' no es un {} válido).
+    """
+    if not text:
+        raise JsonRepairError("Respuesta vacía")
+    candidate = _FENCE.sub("", text.strip())
+    start = candidate.find("{")
+    if start < 0:
+        raise JsonRepairError(f"No hay ningún objeto JSON en la respuesta: {text[:200]}")
+    candidate = candidate[start:]
+
+    end = candidate.rfind("}")
+    attempts = []
+    if end >= 0:
+        attempts.append((candidate[:end + 1], False))
+        attempts.append((_TRAILING_COMMA.sub(r"\1", candidate[:end + 1]), False))
+    attempts.append((_TRAILING_COMMA.sub(r"\1", _close_truncated(candidate)), True))
+
+    for attempt, truncated in attempts:
+        try:
+            # strict=False: admite saltos de línea sin escapar dentro de las cadenas
+            data = json.loads(attempt, strict=False)
+        except ValueError:
+            continue
+        if isinstance(data, dict):
+            if truncated and not data:
+                break
+            return data
+    raise JsonRepairError(f"JSON irrecuperable: {text[:200]}")
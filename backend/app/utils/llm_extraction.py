@@ -1,90 +1,154 @@
-from json import loads
+import hashlib
+import json
+from typing import Tuple, Union
+from pydantic import ValidationError
 from app.config.vertexai_client import VertexAIClient
 from google.genai.types import GenerateContentConfig
 from app.config.settings import settings
+from app.models.paper import Paper
+from app.models.paper_extraction import PaperExtraction
+from app.utils.extraction_input import build_extraction_contents
+from app.utils.json_repair import JsonRepairError, repair_json
 
 
 vertex_ai_client = VertexAIClient()
 
-# Prompt para estructurar datos del artículo científico
-EXTRACTION_PROMPT = """
+# Esquema de salida generado a partir de Paper: Gemini solo puede devolver esos campos
+# y, en los enums, valores válidos
+EXTRACTION_RESPONSE_SCHEMA = PaperExtraction.response_schema()
+
+EXTRACTION_TEMPERATURE = 0
+
+# Respuestas validadas a la primera, reparadas (JSON malformado o campos inválidos) y descartadas
+extraction_stats = {"validated": 0, "repaired": 0, "failed": 0}
+
+
+class ExtractionError(ValueError):
+    """
+    La respuesta del LLM no se pudo convertir en una extracción válida.
+    """
+
+    def __init__(self, message: str, raw_text: str = "") -> None:
+        super().__init__(message)
+        self.raw_text = raw_text
+
+
+# Prompt para estructurar datos del artículo científico: los campos y sus instrucciones
+# salen de PaperExtraction, igual que EXTRACTION_RESPONSE_SCHEMA
+EXTRACTION_PROMPT = f"""
 Extract and structure the following information from this space biology/life sciences research paper in JSON format.
 
 For each field, extract the most accurate information possible from the text. If information is not available, use empty string, empty array, or null as appropriate.
+For fields with a list of valid values, use only those values, written exactly as listed.
 
-{
-  "title": "Full title of the paper",
-  "pmcid": "PubMed Central ID if mentioned (e.g., PMC10020673)",
-  "doi": "Digital Object Identifier if mentioned",
-  "journal_name": "Name of the journal where published",
-  "authors": ["List of all authors mentioned"],
-  "author_affiliations": ["List of institutions/universities mentioned for authors"],
-  
-  "ai_generated_summary": "Write a concise 2-3 sentence summary of the main research focus",
-  "key_findings": "Summarize the most important results and discoveries",
-  "clinical_relevance": "Explain the potential medical/health implications for space missions",
-  
-  "study_type": "Type of study conducted (e.g., experimental, observational, longitudinal, case study, etc.)",
-  "experimental_platform": "Where the study was conducted (e.g., International Space Station, ground-based simulation, parabolic flight, etc.)",
-  "space_environment_stressors": ["List all space-related factors studied (e.g., microgravity, radiation, isolation, etc.)"],
-  
-  "primary_organisms_studied": ["List all organisms studied (e.g., human, mouse, rat, plants, microorganisms, cells, etc.)"],
-  "affected_organ_systems": ["List body systems affected (e.g., musculoskeletal, cardiovascular, immune, nervous, etc.)"],
-  "biological_analysis_level": ["Level of biological analysis (e.g., molecular, cellular, tissue, organ, organism level)"],
-  
-  "experimental_duration_days": "Duration of the experiment in days (number only, null if not specified)",
-  "sample_size": "Number of subjects/samples studied (number only, null if not specified)",
-  "sampling_methodology": "How samples were collected/selected (e.g., random, stratified, convenience sampling)",
-  "analytical_methods_used": ["Statistical or analytical methods used (e.g., ANOVA, regression, descriptive analysis, etc.)"],
-  
-  "molecular_techniques": ["Specific molecular/biochemical techniques used (e.g., RNA sequencing, proteomics, PCR, Western blot, etc.)"],
-  "measurement_technologies": ["Instruments and technologies used for measurements (e.g., microscopy, spectroscopy, MRI, etc.)"],
-  
-  "demonstrates_space_adaptation": "true/false - Does the study show biological adaptation to space environment?",
-  "identifies_countermeasures": "true/false - Does the study propose interventions/countermeasures for space-related health issues?",
-  "relevant_for_long_duration_missions": "true/false - Are findings relevant for long-duration space missions (Mars, Moon, etc.)?",
-  "health_implications_severity": "Assess severity of health implications (LOW, MODERATE, HIGH, CRITICAL)",
-  
-  "applicable_to_missions": ["List space missions this research applies to (e.g., ISS, Artemis, Mars missions, etc.)"],
-  "space_agency_involvement": ["Space agencies involved or mentioned (e.g., NASA, ESA, JAXA, etc.)"],
-  
-  "tags": ["Generate 5-10 relevant tags for categorization (e.g., bone loss, muscle atrophy, gene expression, etc.)"]
-}
+{PaperExtraction.prompt_template()}
 
 Respond ONLY with valid JSON, no additional text.
 """
 
-async def extract_structured_data(text: str) -> dict:
+# Identificador del prompt y del esquema actuales (forma parte de las claves de cache)
+EXTRACTION_PROMPT_VERSION = hashlib.sha256(
+    (EXTRACTION_PROMPT + json.dumps(EXTRACTION_RESPONSE_SCHEMA, sort_keys=True)).encode("utf-8")
+).hexdigest()[:12]
+
+
+def _parse_extraction(raw_text: str) -> Tuple[PaperExtraction, bool]:
     """
-    Usa LLM para extraer datos estructurados del texto del artículo
-    
+    parse_extraction indicando además si la respuesta tuvo que repararse.
+    """
+    try:
+        extraction = PaperExtraction.model_validate_json(raw_text)
+        extraction_stats["validated"] += 1
+        return extraction, False
+    except ValidationError:
+        pass
+
+    try:
+        extraction = PaperExtraction.validate_partial(repair_json(raw_text))
+    except (JsonRepairError, ValidationError) as e:
+        extraction_stats["failed"] += 1
+        raise ExtractionError(f"Error parsing JSON response: {e}", raw_text) from e
+    if not extraction.title or not extraction.has_extracted_data():
+        extraction_stats["failed"] += 1
+        raise ExtractionError("Repaired JSON response has no title or extracted fields", raw_text)
+    extraction_stats["repaired"] += 1
+    return extraction, True
+
+
+def parse_extraction(raw_text: str) -> PaperExtraction:
+    """
+    Valida la respuesta JSON directamente en PaperExtraction (una sola pasada).
+    Si falla, repara el JSON y valida campo a campo, descartando solo los campos inválidos.
+
+    Raises:
+        ExtractionError: si la respuesta no contiene un objeto JSON recuperable o si la
+            extracción reparada no tiene título o ningún otro campo extraído (guardarla
+            sustituiría el título por el PMCID y vaciaría los campos del paper existente)
+    """
+    return _parse_extraction(raw_text)[0]
+
+
+async def generate_extraction(contents, llm_client=None) -> Tuple[PaperExtraction, int, bool]:
+    """
+    Llama al LLM con la entrada ya preparada (build_extraction_contents), con salida
+    restringida por EXTRACTION_RESPONSE_SCHEMA, y valida la respuesta.
+
     Args:
-        text: Texto completo del artículo
-        
+        contents: Entrada del modelo
+        llm_client: Cliente con generate_content asíncrono (por defecto VertexAIClient;
+            FakeLLMClient para pruebas sin red)
+
     Returns:
-        dict: Datos estructurados del artículo
+        (extracción validada, tokens consumidos según usage_metadata, si la respuesta se reparó)
     """
-
-    response = vertex_ai_client.client.models.generate_content(
+    response = await (llm_client or vertex_ai_client).generate_content(
         model=settings.VERTEXAI_MODEL_NAME,
-        contents=text,
+        contents=contents,
         config=GenerateContentConfig(
             system_instruction=EXTRACTION_PROMPT,
-            temperature=0,
+            temperature=EXTRACTION_TEMPERATURE,
             response_mime_type="application/json",
-        )
-        ,
+            response_schema=EXTRACTION_RESPONSE_SCHEMA,
+        ),
     )
 
     if not response.text:
-        raise Exception("Vertex AI Error: No response text received")
+        raise ExtractionError("Vertex AI Error: No response text received")
+
+    usage = response.usage_metadata
+    tokens = (usage.total_token_count or 0) if usage else 0
+    extraction, repaired = _parse_extraction(response.text)
+    return extraction, tokens, repaired
 
-    try:
-        # Parsear la respuesta JSON
-        structured_data = loads(response.text.strip())
-        return structured_data
-    except ValueError:
-        raise Exception(f"Error parsing JSON response: {response.text}")
+
+async def extract_paper(text: str, llm_client=None) -> PaperExtraction:
+    """
+    Usa LLM para extraer los campos de Paper del texto del artículo, con salida restringida
+    por EXTRACTION_RESPONSE_SCHEMA
+
+    Args:
+        text: Texto completo del artículo
+        llm_client: Cliente con generate_content asíncrono (por defecto VertexAIClient)
+
+    Returns:
+        PaperExtraction: Datos estructurados y validados del artículo
+    """
+    extraction, _, _ = await generate_extraction(build_extraction_contents(text), llm_client)
+    return extraction
+
+
+async def extract_structured_data(text: str) -> dict:
+    """
+    Usa LLM para extraer datos estructurados del texto del artículo
+
+    Args:
+        text: Texto completo del artículo
+
+    Returns:
+        dict: Datos estructurados del artículo
+    """
+    extraction = await extract_paper(text)
+    return extraction.model_dump(mode="json")
 
 
 async def process_article(text: str) -> dict:
@@ -102,3 +166,23 @@ async def process_article(text: str) -> dict:
     
     return structured_data
 
+
+def paper_from_extraction(
+    extraction: Union[PaperExtraction, dict], full_text: str = "", pmcid: str = ""
+) -> Paper:
+    """
+    Construye un Paper a partir de una extracción (o del JSON extraído, que se valida
+    descartando los campos que no encajan).
+
+    Args:
+        extraction: PaperExtraction o JSON devuelto por extract_structured_data
+        full_text: Texto completo del artículo
+        pmcid: PMCID conocido (p. ej. por el nombre del archivo) si el LLM no lo devuelve
+    """
+    if isinstance(extraction, dict):
+        extraction = PaperExtraction.validate_partial(extraction)
+    if pmcid and not extraction.pmcid:
+        extraction.pmcid = pmcid
+    if not extraction.title:
+        extraction.title = extraction.pmcid
+    return extraction.to_paper(full_text)
@@ -0,0 +1,136 @@
+"""
+Divide el texto completo de un paper en fragmentos (chunks) conscientes de las secciones.
+
+Los textos extraídos de PMC suelen tener encabezados markdown ("## Abstract") y, dentro del
+contenido, los títulos de sección en línea ("...water.2. Materials and methods The...").
+Se detectan ambos para etiquetar cada fragmento con su sección.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Tuple
+
+SECTION_NAMES = (
+    r"Abstract|Introduction|Background|Materials and [Mm]ethods|Methods|Methodology|"
+    r"Experimental [Pp]rocedures|Results and [Dd]iscussions?|Results|Discussion|Conclusions?|"
+    r"Acknowledg(?:e)?ments|References|Funding|Author [Cc]ontributions|"
+    r"Data [Aa]vailability(?: [Ss]tatement)?|Conflicts? of [Ii]nterest|Competing [Ii]nterests|"
+    r"Supplementary [Mm]aterials?|Footnotes"
+)
+
+# Encabezado markdown en su propia línea
+_MARKDOWN_HEADING = re.compile(r"^#{1,6}\s+(.+?)\s*$", re.MULTILINE)
+
+# Título de sección en línea: tras fin de frase o numerado ("1. Introduction"), seguido de mayúscula o subsección
+_INLINE_HEADING = re.compile(
+    r"(?:(?<=[a-z0-9])\d+(?:\.\d+)*\.?\s+|(?:(?<=[.!?:\])])|^)\s*(?:\d+(?:\.\d+)*\.?\s+)?)"
+    r"(" + SECTION_NAMES + r")(?=\s+[A-Z0-9])",
+    re.MULTILINE,
+)
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+DEFAULT_SECTION = "Body"
+
+# Secciones sin contenido útil para responder preguntas sobre el paper
+SKIPPED_SECTIONS = frozenset({"References", "Footnotes"})
+
+
+@dataclass
+class TextChunk:
+    section: str
+    position: int
+    text: str
+
+
+def normalize_section_name(name: str) -> str:
+    """
+    Normaliza un nombre de sección ("Materials and methods" -> "Materials And Methods").
+    """
+    return " ".join(word.capitalize() for word in name.split())
+
+
+def split_sections(text: str) -> List[Tuple[str, str]]:
+    """
+    Separa el texto en (sección, contenido) respetando el orden original.
+    """
+    if not text:
+        return []
+
+    boundaries = []
+    for match in _MARKDOWN_HEADING.finditer(text):
+        boundaries.append((match.start(), match.end(), match.group(1)))
+    for match in _INLINE_HEADING.finditer(text):
+        boundaries.append((match.start(), match.end(), match.group(1)))
+    boundaries.sort()
+
+    sections: List[Tuple[str, str]] = []
+    current_name = DEFAULT_SECTION
+    cursor = 0
+    for start, end, name in boundaries:
+        if start < cursor:
+            # Encabezado solapado con otro ya procesado
+            continue
+        body = text[cursor:start].strip()
+        if body:
+            sections.append((current_name, body))
+        current_name = normalize_section_name(name.strip("# ").strip())
+        cursor = end
+
+    body = text[cursor:].strip()
+    if body:
+        sections.append((current_name, body))
+    return sections
+
+
+def _split_words(text: str, max_words: int, overlap_words: int) -> List[str]:
+    """
+    Agrupa frases en ventanas de hasta max_words palabras con solapamiento entre ventanas.
+    """
+    sentences = [s for s in _SENTENCE_END.split(text) if s.strip()]
+    windows: List[str] = []
+    current: List[str] = []
+
+    for sentence in sentences:
+        words = sentence.split()
+        # Frases muy largas (tablas, listas) se cortan por palabras
+        while len(words) > max_words:
+            if current:
+                windows.append(" ".join(current))
+                current = current[-overlap_words:] if overlap_words else []
+            take = max_words - len(current)
+            current.extend(words[:take])
+            words = words[take:]
+            windows.append(" ".join(current))
+            current = current[-overlap_words:] if overlap_words else []
+
+        if len(current) + len(words) > max_words and current:
+            windows.append(" ".join(current))
+            current = current[-overlap_words:] if overlap_words else []
+        current.extend(words)
+
+    if current and (not windows or len(current) > overlap_words):
+        windows.append(" ".join(current))
+    return windows
+
+
+def chunk_paper_text(text: str, max_words: int = 220, overlap_words: int = 40) -> List[TextChunk]:
+    """
+    Divide el texto de un paper en fragmentos de tamaño acotado sin cruzar secciones.
+    Las secciones de SKIPPED_SECTIONS (bibliografía, notas) se descartan.
+
+    Args:
+        text: Texto completo del paper
+        max_words: Tamaño máximo de cada fragmento en palabras
+        overlap_words: Palabras repetidas entre fragmentos consecutivos de una misma sección
+
+    Returns:
+        Lista de TextChunk en orden de aparición
+    """
+    chunks: List[TextChunk] = []
+    for section, body in split_sections(text):
+        if section in SKIPPED_SECTIONS:
+            continue
+        for window in _split_words(body, max_words, overlap_words):
+            chunks.append(TextChunk(section=section, position=len(chunks), text=window))
+    return chunks
@@ -2,6 +2,7 @@ from __future__ import annotations
 from pathlib import Path
 from string import Template
 from typing import Dict, Optional, Any
+import hashlib
 import threading
 
 
@@ -48,6 +49,14 @@ class PromptLoader:
             self._cache[name] = text
         return text
 
+    def version(self, name: str) -> str:
+        """Devuelve un identificador corto del contenido del prompt (hash SHA-256).
+
+        Cambia en cuanto se edita la plantilla, por lo que sirve como parte de claves de cache.
+        """
+        raw = self.load_raw(name)
+        return hashlib.sha256(raw.encode(self.encoding)).hexdigest()[:12]
+
     def render(self, name: str, variables: Optional[Dict[str, Any]] = None) -> str:
         """Renderiza el prompt con variables opcionales usando ${var}.
 
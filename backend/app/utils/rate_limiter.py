@@ -0,0 +1,42 @@
+"""
+Limitador de ritmo token bucket para clientes asíncronos (scraping, llamadas a APIs).
+"""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket: se reponen `rate` tokens por segundo hasta un máximo de `capacity`.
+    Cada operación consume uno o más tokens y espera si no hay suficientes, de modo que
+    se permiten ráfagas de hasta `capacity` y un ritmo sostenido de `rate` por segundo.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate y capacity deben ser positivos")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """
+        Espera hasta que haya `tokens` disponibles y los consume.
+        Las esperas se atienden en orden de llegada.
+        """
+        if tokens > self.capacity:
+            raise ValueError(f"No se pueden pedir {tokens} tokens con capacidad {self.capacity}")
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
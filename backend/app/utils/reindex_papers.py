@@ -0,0 +1,32 @@
+"""
+REINDEX PAPERS - Regenera los índices derivados
+===============================================
+
+Recorre todos los papers de MongoDB y regenera sus fragmentos para el chat (paper_chunks)
+y sus embeddings para la búsqueda semántica (paper_embeddings).
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Agregar el directorio backend al path para poder importar el paquete 'app'
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.config.mongodb_client import MongoDbClient
+from app.services.ingestion_service import reindex_all_papers
+
+
+async def main():
+    database = MongoDbClient()
+    await database.init()
+    try:
+        total = await reindex_all_papers()
+        print(f"Papers reindexados: {total}")
+    finally:
+        await database.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,140 @@
+"""
+RUN BATCH EXTRACTION - Reextracción del corpus con batch prediction
+===================================================================
+
+Empaqueta los artículos de docs/extracted_articles en un único trabajo JSONL de batch
+prediction (con el prompt de llm_extraction), espera a que termine y vuelca los resultados
+según se leen: a JSON (--output) y/o a MongoDB a través del pipeline de ingesta (--ingest).
+
+    python app/utils/run_batch_extraction.py --ingest                  # Vertex AI (nocturno)
+    python app/utils/run_batch_extraction.py --job <nombre> --ingest   # retomar un trabajo enviado
+    python app/utils/run_batch_extraction.py --backend local --fake-llm --output /tmp/batch
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Agregar el directorio backend al path para poder importar el paquete 'app'
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.config.settings import settings
+from app.utils.atomic_file import write_atomic
+from app.utils.batch_prediction import (
+    SUCCEEDED,
+    LocalBatchBackend,
+    VertexBatchBackend,
+    get_batch_backend,
+    stream_results,
+    wait_for_job,
+    write_batch_input,
+)
+from app.utils.extraction_input import build_extraction_contents
+from app.utils.fake_llm_client import FakeLLMClient
+from app.models.paper_extraction import NON_EXTRACTED_FIELDS
+from app.utils.llm_extraction import (
+    EXTRACTION_PROMPT,
+    EXTRACTION_RESPONSE_SCHEMA,
+    extraction_stats,
+    paper_from_extraction,
+    parse_extraction,
+)
+
+
+def build_backend(args):
+    llm_client = FakeLLMClient(args.fake_latency) if args.fake_llm else None
+    if args.backend == "local":
+        return LocalBatchBackend(settings.BATCH_PREDICTION_LOCAL_DIR, llm_client)
+    if args.backend == "vertex":
+        return VertexBatchBackend(
+            settings.VERTEXAI_BATCH_GCS_PREFIX, settings.VERTEXAI_PROJECT, settings.VERTEXAI_LOCATION
+        )
+    return get_batch_backend(llm_client)
+
+
+async def main(args):
+    articles_dir = Path(args.articles)
+    backend = build_backend(args)
+
+    job_name = args.job
+    if job_name is None:
+        files = sorted(articles_dir.glob("*.txt"))
+        if args.limit:
+            files = files[:args.limit]
+        input_path = Path(settings.BATCH_PREDICTION_LOCAL_DIR) / "inputs" / f"{datetime.now():%Y%m%d-%H%M%S}.jsonl"
+        total = write_batch_input(
+            input_path,
+            ((path.stem, build_extraction_contents(path.read_text(encoding="utf-8"))) for path in files),
+            EXTRACTION_PROMPT,
+            EXTRACTION_RESPONSE_SCHEMA,
+        )
+        job_name = await backend.submit(input_path, "paper-extraction")
+        print(f"Trabajo enviado: {job_name} ({total} artículos). Se puede retomar con --job {job_name}")
+
+    state = await wait_for_job(backend, job_name, args.poll)
+    print(f"Trabajo {job_name}: {state}")
+    if state != SUCCEEDED and not state.endswith("PARTIALLY_SUCCEEDED"):
+        return
+
+    database = None
+    if args.ingest:
+        from app.config.mongodb_client import MongoDbClient
+        from app.services.ingestion_service import upsert_paper
+
+        database = MongoDbClient()
+        await database.init()
+
+    output_dir = Path(args.output) if args.output else None
+    counts = {"ok": 0, "error": 0}
+    tokens = 0
+    try:
+        # Cada respuesta se valida una sola vez, directamente contra los campos de Paper
+        async for result in stream_results(backend, job_name, parse=parse_extraction):
+            tokens += result.tokens
+            if result.data is None:
+                counts["error"] += 1
+                print(f"ERROR {result.key}: {result.error}")
+                continue
+            extraction = result.data
+            if output_dir:
+                data = extraction.model_dump(mode="json", exclude=NON_EXTRACTED_FIELDS)
+                payload = json.dumps(data, indent=4, ensure_ascii=False).encode("utf-8")
+                write_atomic(output_dir / f"{result.key}.json", payload)
+            if database:
+                article = articles_dir / f"{result.key}.txt"
+                full_text = article.read_text(encoding="utf-8") if article.exists() else ""
+                pmcid = re.match(r"PMC\d+", result.key)
+                paper = paper_from_extraction(extraction, full_text, pmcid.group(0) if pmcid else "")
+                await upsert_paper(paper)
+            counts["ok"] += 1
+    finally:
+        if database:
+            await database.close()
+
+    print(f"Resultados: {counts['ok']} correctos, {counts['error']} con error, {tokens} tokens")
+    print(f"Validación: {extraction_stats['validated']} directas, {extraction_stats['repaired']} reparadas, "
+          f"{extraction_stats['failed']} irrecuperables")
+
+
+if __name__ == "__main__":
+    project_root = backend_dir.parent
+    parser = argparse.ArgumentParser(description="Reextracción del corpus con batch prediction")
+    parser.add_argument("--articles", default=str(project_root / "docs" / "extracted_articles"))
+    parser.add_argument("--output", default=None, help="Directorio donde guardar un JSON por artículo")
+    parser.add_argument("--ingest", action="store_true", help="Guardar los papers en MongoDB (ingest pipeline)")
+    parser.add_argument("--backend", choices=["vertex", "local"], default=None,
+                        help="Por defecto settings.BATCH_PREDICTION_BACKEND")
+    parser.add_argument("--job", default=None, help="Retomar un trabajo ya enviado en lugar de crear otro")
+    parser.add_argument("--limit", type=int, default=0, help="Enviar solo los primeros N artículos")
+    parser.add_argument("--poll", type=float, default=settings.BATCH_PREDICTION_POLL_SECONDS,
+                        help="Intervalo inicial de sondeo (s)")
+    parser.add_argument("--fake-llm", action="store_true", help="Backend local con FakeLLMClient (sin red)")
+    parser.add_argument("--fake-latency", type=float, default=0.05)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    asyncio.run(main(parser.parse_args()))
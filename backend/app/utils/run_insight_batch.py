@@ -0,0 +1,81 @@
+"""
+RUN INSIGHT BATCH - Extracción de insights de todo el corpus con LLM
+====================================================================
+
+Procesa los artículos de docs/extracted_articles en paralelo (respetando RPM/TPM) y guarda
+un JSON por artículo en docs/insight_json_results. El progreso queda en un ledger
+(insight_jobs.json): al relanzar se retoman los pendientes y los fallidos.
+
+    python app/utils/run_insight_batch.py --concurrency 32 --rpm 600
+    python app/utils/run_insight_batch.py --fake-llm --output /tmp/insights   # sin red
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+# Agregar el directorio backend al path para poder importar el paquete 'app'
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.config.settings import settings
+from app.utils.fake_llm_client import FakeLLMClient
+from app.utils.insight_batch import InsightBatchRunner, JobLedger
+from app.utils.insight_extraction import extraction_cache
+
+
+async def main(args):
+    output_dir = Path(args.output)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    ledger = JobLedger(args.ledger or output_dir.parent / "insight_jobs.json")
+    llm_client = FakeLLMClient(args.fake_latency, args.fake_failure_rate) if args.fake_llm else None
+
+    runner = InsightBatchRunner(
+        args.articles,
+        output_dir,
+        ledger,
+        llm_client=llm_client,
+        cache=None if args.no_cache else extraction_cache,
+        concurrency=args.concurrency,
+        rpm=args.rpm,
+        tpm=args.tpm,
+        max_attempts=args.max_attempts,
+        backoff_base=args.backoff,
+    )
+    jobs = runner.select_jobs(force=args.force, limit=args.limit)
+    print(f"Artículos a procesar: {len(jobs)} ({runner.stats.skipped} ya extraídos)")
+
+    stats = await runner.run(jobs)
+    print(f"Extraídos: {stats.done} | Fallidos: {stats.failed} | Reintentos: {stats.retries}")
+    print(f"Tokens: {stats.tokens} | {stats.elapsed:.1f}s ({stats.done / stats.elapsed * 60:.1f} artículos/min)")
+    if stats.original_tokens:
+        print(f"Entrada: {stats.input_tokens} de {stats.original_tokens} tokens estimados "
+              f"({1 - stats.input_tokens / stats.original_tokens:.0%} menos tras el preprocesado)")
+    print(f"Ledger: {ledger.path} {ledger.counts()}")
+    if runner.cache is not None:
+        cache_stats = runner.cache.stats
+        print(f"Cache: {stats.cached} desde cache ({runner.cache.hit_rate:.0%} de aciertos), "
+              f"{cache_stats['tokens_saved']} tokens ahorrados")
+
+
+if __name__ == "__main__":
+    project_root = backend_dir.parent
+    parser = argparse.ArgumentParser(description="Extracción de insights por lotes con LLM")
+    parser.add_argument("--articles", default=str(project_root / "docs" / "extracted_articles"))
+    parser.add_argument("--output", default=str(project_root / "docs" / "insight_json_results"))
+    parser.add_argument("--ledger", default=None, help="Ruta del ledger (por defecto junto al directorio de salida)")
+    parser.add_argument("--concurrency", type=int, default=settings.INSIGHT_EXTRACTION_CONCURRENCY)
+    parser.add_argument("--rpm", type=int, default=settings.INSIGHT_EXTRACTION_RPM, help="Peticiones por minuto")
+    parser.add_argument("--tpm", type=int, default=settings.INSIGHT_EXTRACTION_TPM, help="Tokens por minuto")
+    parser.add_argument("--max-attempts", type=int, default=settings.INSIGHT_EXTRACTION_MAX_ATTEMPTS)
+    parser.add_argument("--backoff", type=float, default=2.0, help="Espera base del backoff exponencial (s)")
+    parser.add_argument("--limit", type=int, default=0, help="Procesar solo los primeros N artículos")
+    parser.add_argument("--force", action="store_true", help="Reextraer también los ya completados")
+    parser.add_argument("--no-cache", action="store_true", help="No usar la cache de extracciones")
+    parser.add_argument("--fake-llm", action="store_true", help="Usar FakeLLMClient (sin red ni cuota)")
+    parser.add_argument("--fake-latency", type=float, default=0.05)
+    parser.add_argument("--fake-failure-rate", type=float, default=0.0)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    asyncio.run(main(parser.parse_args()))
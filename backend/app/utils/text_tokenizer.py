@@ -0,0 +1,35 @@
+"""
+Tokenizador ligero para búsquedas léxicas (BM25) sobre texto científico en inglés.
+"""
+
+import re
+from typing import List
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-'][a-z0-9]+)*")
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further had
+has have having he her here hers herself him himself his how however i if in into is it its itself
+just may me might more most must my myself no nor not of off on once only or other our ours
+ourselves out over own same she should so some such than that the their theirs them themselves
+then there these they this those through thus to too under until up upon very was we were what
+when where which while who whom why will with within without would you your yours yourself
+yourselves et al fig figure table
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Convierte un texto en una lista de términos normalizados.
+
+    - Pasa a minúsculas y separa por caracteres no alfanuméricos (mantiene guiones internos: "t-cell").
+    - Descarta stopwords y tokens de un solo carácter.
+    """
+    if not text:
+        return []
+    return [
+        token
+        for token in _TOKEN_PATTERN.findall(text.lower())
+        if len(token) > 1 and token not in STOPWORDS
+    ]
@@ -0,0 +1,143 @@
+"""
+Pruebas del runner de extracción por lotes con FakeLLMClient (sin red ni cuota):
+estados del ledger, reanudación tras una interrupción, reintentos y aislamiento de fallos.
+
+    cd backend && python -m pytest tests
+"""
+
+import asyncio
+import json
+
+from app.utils.fake_llm_client import FakeLLMClient, FakeLLMError
+from app.utils.insight_batch import DONE, FAILED, PENDING, RUNNING, InsightBatchRunner, JobLedger
+
+ARTICULO = """# Articulo de prueba {n}
+
+**Doi:** 10.1000/prueba.{n}
+
+## Abstract
+
+Primera frase del articulo {n}. Segunda frase. Tercera frase. Cuarta frase con resultados.
+"""
+
+
+class FallaPrimeras(FakeLLMClient):
+    """
+    FakeLLMClient que falla las primeras `fallos` llamadas de cada artículo (por título).
+    """
+
+    def __init__(self, fallos: dict) -> None:
+        super().__init__(latency_seconds=0)
+        self.fallos = dict(fallos)
+        self.llamadas = {}
+
+    async def generate_content(self, *, contents, config=None, **kwargs):
+        texto = self._as_text(contents)
+        articulo = next((nombre for nombre in self.fallos if f"Articulo de prueba {nombre}\n" in texto), None)
+        self.llamadas[articulo] = self.llamadas.get(articulo, 0) + 1
+        if articulo is not None and self.llamadas[articulo] <= self.fallos[articulo]:
+            raise FakeLLMError("Fallo transitorio simulado")
+        return await super().generate_content(contents=contents, config=config, **kwargs)
+
+
+def crear_articulos(directorio, n):
+    directorio.mkdir(parents=True, exist_ok=True)
+    for i in range(n):
+        (directorio / f"PMC{i}_articulo.txt").write_text(ARTICULO.format(n=i), encoding="utf-8")
+    return directorio
+
+
+def crear_runner(tmp_path, llm_client, **opciones):
+    ledger = JobLedger(tmp_path / "salida" / "insight_jobs.json")
+    opciones = {"concurrency": 4, "rpm": 100_000, "tpm": 100_000_000, "backoff_base": 0, **opciones}
+    return InsightBatchRunner(tmp_path / "articulos", tmp_path / "salida", ledger, llm_client, cache=None, **opciones)
+
+
+def ejecutar(runner, **seleccion):
+    return asyncio.run(runner.run(runner.select_jobs(**seleccion)))
+
+
+def test_transiciones_del_ledger(tmp_path):
+    ledger = JobLedger(tmp_path / "ledger.json")
+    assert ledger.status("PMC1") is None
+
+    ledger.update("PMC1", PENDING)
+    ledger.update("PMC1", RUNNING, attempts=1)
+    assert ledger.status("PMC1") == RUNNING
+    ledger.update("PMC1", FAILED, error="503")
+    ledger.update("PMC1", RUNNING, attempts=2)
+    job = ledger.update("PMC1", DONE, tokens=120, error=None)
+
+    assert (job["status"], job["attempts"], job["tokens"], job["error"]) == (DONE, 2, 120, None)
+    ledger.update("PMC2", FAILED, error="timeout")
+    assert ledger.counts() == {PENDING: 0, RUNNING: 0, FAILED: 1, DONE: 1}
+
+    ledger.save()
+    recargado = JobLedger(tmp_path / "ledger.json")
+    assert recargado.jobs == ledger.jobs
+
+
+def test_reanuda_los_articulos_interrumpidos(tmp_path):
+    crear_articulos(tmp_path / "articulos", 4)
+    salida = tmp_path / "salida"
+    salida.mkdir()
+    # Estado tras una interrupción: PMC0 terminado, PMC1 a medias, PMC2 con JSON sin ledger
+    (salida / "PMC0_articulo.json").write_text("{}", encoding="utf-8")
+    (salida / "PMC2_articulo.json").write_text("{}", encoding="utf-8")
+    (salida / "insight_jobs.json").write_text(json.dumps({
+        "PMC0_articulo": {"status": DONE, "attempts": 1, "tokens": 10, "error": None},
+        "PMC1_articulo": {"status": RUNNING, "attempts": 1, "tokens": 0, "error": None},
+    }), encoding="utf-8")
+
+    llm_client = FakeLLMClient(latency_seconds=0)
+    runner = crear_runner(tmp_path, llm_client)
+    assert runner.ledger.status("PMC1_articulo") == PENDING
+
+    jobs = runner.select_jobs()
+    assert [path.stem for path in jobs] == ["PMC1_articulo", "PMC3_articulo"]
+    stats = asyncio.run(runner.run(jobs))
+
+    assert (stats.done, stats.failed, stats.skipped, llm_client.calls) == (2, 0, 2, 2)
+    ledger = JobLedger(salida / "insight_jobs.json")
+    assert ledger.counts() == {PENDING: 0, RUNNING: 0, FAILED: 0, DONE: 4}
+    assert ledger.jobs["PMC1_articulo"]["attempts"] == 2
+    assert json.loads((salida / "PMC1_articulo.json").read_text(encoding="utf-8"))["title"] == "Articulo de prueba 1"
+
+
+def test_reintentos_y_numero_de_intentos(tmp_path):
+    crear_articulos(tmp_path / "articulos", 3)
+    llm_client = FallaPrimeras({"0": 2, "1": 10})
+    runner = crear_runner(tmp_path, llm_client, max_attempts=3)
+    stats = ejecutar(runner)
+
+    jobs = runner.ledger.jobs
+    assert (jobs["PMC0_articulo"]["status"], jobs["PMC0_articulo"]["attempts"]) == (DONE, 3)
+    assert (jobs["PMC1_articulo"]["status"], jobs["PMC1_articulo"]["attempts"]) == (FAILED, 3)
+    assert "Fallo transitorio" in jobs["PMC1_articulo"]["error"]
+    assert (jobs["PMC2_articulo"]["status"], jobs["PMC2_articulo"]["attempts"]) == (DONE, 1)
+    assert llm_client.llamadas == {"0": 3, "1": 3, None: 1}
+    # Reintentos: 2 de PMC0 y 2 de PMC1 (el tercer fallo ya no se reintenta)
+    assert (stats.done, stats.failed, stats.retries) == (2, 1, 4)
+
+    # Al relanzar solo se procesa el fallido, y sus intentos se siguen contando
+    llm_client.fallos = {}
+    stats = ejecutar(crear_runner(tmp_path, llm_client, max_attempts=3))
+    ledger = JobLedger(tmp_path / "salida" / "insight_jobs.json")
+    assert (stats.done, stats.skipped) == (1, 2)
+    assert (ledger.status("PMC1_articulo"), ledger.jobs["PMC1_articulo"]["attempts"]) == (DONE, 4)
+
+
+def test_un_articulo_fallido_no_detiene_el_lote(tmp_path):
+    articulos = crear_articulos(tmp_path / "articulos", 6)
+    # Archivo ilegible como UTF-8: falla antes de llamar al modelo
+    (articulos / "PMC2_articulo.txt").write_bytes(b"\xff\xfe\x00 texto roto")
+    stats = ejecutar(crear_runner(tmp_path, FallaPrimeras({"4": 99}), max_attempts=2, concurrency=2))
+
+    ledger = JobLedger(tmp_path / "salida" / "insight_jobs.json")
+    assert (stats.done, stats.failed) == (4, 2)
+    assert ledger.status("PMC2_articulo") == FAILED
+    assert "UnicodeDecodeError" in ledger.jobs["PMC2_articulo"]["error"]
+    assert ledger.status("PMC4_articulo") == FAILED
+    assert sorted(path.stem for path in (tmp_path / "salida").glob("PMC*.json")) == [
+        "PMC0_articulo", "PMC1_articulo", "PMC3_articulo", "PMC5_articulo",
+    ]
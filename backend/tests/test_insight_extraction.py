@@ -0,0 +1,69 @@
+"""
+Pruebas de extract_structured_data_with_usage: mismo prompt, esquema y validación que
+llm_extraction, y cache solo de las respuestas válidas a la primera.
+
+    cd backend && python -m pytest tests
+"""
+
+import asyncio
+
+import pytest
+from google.genai import types
+
+from app.models.paper_extraction import NON_EXTRACTED_FIELDS, PaperExtraction
+from app.utils.extraction_cache import ExtractionCache
+from app.utils.insight_extraction import extract_structured_data_with_usage
+from app.utils.llm_extraction import EXTRACTION_PROMPT, EXTRACTION_RESPONSE_SCHEMA, ExtractionError
+
+ARTICULO = "# Articulo de prueba\n\n## Abstract\n\nPrimera frase. Segunda frase.\n"
+
+
+class ClienteFijo:
+    """
+    Cliente LLM que devuelve siempre el mismo texto y guarda la configuración recibida.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.configs = []
+
+    async def generate_content(self, *, contents, config=None, **kwargs):
+        self.configs.append(config)
+        return types.GenerateContentResponse(
+            candidates=[types.Candidate(content=types.Content(role="model", parts=[types.Part(text=self.text)]))],
+            usage_metadata=types.GenerateContentResponseUsageMetadata(total_token_count=10),
+        )
+
+
+def extraer(client, cache=None):
+    return asyncio.run(extract_structured_data_with_usage(ARTICULO, client, cache=cache))
+
+
+def test_usa_el_esquema_y_devuelve_los_campos_de_paper():
+    client = ClienteFijo('{"title": "Articulo de prueba", "study_type": "Review", "sample_size": 12}')
+    data, tokens = extraer(client)
+
+    config = client.configs[0]
+    assert config.system_instruction == EXTRACTION_PROMPT
+    assert config.response_schema == EXTRACTION_RESPONSE_SCHEMA
+    assert set(data) == set(PaperExtraction.extracted_fields())
+    assert not set(data) & NON_EXTRACTED_FIELDS
+    assert (data["title"], data["sample_size"], tokens) == ("Articulo de prueba", 12, 10)
+
+
+def test_rechaza_respuestas_sin_datos():
+    with pytest.raises(ExtractionError):
+        extraer(ClienteFijo('{"title": tru'))
+
+
+def test_no_cachea_las_respuestas_reparadas(tmp_path):
+    cache = ExtractionCache(tmp_path)
+    reparada = ClienteFijo('{"title": "Articulo de prueba", "doi": "10.1/x", "authors": ["A", "B')
+    extraer(reparada, cache)
+    extraer(reparada, cache)
+    assert len(reparada.configs) == 2
+
+    valida = ClienteFijo('{"title": "Articulo de prueba", "doi": "10.1/x"}')
+    assert extraer(valida, cache)[1] == 10
+    assert extraer(valida, cache) == (extraer(valida, cache)[0], 0)
+    assert len(valida.configs) == 1
@@ -0,0 +1,66 @@
+"""
+Pruebas de la reparación de respuestas JSON del LLM y de parse_extraction con
+respuestas truncadas (sin llamar a Vertex AI).
+
+    cd backend && python -m pytest tests
+"""
+
+import pytest
+
+from app.utils.json_repair import JsonRepairError, repair_json
+from app.utils.llm_extraction import ExtractionError, extraction_stats, parse_extraction
+
+
+def test_repara_bloque_markdown_y_comas_finales():
+    assert repair_json('```json\n{"title": "X", "authors": ["A", "B",],}\n```') == {
+        "title": "X", "authors": ["A", "B"],
+    }
+
+
+def test_admite_saltos_de_linea_en_cadenas():
+    assert repair_json('{"abstract": "linea 1\nlinea 2"}') == {"abstract": "linea 1\nlinea 2"}
+
+
+def test_cierra_respuesta_truncada_descartando_el_valor_incompleto():
+    assert repair_json('{"title": "X", "authors": ["A", "B') == {"title": "X", "authors": ["A"]}
+    assert repair_json('{"title": "X", "relevant_for_long_duration_missions": tru') == {"title": "X"}
+    assert repair_json('{"title": "X", "sample_size": 12, "doi"') == {"title": "X", "sample_size": 12}
+
+
+@pytest.mark.parametrize("text", ['{"title": tru', '{"title"', '{"a": -', '{"title": "X', '', 'sin json'])
+def test_lanza_error_si_no_se_recupera_ningun_campo(text):
+    with pytest.raises(JsonRepairError):
+        repair_json(text)
+
+
+def test_objeto_vacio_completo_no_es_una_reparacion():
+    assert repair_json("{}") == {}
+
+
+def test_parse_extraction_valida_la_respuesta_completa():
+    extraction = parse_extraction('{"title": "X", "doi": "10.1/x", "study_type": "Review"}')
+    assert extraction.title == "X"
+    assert extraction.doi == "10.1/x"
+
+
+def test_parse_extraction_repara_y_descarta_campos_invalidos():
+    extraction = parse_extraction('{"title": "X", "doi": "10.1/x", "sample_size": "muchos", "authors": ["A", "B')
+    assert (extraction.title, extraction.doi, extraction.sample_size, extraction.authors) == (
+        "X", "10.1/x", None, ["A"],
+    )
+
+
+@pytest.mark.parametrize("text", [
+    '{"title": tru',
+    '{"title"',
+    '{"a": -',
+    # Reparables, pero sin título o sin ningún otro campo: guardarlas vaciaría el paper
+    '{"title": "X", "doi": "10.1',
+    '{"doi": "10.1/x", "title": "Tit',
+    '{"a": 1, "b": 2',
+])
+def test_parse_extraction_rechaza_extracciones_sin_datos(text):
+    failed = extraction_stats["failed"]
+    with pytest.raises(ExtractionError):
+        parse_extraction(text)
+    assert extraction_stats["failed"] == failed + 1
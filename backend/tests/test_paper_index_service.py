@@ -0,0 +1,74 @@
+"""
+Pruebas de la indexación al vuelo de los papers del chat (sin MongoDB: PaperChunk y
+get_paper se sustituyen por stubs).
+
+    cd backend && python -m pytest tests
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import paper_index_service
+
+CON_FRAGMENTOS = "64b000000000000000000001"
+SIN_FRAGMENTOS = "64b000000000000000000002"
+SIN_TEXTO = "64b000000000000000000003"
+
+
+class ChunksFalsos:
+    paper_id = "paper_id"
+    consultas = []
+
+    @classmethod
+    async def distinct(cls, key, query):
+        ids = query.query["paper_id"]["$in"]
+        cls.consultas.append(list(ids))
+        return [paper_id for paper_id in ids if paper_id == CON_FRAGMENTOS]
+
+
+@pytest.fixture
+def stubs(monkeypatch):
+    leidos, indexados = [], []
+
+    async def get_paper(paper_id):
+        leidos.append(paper_id)
+        return SimpleNamespace(id=paper_id, full_text="" if paper_id == SIN_TEXTO else "Texto del paper")
+
+    async def index_paper_chunks(paper):
+        indexados.append(paper.id)
+        paper_index_service._checked_papers.add(paper.id)
+        return 1
+
+    ChunksFalsos.consultas = []
+    monkeypatch.setattr(paper_index_service, "PaperChunk", ChunksFalsos)
+    monkeypatch.setattr(paper_index_service, "get_paper", get_paper)
+    monkeypatch.setattr(paper_index_service, "index_paper_chunks", index_paper_chunks)
+    monkeypatch.setattr(paper_index_service, "_checked_papers", set())
+    return leidos, indexados
+
+
+def test_cada_paper_se_comprueba_una_vez(stubs):
+    leidos, indexados = stubs
+    paper_ids = [CON_FRAGMENTOS, SIN_FRAGMENTOS, SIN_TEXTO, "mock-1"]
+    for _ in range(3):
+        asyncio.run(paper_index_service._ensure_indexed(paper_ids))
+
+    assert ChunksFalsos.consultas == [paper_ids]
+    assert leidos == [SIN_FRAGMENTOS, SIN_TEXTO]
+    assert indexados == [SIN_FRAGMENTOS]
+
+
+def test_los_papers_modificados_se_vuelven_a_comprobar(stubs):
+    leidos, _ = stubs
+    asyncio.run(paper_index_service._ensure_indexed([CON_FRAGMENTOS, SIN_TEXTO]))
+
+    paper_index_service.forget_checked_papers([SIN_TEXTO])
+    asyncio.run(paper_index_service._ensure_indexed([CON_FRAGMENTOS, SIN_TEXTO]))
+    assert ChunksFalsos.consultas == [[CON_FRAGMENTOS, SIN_TEXTO], [SIN_TEXTO]]
+    assert leidos == [SIN_TEXTO, SIN_TEXTO]
+
+    paper_index_service.forget_checked_papers()
+    asyncio.run(paper_index_service._ensure_indexed([CON_FRAGMENTOS]))
+    assert ChunksFalsos.consultas[-1] == [CON_FRAGMENTOS]
@@ -0,0 +1,128 @@
+"""
+Pruebas de la búsqueda semántica sin red: embeddings con HashingEmbedder, recall del
+índice IVF frente a la búsqueda exacta, fusión RRF y almacenamiento float16 de los vectores.
+
+    cd backend && python -m pytest tests
+"""
+
+import asyncio
+import random
+
+import numpy as np
+from google.genai import types
+
+from app.config.settings import settings
+from app.models.paper import PaperSummary
+from app.models.paper_embedding import PaperEmbedding
+from app.search import embeddings
+from app.search.embeddings import EMBEDDING_BATCH_SIZE, HashingEmbedder, VertexEmbedder, embedding_batch_size
+from app.search.hybrid import RRF_K, reciprocal_rank_fusion
+from app.search.vector_index import MIN_VECTORS_FOR_IVF, IVFIndex
+
+DIMENSION = 256
+
+
+def corpus_sintetico(n_docs=2000, n_temas=40, seed=0):
+    """
+    Textos agrupados por temas: cada uno mezcla términos de su tema con términos al azar.
+    """
+    rng = random.Random(seed)
+    vocabulario = [f"termino{i}" for i in range(4000)]
+    temas = [rng.sample(vocabulario, 30) for _ in range(n_temas)]
+    return [
+        " ".join(rng.sample(temas[i % n_temas], 12) + rng.sample(vocabulario, 6))
+        for i in range(n_docs)
+    ]
+
+
+def embed(texts):
+    return asyncio.run(HashingEmbedder(DIMENSION).embed_documents(texts))
+
+
+def test_hashing_embedder_es_determinista_y_normalizado():
+    matriz = embed(["microgravedad y hueso", "microgravedad y hueso", ""])
+    assert np.allclose(matriz[0], matriz[1])
+    assert np.isclose(np.linalg.norm(matriz[0]), 1.0)
+    assert not matriz[2].any()
+
+
+def test_recall_del_ivf_frente_a_busqueda_exacta():
+    vectores = embed(corpus_sintetico())
+    indice = IVFIndex(vectores)
+    assert len(indice.lists) > 1
+    k, aciertos, total = 10, 0, 0
+    for consulta in vectores[::20]:
+        exactos = set(np.argsort(-(vectores @ consulta))[:k])
+        posiciones, similitudes = indice.search(consulta, k, settings.VECTOR_SEARCH_PROBES)
+        assert list(similitudes) == sorted(similitudes, reverse=True)
+        aciertos += len(exactos & set(posiciones))
+        total += k
+    assert aciertos / total >= 0.9
+
+
+def test_pocos_vectores_usan_busqueda_exacta():
+    vectores = embed(corpus_sintetico(n_docs=MIN_VECTORS_FOR_IVF - 1))
+    indice = IVFIndex(vectores)
+    assert len(indice.lists) == 1
+    posiciones, _ = indice.search(vectores[3], 5, 1)
+    assert list(posiciones) == list(np.argsort(-(vectores @ vectores[3]), kind="stable")[:5])
+
+
+def resumen(paper_id):
+    return PaperSummary.model_construct(id=paper_id)
+
+
+def test_rrf_premia_los_papers_presentes_en_ambos_rankings():
+    texto = [resumen(i) for i in ("a", "b", "c", "d")]
+    vectores = [resumen(i) for i in ("c", "e", "a")]
+    puntuaciones = reciprocal_rank_fusion([texto, vectores])
+
+    orden = sorted(puntuaciones, key=puntuaciones.get, reverse=True)
+    assert orden == ["a", "c", "b", "e", "d"]
+    assert np.isclose(puntuaciones["a"], 1 / (RRF_K + 1) + 1 / (RRF_K + 3))
+    assert np.isclose(puntuaciones["d"], 1 / (RRF_K + 4))
+
+
+def test_vector_float16_ida_y_vuelta():
+    vectores = embed(corpus_sintetico(n_docs=50))
+    for vector in vectores:
+        guardado = PaperEmbedding.model_construct(vector=PaperEmbedding.encode_vector(vector))
+        leido = guardado.decode_vector()
+        assert len(guardado.vector) == 2 * DIMENSION
+        assert leido.dtype == np.float32
+        assert np.abs(leido - vector).max() < 1e-3
+        # float16 conserva la dirección: el ranking por coseno no cambia
+        assert np.dot(leido, vector) / np.linalg.norm(leido) > 0.9999
+
+
+class ClienteEmbeddings:
+    """
+    Sustituye a VertexAIClient y registra cuántos textos llega en cada petición.
+    """
+
+    peticiones = []
+
+    async def embed_content(self, *, model, contents, config):
+        self.peticiones.append(len(contents))
+        return types.EmbedContentResponse(
+            embeddings=[types.ContentEmbedding(values=[float(len(text)), 1.0]) for text in contents]
+        )
+
+
+def test_lote_de_embeddings_segun_el_modelo(monkeypatch):
+    monkeypatch.setattr(embeddings, "VertexAIClient", ClienteEmbeddings)
+    assert embedding_batch_size("gemini-embedding-001") == 1
+    assert embedding_batch_size("publishers/google/models/gemini-embedding-001") == 1
+    assert embedding_batch_size("text-embedding-005") == EMBEDDING_BATCH_SIZE
+
+    textos = ["x" * i for i in range(1, 6)]
+    ClienteEmbeddings.peticiones = []
+    matriz = asyncio.run(VertexEmbedder("gemini-embedding-001", 2).embed_documents(textos))
+    assert ClienteEmbeddings.peticiones == [1] * 5
+    # El orden de las filas es el de los textos aunque las peticiones vayan en paralelo
+    esperado = np.array([[i, 1.0] for i in range(1, 6)])
+    assert np.allclose(matriz, esperado / np.linalg.norm(esperado, axis=1, keepdims=True))
+
+    ClienteEmbeddings.peticiones = []
+    asyncio.run(VertexEmbedder("text-embedding-005", 2).embed_documents(["x"] * 150))
+    assert ClienteEmbeddings.peticiones == [EMBEDDING_BATCH_SIZE, 50]
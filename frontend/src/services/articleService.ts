@@ -21,7 +21,7 @@ export const getArticleById = async (id: string): Promise<Article> => {
   }
 }
 
-export const searchArticles = async (filters: SearchFilters): Promise<SearchResponse> => {
+export const searchArticles = async (filters: SearchFilters, cursor?: string): Promise<SearchResponse> => {
   // Build filters array in the required format
   const filterArray: { name: string; values: (string | number)[] }[] = []
 
@@ -40,7 +40,9 @@ export const searchArticles = async (filters: SearchFilters): Promise<SearchResp
   const payload = {
     filters: filterArray,
     query: filters.query || '',
-    limit: 10
+    limit: 10,
+    // Cursor opaco devuelto por la página anterior (next_cursor)
+    cursor: cursor || null
   }
 
   try {
@@ -57,15 +59,16 @@ export const searchArticles = async (filters: SearchFilters): Promise<SearchResp
       throw new Error(`HTTP error! status: ${response.status}`)
     }
 
-    const articles: Article[] = await response.json()
+    const page: { results: Article[]; next_cursor: string | null } = await response.json()
 
     // Remove full_text field from each article
-    const cleanedArticles = articles.map(({ full_text, ...article }) => article)
+    const cleanedArticles = page.results.map(({ full_text, ...article }) => article)
 
     return {
       query: filters.query || '',
       total: cleanedArticles.length,
-      articles: cleanedArticles
+      articles: cleanedArticles,
+      nextCursor: page.next_cursor
     }
   } catch (error) {
     console.error('Error fetching articles from API:', error)
@@ -56,6 +56,8 @@ export interface SearchResponse {
   query: string
   total: number
   articles: Article[]
+  // Cursor para pedir la página siguiente (null si no hay más resultados)
+  nextCursor?: string | null
 }
 
 export interface SearchFilters {
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark de los motores de extracción de ExtractorArticulo (BeautifulSoup vs lxml)
+
+Parsea cada artículo guardado (cache HTTP de los scripts y/o un directorio de .html)
+con ambos motores y muestra el tiempo de parseo por artículo y si los resultados coinciden.
+No hace ninguna petición de red.
+
+    python scripts/benchmark_extractores.py --cache-dir docs/http_cache
+    python scripts/benchmark_extractores.py --html-dir ruta/con/htmls --repeticiones 5
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+script_dir = Path(__file__).parent
+sys.path.insert(0, str(script_dir.parent / "backend"))
+
+from app.utils.extractor_articulo import ExtractorArticulo
+from app.utils.http_cache import HttpCache
+
+CAMPOS = ('title', 'abstract', 'content', 'metadata')
+
+
+def cargar_corpus(args):
+    """Devuelve [(fuente, html)] del corpus guardado"""
+    corpus = []
+    if args.cache_dir:
+        cache = HttpCache(args.cache_dir, offline=True)
+        for url in cache.urls():
+            cached = cache.lookup(url)
+            if cached is not None:
+                corpus.append((url, cached.text))
+    if args.html_dir:
+        for ruta in sorted(Path(args.html_dir).glob('**/*.htm*')):
+            corpus.append((str(ruta), ruta.read_text(encoding='utf-8', errors='replace')))
+    return corpus[:args.limit] if args.limit else corpus
+
+
+def medir(extractor, html, fuente, repeticiones):
+    """Mejor tiempo (ms) de parseo de un artículo y su resultado"""
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = extractor.parsear_html(html, fuente)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor * 1000, resultado
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de los motores de extracción de artículos")
+    parser.add_argument('--cache-dir', default=str(script_dir.parent / "docs" / "http_cache"))
+    parser.add_argument('--html-dir', default=None)
+    parser.add_argument('--limit', type=int, default=0)
+    parser.add_argument('--repeticiones', type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = cargar_corpus(args)
+    if not corpus:
+        print("❌ No hay artículos guardados (descárgalos antes con harvest_pmc_articles.py)")
+        return
+
+    motores = {'bs4': ExtractorArticulo(motor='bs4'), 'lxml': ExtractorArticulo(motor='lxml')}
+    if motores['lxml'].motor != 'lxml':
+        print("❌ lxml no está instalado")
+        return
+
+    tiempos = {nombre: [] for nombre in motores}
+    coincidencias = {campo: 0 for campo in CAMPOS}
+
+    print(f"📄 {len(corpus)} artículos, {args.repeticiones} repeticiones por artículo\n")
+    print(f"{'artículo':<60} {'bs4 ms':>9} {'lxml ms':>9} {'x':>6}")
+    for fuente, html in corpus:
+        resultados = {}
+        for nombre, extractor in motores.items():
+            ms, resultados[nombre] = medir(extractor, html, fuente, args.repeticiones)
+            tiempos[nombre].append(ms)
+        for campo in CAMPOS:
+            coincidencias[campo] += resultados['bs4'][campo] == resultados['lxml'][campo]
+        print(f"{fuente[-60:]:<60} {tiempos['bs4'][-1]:>9.2f} {tiempos['lxml'][-1]:>9.2f} "
+              f"{tiempos['bs4'][-1] / tiempos['lxml'][-1]:>6.1f}")
+
+    print("\n📊 RESUMEN (ms por artículo)")
+    for nombre, valores in tiempos.items():
+        print(f"{nombre:<5} media {statistics.mean(valores):8.2f}  mediana {statistics.median(valores):8.2f}  "
+              f"p95 {percentil(valores, 0.95):8.2f}  total {sum(valores) / 1000:6.2f}s")
+    print(f"⚡ Aceleración media: {sum(tiempos['bs4']) / sum(tiempos['lxml']):.1f}x")
+    print("🔍 Resultados idénticos: " + ", ".join(
+        f"{campo} {coincidencias[campo]}/{len(corpus)}" for campo in CAMPOS
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Extracción en lote de texto de artículos locales (HTML y PDF) usando todos los núcleos
+
+- Entrada: un directorio (se recorre de forma recursiva) o un manifiesto (.txt con una
+  ruta por línea, relativa al manifiesto o absoluta)
+- Los archivos se reparten en unidades de trabajo de --chunk-size archivos entre los
+  procesos de un ProcessPoolExecutor (cada proceso crea su extractor una sola vez)
+- Cada salida se escribe de forma atómica (archivo temporal + rename)
+- Se omiten las entradas cuyo contenido (SHA-256) no cambió desde la última ejecución
+  y cuya salida sigue existiendo (estado en <salida>/.extraccion_estado.json)
+- Al terminar muestra el rendimiento (archivos/s y MB/s)
+
+    python scripts/extraer_lote.py docs/pdfs --output docs/texts
+    python scripts/extraer_lote.py manifiesto.txt --workers 8 --chunk-size 16
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+script_dir = Path(__file__).parent
+sys.path.insert(0, str(script_dir))
+sys.path.insert(0, str(script_dir.parent / "backend"))
+
+from app.utils.atomic_file import write_atomic
+
+EXTENSIONES = {'.html': 'html', '.htm': 'html', '.pdf': 'pdf'}
+ARCHIVO_ESTADO = '.extraccion_estado.json'
+
+# Extractor HTML del proceso (se crea en el inicializador de cada worker)
+_extractor = None
+
+
+def _inicializar_worker(motor):
+    global _extractor
+    from app.utils.extractor_articulo import ExtractorArticulo
+    _extractor = ExtractorArticulo(motor=motor)
+
+
+def extraer_texto(ruta, contenido):
+    """Texto extraído de un HTML (formato de ExtractorArticulo) o de un PDF (PyMuPDF)"""
+    if EXTENSIONES[ruta.suffix.lower()] == 'pdf':
+        import fitz  # PyMuPDF
+
+        with fitz.open(stream=contenido, filetype='pdf') as doc:
+            return "".join(page.get_text() for page in doc)
+
+    html = contenido.decode('utf-8', errors='replace')
+    resultado = _extractor.parsear_html(html, str(ruta))
+    return _extractor.formatear_texto_extraido(resultado)
+
+
+def procesar_lote(trabajos):
+    """
+    Unidad de trabajo de un worker: lista de (ruta de entrada, ruta de salida, hash previo).
+    Devuelve un resumen por archivo.
+    """
+    resultados = []
+    for entrada, salida, hash_previo in trabajos:
+        entrada, salida = Path(entrada), Path(salida)
+        resumen = {'entrada': str(entrada), 'salida': str(salida), 'bytes': 0}
+        try:
+            contenido = entrada.read_bytes()
+            resumen['bytes'] = len(contenido)
+            resumen['sha256'] = hashlib.sha256(contenido).hexdigest()
+            if resumen['sha256'] == hash_previo and salida.exists():
+                resumen['estado'] = 'sin_cambios'
+            else:
+                write_atomic(salida, extraer_texto(entrada, contenido).encode('utf-8'))
+                resumen['estado'] = 'extraido'
+        except Exception as e:
+            resumen['estado'] = 'error'
+            resumen['error'] = f"{type(e).__name__}: {e}"
+        resultados.append(resumen)
+    return resultados
+
+
+def listar_entradas(origen):
+    """Archivos HTML/PDF de un directorio o de un manifiesto"""
+    origen = Path(origen)
+    if origen.is_dir():
+        return sorted(ruta for ruta in origen.rglob('*') if ruta.suffix.lower() in EXTENSIONES)
+    with open(origen, 'r', encoding='utf-8') as f:
+        lineas = [linea.strip() for linea in f if linea.strip() and not linea.startswith('#')]
+    rutas = [Path(linea) if Path(linea).is_absolute() else origen.parent / linea for linea in lineas]
+    return [ruta for ruta in rutas if ruta.suffix.lower() in EXTENSIONES]
+
+
+def ruta_salida(entrada, origen, output_dir):
+    """Salida .txt que conserva la estructura de subdirectorios de la entrada"""
+    base = Path(origen) if Path(origen).is_dir() else Path(origen).parent
+    try:
+        relativa = entrada.resolve().relative_to(base.resolve())
+    except ValueError:
+        relativa = Path(entrada.name)
+    return output_dir / relativa.with_suffix('.txt')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extracción en lote de HTML y PDF con varios procesos")
+    parser.add_argument('origen', help="Directorio o manifiesto (.txt con una ruta por línea)")
+    parser.add_argument('--output', default=str(script_dir.parent / "docs" / "texts"))
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--chunk-size', type=int, default=8, help="Archivos por unidad de trabajo")
+    parser.add_argument('--motor', default='auto', choices=['auto', 'lxml', 'bs4'], help="Motor de extracción HTML")
+    parser.add_argument('--force', action='store_true', help="Reextraer aunque la entrada no haya cambiado")
+    args = parser.parse_args()
+
+    output_dir = Path(args.output)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    ruta_estado = output_dir / ARCHIVO_ESTADO
+    estado = {}
+    if ruta_estado.exists() and not args.force:
+        with open(ruta_estado, 'r', encoding='utf-8') as f:
+            estado = json.load(f)
+
+    entradas = listar_entradas(args.origen)
+    por_salida = {}
+    for entrada in entradas:
+        por_salida.setdefault(ruta_salida(entrada, args.origen, output_dir), []).append(entrada)
+
+    # Entradas que se escribirían en la misma salida (a1.html, a1.htm y a1.pdf -> a1.txt):
+    # se informan como error en lugar de sobrescribirse entre sí
+    colisiones = {salida: rutas for salida, rutas in por_salida.items() if len(rutas) > 1}
+    trabajos = []
+    for salida, rutas in por_salida.items():
+        if salida not in colisiones:
+            entrada = rutas[0]
+            trabajos.append((str(entrada), str(salida), estado.get(str(entrada), {}).get('sha256')))
+    lotes = [trabajos[i:i + args.chunk_size] for i in range(0, len(trabajos), args.chunk_size)]
+
+    print(f"📄 {len(entradas)} archivos en {len(lotes)} lotes con {args.workers} procesos")
+    contadores = {'extraido': 0, 'sin_cambios': 0, 'error': 0}
+    for salida, rutas in colisiones.items():
+        for entrada in rutas:
+            contadores['error'] += 1
+            estado.pop(str(entrada), None)
+            print(f"❌ {entrada}: varias entradas se extraen a {salida} ({', '.join(r.name for r in rutas)})")
+    bytes_procesados = 0
+    inicio = time.perf_counter()
+
+    with ProcessPoolExecutor(
+        max_workers=args.workers, initializer=_inicializar_worker, initargs=(args.motor,)
+    ) as executor:
+        futuros = [executor.submit(procesar_lote, lote) for lote in lotes]
+        for futuro in as_completed(futuros):
+            for resumen in futuro.result():
+                contadores[resumen['estado']] += 1
+                if resumen['estado'] == 'error':
+                    print(f"❌ {resumen['entrada']}: {resumen['error']}")
+                    continue
+                if resumen['estado'] == 'extraido':
+                    bytes_procesados += resumen['bytes']
+                estado[resumen['entrada']] = {'sha256': resumen['sha256'], 'salida': resumen['salida']}
+
+    # El estado también se escribe de forma atómica
+    write_atomic(ruta_estado, json.dumps(estado, indent=2, ensure_ascii=False).encode('utf-8'))
+
+    duracion = time.perf_counter() - inicio
+    extraidos = contadores['extraido']
+    print("\n📊 RESUMEN FINAL")
+    print(f"✅ Extraídos: {extraidos}")
+    print(f"⏭️  Sin cambios: {contadores['sin_cambios']}")
+    print(f"❌ Errores: {contadores['error']}")
+    print(f"⏱️  {duracion:.2f}s — {extraidos / duracion:.1f} archivos/s, "
+          f"{bytes_procesados / duracion / 1024 / 1024:.1f} MB/s")
+    print(f"📁 Salida en: {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Descarga concurrente de los artículos de PMC listados en SB_publication_PMC.csv
+
+Sustituye al bucle secuencial de procesar_articulos_simple.py:
+- Cliente httpx asíncrono con pool de conexiones
+- Ritmo limitado con un token bucket (--rate peticiones/segundo, ráfagas de --burst)
+- Concurrencia acotada (--concurrency descargas simultáneas)
+- Reintentos con backoff exponencial y jitter ante 429, 5xx y errores de red (respeta
+  Retry-After, hasta --max-retry-after segundos)
+- Progreso reanudable: un ledger JSON registra los artículos ya guardados y se omiten al relanzar
+- Cache HTTP en disco (docs/http_cache): con --refresh se revisan todos los artículos con
+  peticiones condicionales (solo se transfieren los que cambiaron); con --offline se
+  reprocesan desde la cache sin red. Si el refresco de un artículo ya guardado falla,
+  se conserva el archivo y el estado anteriores
+
+Para probarlo sin salir a Internet, --base-url reescribe el host de los enlaces del CSV,
+p. ej. contra un servidor de fixtures local:
+
+    python -m http.server 8000 --directory fixtures/
+    python scripts/harvest_pmc_articles.py --base-url http://localhost:8000
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit
+
+import httpx
+
+script_dir = Path(__file__).parent
+sys.path.insert(0, str(script_dir))
+sys.path.insert(0, str(script_dir.parent / "backend"))
+
+from procesar_articulos_simple import HEADERS, guardar_articulo, parsear_contenido_pmc, resultado_error
+from app.utils.http_cache import HttpCache
+from app.utils.rate_limiter import TokenBucket
+
+# Respuestas que merecen reintento (límite de ritmo y errores transitorios del servidor)
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+# Espera máxima por defecto aunque el servidor pida más con Retry-After (segundos)
+MAX_RETRY_AFTER = 60.0
+
+
+def leer_articulos(csv_path):
+    """Lee (título, URL) de cada fila del CSV"""
+    # utf-8-sig: el CSV incluye BOM
+    with open(csv_path, 'r', encoding='utf-8-sig') as archivo:
+        return [
+            {'titulo': fila.get('Title', '').strip(), 'url': fila.get('Link', '').strip()}
+            for fila in csv.DictReader(archivo)
+            if fila.get('Link', '').strip()
+        ]
+
+
+def reescribir_url(url, base_url):
+    """Sustituye esquema y host de la URL por los de base_url (conservando la ruta)"""
+    if not base_url:
+        return url
+    base = urlsplit(base_url)
+    original = urlsplit(url)
+    return urlunsplit((base.scheme, base.netloc, base.path.rstrip('/') + original.path, original.query, ''))
+
+
+class Ledger:
+    """
+    Registro persistente del progreso: URL -> estado, archivo e intentos.
+    Se escribe de forma atómica (archivo temporal + rename) para sobrevivir a interrupciones.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entradas = {}
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entradas = json.load(f)
+
+    def completado(self, url):
+        return self.entradas.get(url, {}).get('estado') == 'exitoso'
+
+    def registrar(self, url, estado, archivo=None, intentos=0, error=None):
+        self.entradas[url] = {
+            'estado': estado,
+            'archivo': archivo,
+            'intentos': intentos,
+            'error': error,
+            'timestamp': datetime.now().isoformat(),
+        }
+
+    def anotar_error(self, url, error):
+        """Registra un refresco fallido sin perder el resultado exitoso anterior"""
+        self.entradas[url]['ultimo_error'] = error
+        self.entradas[url]['ultimo_error_timestamp'] = datetime.now().isoformat()
+
+    def guardar(self):
+        temporal = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(self.entradas, f, indent=2, ensure_ascii=False)
+        os.replace(temporal, self.path)
+
+
+def espera_reintento(intento, backoff_base, response=None, maximo=MAX_RETRY_AFTER):
+    """
+    Segundos a esperar antes del siguiente intento: Retry-After (acotado a maximo)
+    o backoff exponencial con jitter
+    """
+    if response is not None:
+        retry_after = response.headers.get('Retry-After', '').strip()
+        if retry_after.isdigit():
+            return min(float(retry_after), maximo)
+    return backoff_base * (2 ** intento) * random.uniform(0.5, 1.5)
+
+
+async def descargar_con_reintentos(client, cache, bucket, url, max_reintentos, backoff_base,
+                                   max_retry_after=MAX_RETRY_AFTER):
+    """
+    Descarga una URL (a través de la cache HTTP) respetando el token bucket y
+    reintentando los fallos transitorios.
+
+    Returns:
+        (html, intentos)
+    """
+    if cache.offline:
+        # Sin red: CacheMiss si el artículo no se descargó nunca
+        return (await cache.aget(url, client)).text, 0
+
+    intento = 0
+    while True:
+        await bucket.acquire()
+        response = None
+        try:
+            cached = await cache.aget(url, client)
+            return cached.text, intento + 1
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code not in RETRYABLE_STATUS:
+                raise
+            error, response = e, e.response
+        except httpx.TransportError as e:
+            error = e
+
+        if intento >= max_reintentos:
+            raise error
+        await asyncio.sleep(espera_reintento(intento, backoff_base, response, max_retry_after))
+        intento += 1
+
+
+async def procesar_articulo(client, cache, bucket, articulo, args, output_dir, ledger):
+    url_original = articulo['url']
+    url = reescribir_url(url_original, args.base_url)
+    intentos = 0
+    try:
+        html, intentos = await descargar_con_reintentos(
+            client, cache, bucket, url, args.max_retries, args.backoff, args.max_retry_after
+        )
+        # El parseo es CPU: se hace fuera del event loop para no frenar las descargas
+        resultado = await asyncio.to_thread(parsear_contenido_pmc, html, url_original)
+    except Exception as e:
+        resultado = resultado_error(url_original, e)
+
+    if resultado['estado'] != 'exitoso' and ledger.completado(url_original):
+        # Refresco (--refresh/--offline) fallido: no se sobrescribe el artículo ya guardado
+        ledger.anotar_error(url_original, resultado.get('error'))
+        return 'error'
+
+    archivo = await asyncio.to_thread(guardar_articulo, resultado, output_dir)
+    estado = 'exitoso' if resultado['estado'] == 'exitoso' and archivo else 'error'
+    ledger.registrar(url_original, estado, archivo, intentos, resultado.get('error'))
+    return estado
+
+
+async def harvest(args):
+    articulos = leer_articulos(args.csv)
+    if args.limit:
+        articulos = articulos[:args.limit]
+
+    output_dir = Path(args.output)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    ledger = Ledger(args.ledger or output_dir / 'harvest_ledger.json')
+
+    cache = HttpCache(args.cache_dir, offline=args.offline)
+
+    # Con --refresh/--offline se reprocesan todos (las descargas sin cambios responden 304)
+    if args.refresh or args.offline:
+        pendientes = articulos
+    else:
+        pendientes = [articulo for articulo in articulos if not ledger.completado(articulo['url'])]
+    print(f"📄 {len(articulos)} artículos en el CSV, {len(articulos) - len(pendientes)} ya descargados")
+    print(f"🚀 Descargando {len(pendientes)} con concurrencia {args.concurrency} y {args.rate} peticiones/s")
+
+    bucket = TokenBucket(rate=args.rate, capacity=args.burst)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    timeout = httpx.Timeout(args.timeout)
+    cola = asyncio.Queue()
+    for articulo in pendientes:
+        cola.put_nowait(articulo)
+
+    contadores = {'exitoso': 0, 'error': 0}
+    inicio = time.perf_counter()
+
+    async with httpx.AsyncClient(headers=HEADERS, limits=limits, timeout=timeout, follow_redirects=True) as client:
+        async def worker():
+            while True:
+                try:
+                    articulo = cola.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                estado = await procesar_articulo(client, cache, bucket, articulo, args, output_dir, ledger)
+                contadores[estado] += 1
+                hechos = contadores['exitoso'] + contadores['error']
+                if hechos % args.checkpoint_every == 0:
+                    ledger.guardar()
+                    print(f"   {hechos}/{len(pendientes)} ({hechos / (time.perf_counter() - inicio):.1f} art/s)")
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        finally:
+            ledger.guardar()
+
+    duracion = time.perf_counter() - inicio
+    print("\n📊 RESUMEN FINAL")
+    print(f"✅ Exitosos: {contadores['exitoso']}")
+    print(f"❌ Errores: {contadores['error']}")
+    print(f"⏱️  {duracion:.1f}s")
+    print(f"🗄️  Cache: {cache.stats['miss']} descargados, {cache.stats['revalidated']} sin cambios (304), "
+          f"{cache.stats['offline']} desde disco")
+    print(f"📋 Ledger en: {ledger.path}")
+    return contadores
+
+
+def entero_positivo(valor):
+    """
+    Tipo de argparse para enteros >= 1.
+    """
+    numero = int(valor)
+    if numero < 1:
+        raise argparse.ArgumentTypeError(f"debe ser un entero >= 1: {valor}")
+    return numero
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(description="Descarga concurrente y reanudable de artículos de PMC")
+    parser.add_argument('--csv', default=str(script_dir.parent / "docs" / "data" / "SB_publication_PMC.csv"))
+    parser.add_argument('--output', default=str(script_dir.parent / "docs" / "extracted_articles"))
+    parser.add_argument('--ledger', default=None, help="Ruta del ledger (por defecto en el directorio de salida)")
+    parser.add_argument('--limit', type=int, default=0, help="Procesar solo los primeros N artículos")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--rate', type=float, default=5.0, help="Peticiones por segundo sostenidas")
+    parser.add_argument('--burst', type=float, default=5.0, help="Ráfaga máxima de peticiones")
+    parser.add_argument('--max-retries', type=int, default=4)
+    parser.add_argument('--backoff', type=float, default=1.0, help="Espera base del backoff exponencial (s)")
+    parser.add_argument('--max-retry-after', type=float, default=MAX_RETRY_AFTER,
+                        help="Espera máxima aunque el servidor pida más con Retry-After (s)")
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--checkpoint-every', type=entero_positivo, default=10, help="Guardar el ledger cada N artículos")
+    parser.add_argument('--cache-dir', default=str(script_dir.parent / "docs" / "http_cache"))
+    parser.add_argument('--refresh', action='store_true', help="Revisar también los ya descargados (GET condicional)")
+    parser.add_argument('--offline', action='store_true', help="Reprocesar solo desde la cache, sin red")
+    parser.add_argument('--base-url', default=None, help="Reescribe el host de los enlaces (servidor de fixtures)")
+    return parser
+
+
+def main():
+    asyncio.run(harvest(crear_parser().parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,12 +7,20 @@ Extrae contenido usando requests y BeautifulSoup directamente
 import csv
 import requests
 import re
+import sys
 import time
 from pathlib import Path
 from bs4 import BeautifulSoup
 import json
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app.utils.http_cache import HttpCache
+
+# Cache de HTML descargado: los artículos sin cambios no se vuelven a transferir
+CACHE_DIR = Path(__file__).parent.parent / "docs" / "http_cache"
+
 
 def limpiar_texto(texto):
     """Limpia y normaliza el texto extraído"""
@@ -33,108 +41,127 @@ def limpiar_texto(texto):
     return texto
 
 
-def extraer_contenido_pmc(url):
+# Headers para simular un navegador real
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+
+def descargar_html(url, cache=None):
     """
-    Extrae contenido de un artículo de PMC
+    Descarga el HTML de un artículo (con petición condicional si está en la cache)
     """
-    try:
-        # Headers para simular un navegador real
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        # Hacer request
-        print(f"🌐 Descargando: {url}")
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
-        
-        # Parsear HTML
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Extraer título
-        titulo = "Sin título"
-        for selector in ['h1.article-title', 'h1.title', '.article-title', 'h1']:
-            elemento = soup.select_one(selector)
-            if elemento:
-                titulo = limpiar_texto(elemento.get_text())
-                if titulo and len(titulo) > 10:
-                    break
-        
-        # Extraer abstract
-        abstract = ""
-        for selector in ['section.abstract', '.abstract', '#abstract']:
-            elemento = soup.select_one(selector)
-            if elemento:
-                texto = elemento.get_text()
-                texto = re.sub(r'^abstract\s*', '', texto, flags=re.IGNORECASE)
-                abstract = limpiar_texto(texto)
+    print(f"🌐 Descargando: {url}")
+    if cache is not None:
+        return cache.get(url, headers=HEADERS, timeout=30).text
+    response = requests.get(url, headers=HEADERS, timeout=30)
+    response.raise_for_status()
+    return response.text
+
+
+def parsear_contenido_pmc(html, url):
+    """
+    Extrae título, abstract, contenido y metadatos del HTML de un artículo de PMC
+    """
+    # Parsear HTML
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # Extraer título
+    titulo = "Sin título"
+    for selector in ['h1.article-title', 'h1.title', '.article-title', 'h1']:
+        elemento = soup.select_one(selector)
+        if elemento:
+            titulo = limpiar_texto(elemento.get_text())
+            if titulo and len(titulo) > 10:
                 break
-        
-        # Extraer contenido principal
-        contenido = ""
-        
-        # Selectores específicos para PMC
-        selectores_contenido = [
-            'section.body.main-article-body',
-            'section[aria-label="Article content"]',
-            '.article-body',
-            '.main-content',
-            'main',
-            'article'
-        ]
-        
-        for selector in selectores_contenido:
-            contenedor = soup.select_one(selector)
-            if contenedor:
-                # Remover elementos no deseados
-                for elemento_basura in contenedor.select('script, style, nav, header, footer'):
-                    elemento_basura.decompose()
-                
-                contenido = limpiar_texto(contenedor.get_text())
-                if contenido and len(contenido) > 100:
-                    break
-        
-        # Si no se encuentra contenido específico, usar todo el body
-        if not contenido:
-            body = soup.find('body')
-            if body:
-                contenido = limpiar_texto(body.get_text())
-        
-        # Extraer algunos metadatos básicos
-        metadatos = {}
-        meta_tags = soup.find_all('meta')
-        for meta in meta_tags:
-            name = meta.get('name', '')
-            content = meta.get('content', '')
+    
+    # Extraer abstract
+    abstract = ""
+    for selector in ['section.abstract', '.abstract', '#abstract']:
+        elemento = soup.select_one(selector)
+        if elemento:
+            texto = elemento.get_text()
+            texto = re.sub(r'^abstract\s*', '', texto, flags=re.IGNORECASE)
+            abstract = limpiar_texto(texto)
+            break
+    
+    # Extraer contenido principal
+    contenido = ""
+    
+    # Selectores específicos para PMC
+    selectores_contenido = [
+        'section.body.main-article-body',
+        'section[aria-label="Article content"]',
+        '.article-body',
+        '.main-content',
+        'main',
+        'article'
+    ]
+    
+    for selector in selectores_contenido:
+        contenedor = soup.select_one(selector)
+        if contenedor:
+            # Remover elementos no deseados
+            for elemento_basura in contenedor.select('script, style, nav, header, footer'):
+                elemento_basura.decompose()
             
-            if 'citation_journal_title' in name:
-                metadatos['revista'] = content
-            elif 'citation_publication_date' in name:
-                metadatos['fecha_publicacion'] = content
-            elif 'citation_doi' in name:
-                metadatos['doi'] = content
-            elif 'citation_pmid' in name:
-                metadatos['pmid'] = content
-        
-        return {
-            'titulo': titulo,
-            'abstract': abstract,
-            'contenido': contenido,
-            'metadatos': metadatos,
-            'url': url,
-            'estado': 'exitoso'
-        }
+            contenido = limpiar_texto(contenedor.get_text())
+            if contenido and len(contenido) > 100:
+                break
+    
+    # Si no se encuentra contenido específico, usar todo el body
+    if not contenido:
+        body = soup.find('body')
+        if body:
+            contenido = limpiar_texto(body.get_text())
+    
+    # Extraer algunos metadatos básicos
+    metadatos = {}
+    meta_tags = soup.find_all('meta')
+    for meta in meta_tags:
+        name = meta.get('name', '')
+        content = meta.get('content', '')
         
+        if 'citation_journal_title' in name:
+            metadatos['revista'] = content
+        elif 'citation_publication_date' in name:
+            metadatos['fecha_publicacion'] = content
+        elif 'citation_doi' in name:
+            metadatos['doi'] = content
+        elif 'citation_pmid' in name:
+            metadatos['pmid'] = content
+    
+    return {
+        'titulo': titulo,
+        'abstract': abstract,
+        'contenido': contenido,
+        'metadatos': metadatos,
+        'url': url,
+        'estado': 'exitoso'
+    }
+
+
+def resultado_error(url, error):
+    """Resultado de un artículo que no se pudo extraer"""
+    return {
+        'titulo': 'Error al extraer',
+        'abstract': '',
+        'contenido': '',
+        'metadatos': {},
+        'url': url,
+        'estado': 'error',
+        'error': str(error)
+    }
+
+
+def extraer_contenido_pmc(url, cache=None):
+    """
+    Extrae contenido de un artículo de PMC
+    """
+    try:
+        return parsear_contenido_pmc(descargar_html(url, cache), url)
     except Exception as e:
-        return {
-            'titulo': 'Error al extraer',
-            'abstract': '',
-            'contenido': '',
-            'metadatos': {},
-            'url': url,
-            'estado': 'error',
-            'error': str(e)
-        }
+        return resultado_error(url, e)
 
 
 def generar_nombre_archivo(titulo, url):
@@ -201,6 +228,10 @@ def main():
     
     # Crear directorio de salida
     output_dir.mkdir(parents=True, exist_ok=True)
+
+    # --offline: solo se usan los artículos ya cacheados, sin red
+    offline = '--offline' in sys.argv
+    cache = HttpCache(CACHE_DIR, offline=offline)
     
     # Verificar que existe el CSV
     if not csv_path.exists():
@@ -246,7 +277,7 @@ def main():
         print(f"📰 {articulo['titulo'][:60]}...")
         
         # Extraer contenido
-        resultado = extraer_contenido_pmc(articulo['url'])
+        resultado = extraer_contenido_pmc(articulo['url'], cache)
         
         # Guardar resultado
         archivo_guardado = guardar_articulo(resultado, output_dir)
@@ -259,8 +290,8 @@ def main():
         
         resultados.append(resultado)
         
-        # Pausa entre requests
-        if i < cantidad:
+        # Pausa entre requests (solo si hubo descarga)
+        if i < cantidad and not offline:
             print("⏳ Esperando 2 segundos...")
             time.sleep(2)
     
@@ -283,6 +314,7 @@ def main():
     print(f"❌ Errores: {errores}")
     print(f"📁 Archivos en: {output_dir}")
     print(f"📋 Log en: {log_path}")
+    print(f"🗄️  Cache: {cache.stats}")
 
 
 if __name__ == "__main__":
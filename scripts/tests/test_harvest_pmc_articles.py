@@ -0,0 +1,216 @@
+"""
+Pruebas del harvester de PMC contra un servidor HTTP de fixtures local (sin Internet):
+ritmo limitado, reintentos, reanudación y conservación de los artículos ya descargados.
+
+    python -m pytest scripts/tests
+"""
+
+import asyncio
+import csv
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import harvest_pmc_articles as harvester
+
+ARTICULO_HTML = """<html><head>
+<meta name="citation_journal_title" content="Fixture Journal">
+</head><body>
+<h1 class="article-title">Articulo de prueba {pmcid}</h1>
+<section class="abstract">Abstract del articulo {pmcid}</section>
+<main>{contenido}</main>
+</body></html>"""
+
+
+class ServidorFixtures:
+    """
+    Servidor local que sirve /pmc/articles/<PMCID>/ y registra cada petición.
+    respuestas[pmcid] es una lista de códigos a devolver en orden (el último se repite);
+    sin entrada se responde 200 con un artículo.
+    """
+
+    def __init__(self):
+        self.respuestas = {}
+        self.peticiones = []
+        self.retry_after = '0'
+        servidor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                pmcid = self.path.strip('/').split('/')[-1]
+                servidor.peticiones.append((pmcid, time.monotonic()))
+                codigos = servidor.respuestas.get(pmcid, [200])
+                codigo = codigos.pop(0) if len(codigos) > 1 else codigos[0]
+                if codigo != 200:
+                    self.send_response(codigo)
+                    if codigo == 429:
+                        self.send_header('Retry-After', servidor.retry_after)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                cuerpo = ARTICULO_HTML.format(pmcid=pmcid, contenido='Contenido del articulo. ' * 20).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(cuerpo)))
+                self.end_headers()
+                self.wfile.write(cuerpo)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.hilo = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def peticiones_de(self, pmcid):
+        return [momento for id_, momento in self.peticiones if id_ == pmcid]
+
+
+@pytest.fixture
+def servidor():
+    servidor = ServidorFixtures()
+    servidor.hilo.start()
+    yield servidor
+    servidor.httpd.shutdown()
+    servidor.httpd.server_close()
+
+
+def crear_csv(directorio, pmcids):
+    ruta = directorio / 'articulos.csv'
+    with open(ruta, 'w', encoding='utf-8-sig', newline='') as f:
+        escritor = csv.writer(f)
+        escritor.writerow(['Title', 'Link'])
+        for pmcid in pmcids:
+            escritor.writerow([f"Articulo {pmcid}", f"https://www.ncbi.nlm.nih.gov/pmc/articles/{pmcid}/"])
+    return ruta
+
+
+def ejecutar(tmp_path, servidor, pmcids, *extra):
+    args = harvester.crear_parser().parse_args([
+        '--csv', str(crear_csv(tmp_path, pmcids)),
+        '--output', str(tmp_path / 'salida'),
+        '--cache-dir', str(tmp_path / 'cache'),
+        '--base-url', servidor.url,
+        '--backoff', '0.01',
+        '--checkpoint-every', '1',
+        *extra,
+    ])
+    return asyncio.run(harvester.harvest(args))
+
+
+def leer_ledger(tmp_path):
+    with open(tmp_path / 'salida' / 'harvest_ledger.json', 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_descarga_y_guarda_los_articulos(tmp_path, servidor):
+    contadores = ejecutar(tmp_path, servidor, ['PMC1', 'PMC2', 'PMC3'], '--rate', '100', '--burst', '100')
+
+    assert contadores == {'exitoso': 3, 'error': 0}
+    assert sorted(p.name.split('_')[0] for p in (tmp_path / 'salida').glob('*.txt')) == ['PMC1', 'PMC2', 'PMC3']
+    assert all(entrada['estado'] == 'exitoso' for entrada in leer_ledger(tmp_path).values())
+
+
+def test_limita_el_ritmo_de_peticiones(tmp_path, servidor):
+    pmcids = [f"PMC{i}" for i in range(10)]
+    ejecutar(tmp_path, servidor, pmcids, '--rate', '20', '--burst', '1', '--concurrency', '8')
+
+    momentos = sorted(momento for _, momento in servidor.peticiones)
+    # 10 peticiones a 20/s con ráfaga 1: al menos 9 intervalos de 50 ms
+    assert momentos[-1] - momentos[0] >= 9 / 20 * 0.9
+
+
+def test_reintenta_429_y_5xx(tmp_path, servidor):
+    servidor.respuestas = {'PMC1': [429, 200], 'PMC2': [503, 502, 200]}
+    contadores = ejecutar(tmp_path, servidor, ['PMC1', 'PMC2'], '--rate', '100', '--burst', '100')
+
+    assert contadores == {'exitoso': 2, 'error': 0}
+    ledger = leer_ledger(tmp_path)
+    intentos = {url.split('/')[-2]: entrada['intentos'] for url, entrada in ledger.items()}
+    assert intentos == {'PMC1': 2, 'PMC2': 3}
+
+
+def test_no_reintenta_errores_permanentes(tmp_path, servidor):
+    servidor.respuestas = {'PMC1': [404]}
+    contadores = ejecutar(tmp_path, servidor, ['PMC1'], '--rate', '100', '--burst', '100')
+
+    assert contadores == {'exitoso': 0, 'error': 1}
+    assert len(servidor.peticiones_de('PMC1')) == 1
+
+
+def test_acota_retry_after(tmp_path, servidor):
+    servidor.respuestas = {'PMC1': [429, 200]}
+    servidor.retry_after = '3600'
+    inicio = time.monotonic()
+    contadores = ejecutar(
+        tmp_path, servidor, ['PMC1'], '--rate', '100', '--burst', '100', '--max-retry-after', '0.2'
+    )
+
+    assert contadores == {'exitoso': 1, 'error': 0}
+    assert time.monotonic() - inicio < 5
+
+
+@pytest.mark.parametrize('valor', ['0', '-1'])
+def test_checkpoint_every_debe_ser_positivo(valor, capsys):
+    with pytest.raises(SystemExit):
+        harvester.crear_parser().parse_args(['--checkpoint-every', valor])
+    assert '--checkpoint-every' in capsys.readouterr().err
+
+
+def test_espera_reintento_respeta_el_maximo():
+    respuesta = httpx.Response(429, headers={'Retry-After': '3600'})
+    assert harvester.espera_reintento(0, 1.0, respuesta) == harvester.MAX_RETRY_AFTER
+    assert harvester.espera_reintento(0, 1.0, httpx.Response(429, headers={'Retry-After': '2'})) == 2.0
+
+
+def test_reanuda_solo_los_pendientes(tmp_path, servidor):
+    servidor.respuestas = {'PMC2': [500]}
+    primera = ejecutar(tmp_path, servidor, ['PMC1', 'PMC2', 'PMC3'], '--rate', '100', '--burst', '100',
+                       '--max-retries', '1')
+    assert primera == {'exitoso': 2, 'error': 1}
+
+    servidor.respuestas = {}
+    servidor.peticiones.clear()
+    segunda = ejecutar(tmp_path, servidor, ['PMC1', 'PMC2', 'PMC3'], '--rate', '100', '--burst', '100')
+
+    assert segunda == {'exitoso': 1, 'error': 0}
+    assert [pmcid for pmcid, _ in servidor.peticiones] == ['PMC2']
+    assert all(entrada['estado'] == 'exitoso' for entrada in leer_ledger(tmp_path).values())
+
+
+def test_refresco_fallido_conserva_el_articulo(tmp_path, servidor):
+    ejecutar(tmp_path, servidor, ['PMC1'], '--rate', '100', '--burst', '100')
+    archivos = list((tmp_path / 'salida').glob('*.txt'))
+    contenido = archivos[0].read_text(encoding='utf-8')
+
+    servidor.respuestas = {'PMC1': [500]}
+    contadores = ejecutar(tmp_path, servidor, ['PMC1'], '--rate', '100', '--burst', '100',
+                          '--max-retries', '0', '--refresh')
+
+    assert contadores == {'exitoso': 0, 'error': 1}
+    assert list((tmp_path / 'salida').glob('*.txt')) == archivos
+    assert archivos[0].read_text(encoding='utf-8') == contenido
+    entrada = next(iter(leer_ledger(tmp_path).values()))
+    assert entrada['estado'] == 'exitoso'
+    assert '500' in entrada['ultimo_error']
+
+
+def test_offline_sin_cache_conserva_el_articulo(tmp_path, servidor):
+    ejecutar(tmp_path, servidor, ['PMC1'], '--rate', '100', '--burst', '100')
+    # Sin la cache, el modo offline no puede servir el artículo
+    for ruta in sorted((tmp_path / 'cache').rglob('*'), reverse=True):
+        ruta.unlink() if ruta.is_file() else ruta.rmdir()
+
+    contadores = ejecutar(tmp_path, servidor, ['PMC1'], '--offline')
+
+    assert contadores == {'exitoso': 0, 'error': 1}
+    assert next(iter(leer_ledger(tmp_path).values()))['estado'] == 'exitoso'
+    assert not list((tmp_path / 'salida').glob('PMC1_Error*'))